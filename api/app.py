@@ -1,5 +1,7 @@
 # === api/app.py ===
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+import asyncio
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 from pathlib import Path
@@ -10,8 +12,23 @@ sys.path.insert(0, str(project_root))
 
 from api.routes.user import router as user_router
 from api.routes.project import router as project_router
-from api.routes.issues import router as issues_router
-from database.connection import init_database
+from api.routes.issues import router as issues_router, issue_fragments
+from api.routes.changes import router as changes_router
+from api.routes.events import router as events_router
+from api.routes.batch import router as batch_router
+from api.events import EventBroker
+from api.idempotency import IdempotencyMiddleware, IdempotencyStore
+from api.singleflight import SingleFlight, SingleflightMiddleware
+from config import (
+    IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS,
+    CHANGE_LOG_RETENTION_DAYS, CHANGE_LOG_COMPACT_AFTER_HOURS, CHANGE_LOG_PRUNE_INTERVAL,
+    EVENTS_SUBSCRIBER_BUFFER, EVENTS_MAX_SUBSCRIBERS, EVENTS_POLL_INTERVAL,
+    COALESCE_GET_REQUESTS,
+)
+from database.connection import init_database, close_pool, close_writer, get_writer, get_table_versions, DatabaseManager
+from database.async_manager import shutdown_executor, AsyncDatabaseManager
+from database.maintenance import prune_change_log
+from database.contention import DatabaseUnavailable
 
 app = FastAPI(
     title="GitLab MCP Simulator",
@@ -21,6 +38,13 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Identical concurrent GETs share one execution. Added first, so it runs
+# inside CORS and every client still gets its own CORS headers.
+single_flight = SingleFlight()
+if COALESCE_GET_REQUESTS:
+    app.add_middleware(SingleflightMiddleware, flights=single_flight,
+                       write_version=lambda: get_table_versions().get())
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,15 +54,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Idempotency-Key support for create endpoints
+idempotency_store = IdempotencyStore(ttl=IDEMPOTENCY_TTL_SECONDS, max_keys=IDEMPOTENCY_MAX_KEYS)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
+# Change events pushed to /api/v1/events subscribers
+app.state.event_broker = EventBroker(
+    buffer_size=EVENTS_SUBSCRIBER_BUFFER,
+    poll_interval=EVENTS_POLL_INTERVAL,
+    max_subscribers=EVENTS_MAX_SUBSCRIBERS,
+)
+
+_background_tasks = []
+
+async def prune_change_log_periodically():
+    """Apply change log retention and compaction every CHANGE_LOG_PRUNE_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(CHANGE_LOG_PRUNE_INTERVAL)
+        try:
+            await AsyncDatabaseManager.run_in_transaction(
+                lambda conn: prune_change_log(conn, CHANGE_LOG_RETENTION_DAYS, CHANGE_LOG_COMPACT_AFTER_HOURS),
+                kind="prune"
+            )
+        except DatabaseUnavailable:
+            pass  # busy right now; the next round catches up
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
     init_database()
+    if CHANGE_LOG_PRUNE_INTERVAL > 0:
+        _background_tasks.append(asyncio.create_task(prune_change_log_periodically()))
+    app.state.event_broker.start()
+    get_writer().commit_listeners.append(app.state.event_broker.notify)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    app.state.event_broker.stop()
+    shutdown_executor()
+    close_writer()
+    close_pool()
+
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable_handler(request: Request, exc: DatabaseUnavailable):
+    # Full write queue or lock contention outlasting every retry: a transient
+    # condition, so tell clients when to come back instead of failing with 500
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 # Include routers
 app.include_router(user_router, prefix="/api/v1", tags=["users"])
 app.include_router(project_router, prefix="/api/v1", tags=["projects"])
 app.include_router(issues_router, prefix="/api/v1", tags=["issues"])
+app.include_router(changes_router, prefix="/api/v1", tags=["changes"])
+app.include_router(events_router, prefix="/api/v1", tags=["changes"])
+app.include_router(batch_router, prefix="/api/v1", tags=["batch"])
 
 @app.get("/")
 async def root():
@@ -50,4 +126,19 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "database": {
+            "storage_profile": DatabaseManager.storage_profile(),
+            "pool": DatabaseManager.pool_stats(),
+            "streams": DatabaseManager.stream_stats(),
+            "writer": DatabaseManager.writer_stats(),
+            "contention": DatabaseManager.contention_stats(),
+            "query_cache": DatabaseManager.query_cache_stats(),
+            "table_versions": DatabaseManager.table_versions_stats()
+        },
+        "issue_fragments": issue_fragments.stats(),
+        "idempotency": idempotency_store.stats(),
+        "singleflight": single_flight.stats(),
+        "events": app.state.event_broker.stats()
+    }
\ No newline at end of file
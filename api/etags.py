@@ -0,0 +1,121 @@
+# === api/etags.py ===
+"""
+Row-version ETags and If-Match preconditions.
+
+Issues and projects carry a ``version`` column that every write increments.
+Single-resource responses expose it as a strong ETag (``"<version>"``). A
+client that sends it back in ``If-Match`` only updates the row if nobody
+else changed it in between; the check is a condition in the UPDATE's WHERE
+clause, so it costs no extra query and is atomic with the write.
+
+For ``If-None-Match``, responses also carry a validator: a hash of the
+request's path and query and the write counters of the tables the response
+reads (see database/versions.py). Lists use it as their whole ETag; single
+issues and projects send ``"<version>.<validator>"``, which If-Match still
+reads as the version. A client's validator that equals the current one means
+none of those tables changed, so the response is answered with 304 before
+any query runs and without serializing anything.
+
+Sub-requests of an atomic batch read the batch's uncommitted writes, which
+the table versions do not count yet. They get no validator: no ETag is sent
+and If-None-Match is never answered with 304 there.
+"""
+import hashlib
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from database.async_manager import AsyncDatabaseManager
+from database.connection import get_table_versions
+
+def format_etag(version: int, validator: Optional[str] = None) -> str:
+    """ETag header value for a row version, optionally with a table validator"""
+    if validator is None:
+        return f'"{version}"'
+    return f'"{version}.{validator}"'
+
+def parse_if_match(if_match: str) -> Optional[List[int]]:
+    """Versions listed in an If-Match header, or None for ``*`` (any version)"""
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return None
+        # Weak tags never match under If-Match (RFC 9110 strong comparison)
+        if not (tag.startswith('"') and tag.endswith('"')):
+            continue
+        version = tag[1:-1].split(".", 1)[0]
+        if version.isdigit():
+            versions.append(int(version))
+    return versions
+
+def if_match_condition(if_match: Optional[str], column: str = "version") -> Tuple[str, List[Any]]:
+    """SQL condition (with leading AND) enforcing an If-Match header"""
+    if if_match is None:
+        return "", []
+    versions = parse_if_match(if_match)
+    if versions is None:
+        return "", []
+    if not versions:
+        return " AND 0", []
+    return f" AND {column} IN ({', '.join('?' for _ in versions)})", versions
+
+def table_validator(request: Request, tables: Sequence[str] = ()) -> str:
+    """Hash of the request and the versions of tables (all tables when none are named)"""
+    versions = get_table_versions()
+    key = [versions.epoch, request.url.path]
+    key.extend(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+    key.extend(str(version) for version in versions.get(tables))
+    return hashlib.blake2b("\0".join(key).encode(), digest_size=12).hexdigest()
+
+def read_validator(request: Request, tables: Sequence[str] = ()) -> Optional[str]:
+    """table_validator for a read, or None inside a write session, whose reads it does not cover"""
+    if AsyncDatabaseManager.in_write_session():
+        return None
+    return table_validator(request, tables)
+
+def matching_etag(if_none_match: Optional[str], validator: str) -> Optional[str]:
+    """The tag in an If-None-Match header carrying validator, if any (weak comparison)"""
+    if if_none_match is None:
+        return None
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag.endswith(f'{validator}"') and tag[-len(validator) - 2] in '".':
+            return tag
+    return None
+
+def not_modified(etag: str) -> HTTPException:
+    """304 response carrying etag"""
+    return HTTPException(status_code=304, headers={"ETag": etag})
+
+def conditional_get(*tables: str, resource: Optional[Tuple[str, str]] = None) -> Callable[[Request, Response], Awaitable[None]]:
+    """Route dependency for GETs that read only tables (any table when none are named)
+
+    Sets the ETag header, or raises 304 when ``If-None-Match`` matches it;
+    does neither inside a write session. ``If-None-Match: *`` matches only a
+    representation that exists: for a single resource, named by
+    ``resource`` as (table, path parameter), a missing row still gets the
+    route's 404. The versions are read before the route queries anything,
+    so a write landing in between can only make the ETag stale, never the
+    body.
+    """
+    async def exists(request: Request) -> bool:
+        if resource is None:
+            return True
+        table, param = resource
+        rows = await AsyncDatabaseManager.execute_query(
+            f"SELECT 1 FROM {table} WHERE id = ?", (request.path_params[param],), cache=True
+        )
+        return bool(rows)
+
+    async def check(request: Request, response: Response):
+        validator = read_validator(request, tables)
+        if validator is None:
+            return
+        etag = f'"{validator}"'
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if matching_etag(if_none_match, validator) or (if_none_match.strip() == "*" and await exists(request)):
+                raise not_modified(etag)
+        response.headers["ETag"] = etag
+    return check
\ No newline at end of file
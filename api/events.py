@@ -0,0 +1,163 @@
+# === api/events.py ===
+"""
+In-process pub/sub for change events.
+
+The change_log table (see api/routes/changes.py) is the source of truth.
+One pump task per process reads new entries and fans them out to
+subscribers. The database writer wakes the pump right after each commit.
+The pump also polls every EVENTS_POLL_INTERVAL seconds, which picks up
+writes made by other processes.
+
+Each subscriber has a bounded queue. A subscriber that falls
+EVENTS_SUBSCRIBER_BUFFER events behind is dropped instead of slowing down
+the others or growing without bound. It is told so after the events it
+already has, and it can reconnect with Last-Event-ID to resume from the
+change log without losing anything.
+"""
+import asyncio
+import json
+from typing import Dict, Any, Optional, Set
+
+from database.async_manager import AsyncDatabaseManager
+from api.routes.changes import CHANGES_AFTER_QUERY, change_entry, change_log_position
+
+PUMP_BATCH_SIZE = 500
+
+class Subscriber:
+    """One event stream: its filters and its bounded queue of pending events"""
+
+    def __init__(
+        self,
+        buffer_size: int,
+        project_id: Optional[int] = None,
+        assignee_id: Optional[int] = None,
+        types: Optional[Set[str]] = None,
+    ):
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=buffer_size)
+        self.project_id = project_id
+        self.assignee_id = assignee_id
+        self.types = types
+        self.dropped = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.types and event["type"] not in self.types and event["entity"] not in self.types:
+            return False
+        data = event["data"] or {}
+        if self.project_id is not None:
+            project_id = event["entity_id"] if event["entity"] == "project" else data.get("project_id")
+            if project_id != self.project_id:
+                return False
+        if self.assignee_id is not None and data.get("assignee_id") != self.assignee_id:
+            return False
+        return True
+
+class EventBroker:
+    """Fans out change_log entries to subscribers as they commit"""
+
+    def __init__(self, buffer_size: int = 1000, poll_interval: float = 1.0, max_subscribers: int = 1000):
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscriber] = set()
+        self._last_seq: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._published = 0
+        self._dropped = 0
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._pump())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._loop = None
+
+    def notify(self, tables: Optional[Set[str]] = None):
+        """Wake the pump; safe to call from any thread (the writer calls it after commits)"""
+        if tables is not None and "change_log" not in tables:
+            return
+        loop = self._loop
+        if loop is not None and self._subscribers:
+            try:
+                loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # loop already closed during shutdown
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    async def subscribe(self, subscriber: Subscriber) -> int:
+        """Register a subscriber; returns the seq from which live events will follow"""
+        if self._last_seq is None:
+            # First subscriber: start publishing from the current end of the log
+            self._last_seq = (await change_log_position())['latest_seq']
+        self._subscribers.add(subscriber)
+        return self._last_seq
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def _pump(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._subscribers:
+                # Nobody listening: the next first subscriber restarts from the end of the log
+                self._last_seq = None
+                continue
+            try:
+                await self._publish_new()
+            except Exception:
+                pass  # database busy or closing; the next round retries from _last_seq
+
+    async def _publish_new(self):
+        while self._subscribers:
+            rows = await AsyncDatabaseManager.execute_query(CHANGES_AFTER_QUERY, (self._last_seq, PUMP_BATCH_SIZE))
+            for row in rows:
+                self.publish(event_from_change(change_entry(row)))
+            if len(rows) < PUMP_BATCH_SIZE:
+                return
+
+    def publish(self, event: Dict[str, Any]):
+        self._last_seq = event["seq"]
+        self._published += 1
+        for subscriber in list(self._subscribers):
+            if not subscriber.matches(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: cut it loose; it resumes from the change log
+                subscriber.dropped = True
+                self._dropped += 1
+                self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "buffer_size": self.buffer_size,
+            "last_seq": self._last_seq,
+            "published": self._published,
+            "dropped_subscribers": self._dropped,
+        }
+
+def event_from_change(change: Dict[str, Any]) -> Dict[str, Any]:
+    """Event for a decoded change_log entry, with its SSE frame rendered once for all subscribers"""
+    change["changed_at"] = change["changed_at"].replace(" ", "T")
+    event_type = f"{change['entity']}.{change['op']}"
+    payload = json.dumps(change, separators=(",", ":"))
+    return {
+        **change,
+        "type": event_type,
+        "frame": f"id: {change['seq']}\nevent: {event_type}\ndata: {payload}\n\n",
+    }
\ No newline at end of file
@@ -0,0 +1,181 @@
+# === api/idempotency.py ===
+"""
+Idempotency keys for create endpoints.
+
+A client that retries ``POST /issues`` (or ``/issues/batch``, ``/projects``,
+``/users``) after a timeout sends the same ``Idempotency-Key`` header both
+times. The first request runs normally and its response is stored under the
+key; the retry gets the stored response back (marked with
+``Idempotent-Replayed: true``) without inserting anything again. A duplicate
+arriving while the first request is still running waits for it instead of
+racing it.
+
+A key is bound to its request: reusing it for a different path, query or
+body is rejected with 422. Server errors (5xx) are not stored, so a retry
+after a 503 runs the request again. Keys live in a per-process LRU that
+forgets them after IDEMPOTENCY_TTL_SECONDS or once IDEMPOTENCY_MAX_KEYS
+newer keys have been stored.
+
+Sub-requests of an atomic batch ignore the header: their writes may still
+be rolled back, so there is no response worth storing.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from database.async_manager import AsyncDatabaseManager
+
+IDEMPOTENT_PATHS = {"/api/v1/issues", "/api/v1/issues/batch", "/api/v1/projects", "/api/v1/users"}
+MAX_KEY_LENGTH = 255
+
+class _Entry:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = asyncio.Event()
+        self.response: Optional[Tuple[int, List[Tuple[bytes, bytes]], bytes]] = None
+        self.expires_at = float("inf")
+
+class IdempotencyStore:
+    """Bounded, TTL-evicted map of idempotency key -> stored response"""
+
+    def __init__(self, ttl: float = 86400, max_keys: int = 10000):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._replays = 0
+        self._conflicts = 0
+        self._evictions = 0
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self._evictions += 1
+            return None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def begin(self, key: str, fingerprint: str) -> Tuple[_Entry, bool]:
+        """Claim key for a new request, or return the entry it already has
+
+        Returns (entry, owner). The owner must call finish() or abandon();
+        a non-owner gets an entry whose response is ready.
+        """
+        while True:
+            entry = self._lookup(key)
+            if entry is None:
+                entry = _Entry(fingerprint)
+                self._entries[key] = entry
+                self._evict()
+                return entry, True
+            if entry.fingerprint != fingerprint:
+                self._conflicts += 1
+                return entry, False
+            await entry.done.wait()
+            if entry.response is not None:
+                self._replays += 1
+                return entry, False
+            # The first request failed without a storable response; try to claim the key again
+
+    def finish(self, key: str, entry: _Entry, response: Tuple[int, List[Tuple[bytes, bytes]], bytes]):
+        entry.response = response
+        entry.expires_at = time.monotonic() + self.ttl
+        entry.done.set()
+
+    def abandon(self, key: str, entry: _Entry):
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def _evict(self):
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._entries),
+            "max_keys": self.max_keys,
+            "ttl_seconds": self.ttl,
+            "replays": self._replays,
+            "conflicts": self._conflicts,
+            "evictions": self._evictions,
+        }
+
+class IdempotencyMiddleware:
+    """ASGI middleware applying Idempotency-Key semantics to create endpoints"""
+
+    def __init__(self, app, store: IdempotencyStore):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in IDEMPOTENT_PATHS
+                or AsyncDatabaseManager.in_write_session()):
+            return await self.app(scope, receive, send)
+        key = dict(scope["headers"]).get(b"idempotency-key")
+        if key is None:
+            return await self.app(scope, receive, send)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"})
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["path"].encode(), scope["query_string"], body])
+        ).hexdigest()
+        key = key.decode("latin-1")
+        entry, owner = await self.store.begin(key, fingerprint)
+        if not owner:
+            if entry.fingerprint != fingerprint:
+                return await _send_json(send, 422, {"detail": "Idempotency-Key was already used for a different request"})
+            status, headers, stored_body = entry.response
+            await send({"type": "http.response.start", "status": status,
+                        "headers": headers + [(b"idempotent-replayed", b"true")]})
+            return await send({"type": "http.response.body", "body": stored_body})
+
+        replayed_body = False
+
+        async def replay_receive():
+            nonlocal replayed_body
+            if not replayed_body:
+                replayed_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        captured = {"status": 500, "headers": [], "body": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            self.store.abandon(key, entry)
+            raise
+        if captured["status"] >= 500:
+            self.store.abandon(key, entry)
+        else:
+            self.store.finish(key, entry, (captured["status"], captured["headers"], b"".join(captured["body"])))
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+async def _send_json(send, status: int, content: dict):
+    body = json.dumps(content).encode()
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
\ No newline at end of file
@@ -0,0 +1,64 @@
+# === api/pagination.py ===
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints order rows by a (timestamp, id) key and fetch one row more
+than the page size. When that extra row exists, the key of the last row on
+the page is encoded into an opaque cursor and advertised through a ``Link:
+<...>; rel="next"`` header and an ``X-Next-Cursor`` header. Passing it back
+as ``?cursor=`` seeks straight to the next page through the index, so every
+page costs the same no matter how deep it is.
+"""
+import base64
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque cursor"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+# Types each part of a (timestamp, id) sort key may decode to; timestamps can be NULL
+KEY_TYPES = ((str, type(None)), (int,))
+
+def decode_cursor(cursor: str, types: Sequence[Tuple[type, ...]] = KEY_TYPES) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, checking each value against types"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Exact type checks: anything else (objects, lists, booleans) would reach parameter binding
+    if not all(type(value) in allowed for value, allowed in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_condition(columns: Tuple[str, ...], cursor: str) -> Tuple[str, List[Any]]:
+    """SQL condition selecting rows after the cursor in descending key order
+
+    columns is a (timestamp, id) key, as everywhere in this module.
+    """
+    values = decode_cursor(cursor, KEY_TYPES)
+    placeholders = ", ".join("?" for _ in columns)
+    return f" AND ({', '.join(columns)}) < ({placeholders})", values
+
+def paginate(
+    rows: List[Dict],
+    limit: int,
+    keys: Tuple[str, ...],
+    request: Request,
+    response: Response,
+) -> List[Dict]:
+    """Trim the look-ahead row and advertise the next page, if any"""
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    next_cursor = encode_cursor([rows[-1][key] for key in keys])
+    next_url = request.url.remove_query_params("offset").include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
+    return rows
\ No newline at end of file
@@ -0,0 +1,241 @@
+# === api/responses.py ===
+"""
+Fast JSON responses for rows read straight from our own tables.
+
+FastAPI validates a route's return value against its response_model, then
+encodes the validated models in a second pass. For a 100-row page of issues
+that builds 100 pydantic models and parses 200 timestamps, only to turn
+them back into the strings SQLite handed us. Rows from our own schema
+already fit their model, so list endpoints build the body themselves:
+
+- each row is trimmed to the model's fields, in declaration order, with
+  defaults filled in;
+- timestamps are rewritten to the ISO form pydantic would produce;
+- the result is encoded with orjson when it is installed, and with the
+  standard library otherwise.
+
+The routes keep their response_model, so the OpenAPI schema does not change.
+The body matches the validated path byte for byte. Set
+FAST_JSON_RESPONSES=false to validate every row again.
+
+Rows that are served over and over (issues on hot pages) can also go
+through a FragmentCache. It keeps each row's rendered JSON and reuses it
+while the row is unchanged, so a page becomes a concatenation of cached
+bytes.
+
+With ``?stream=true``, list endpoints instead send the whole result as one
+JSON array, encoded chunk by chunk as AsyncDatabaseManager.stream_query
+fetches it. Memory stays bounded by STREAM_CHUNK_SIZE rather than the result.
+"""
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union, get_args
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+from config import FAST_JSON_RESPONSES
+from database.async_manager import AsyncDatabaseManager
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; output is identical without it
+    orjson = None
+
+_datetime = TypeAdapter(datetime)
+_shapes: Dict[type, List[Tuple[str, Any, bool]]] = {}
+
+def dumps(content: Any) -> bytes:
+    """Encode content exactly as JSONResponse would, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when it is installed"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def _shape(model: Type[BaseModel]) -> List[Tuple[str, Any, bool]]:
+    """(field name, default, is timestamp) for each of the model's fields"""
+    shape = _shapes.get(model)
+    if shape is None:
+        shape = [
+            (name, None if field.is_required() else field.get_default(call_default_factory=True),
+             datetime in (field.annotation, *get_args(field.annotation)))
+            for name, field in model.model_fields.items()
+        ]
+        _shapes[model] = shape
+    return shape
+
+def iso_timestamp(value: Any) -> Optional[str]:
+    """A timestamp column as pydantic serializes it: SQLite's 'YYYY-MM-DD HH:MM:SS' gets a 'T'"""
+    if isinstance(value, str) and len(value) == 19 and value[10] in " T":
+        return value[:10] + "T" + value[11:]
+    if value is None:
+        return None
+    return _datetime.dump_python(_datetime.validate_python(value), mode="json")
+
+def trusted_rows(rows: Iterable[Dict[str, Any]], model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """Shape rows from our own schema like model_dump(mode="json"), without validating them"""
+    shape = _shape(model)
+    return [
+        {name: (iso_timestamp(row.get(name)) if timestamp else row.get(name, default))
+         for name, default, timestamp in shape}
+        for row in rows
+    ]
+
+class FragmentCache:
+    """Rendered JSON of rows, keyed by id and reused while the row is unchanged
+
+    A fragment is reused only while the row's ``signature`` columns still
+    hold the values it was rendered from: its version plus any joined
+    columns (names of related rows), so renaming a project or user
+    re-renders exactly the rows that show the old name. ``prepare`` (e.g.
+    decode_labels) runs only for rows that are rendered.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        signature: Tuple[str, ...],
+        prepare: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        max_entries: int = 10000,
+    ):
+        self.model = model
+        self.signature = signature
+        self.prepare = prepare
+        self.max_entries = max_entries
+        self._fragments: "OrderedDict[Any, Tuple[tuple, bytes]]" = OrderedDict()
+        self._hits = 0
+        self._renders = 0
+
+    def render(self, rows: List[Dict[str, Any]]) -> List[bytes]:
+        """JSON bytes for each row, as trusted_rows + dumps would produce"""
+        # Rows read inside a write session may yet be rolled back: render them, but keep nothing
+        store = self.max_entries > 0 and not AsyncDatabaseManager.in_write_session()
+        fragments = []
+        for row in rows:
+            key = row["id"]
+            signature = tuple(row.get(column) for column in self.signature)
+            cached = self._fragments.get(key)
+            if cached is not None and cached[0] == signature:
+                self._fragments.move_to_end(key)
+                self._hits += 1
+                fragments.append(cached[1])
+                continue
+            if self.prepare is not None:
+                self.prepare([row])
+            fragment = dumps(trusted_rows([row], self.model)[0])
+            self._renders += 1
+            if store:
+                self._fragments[key] = (signature, fragment)
+                self._fragments.move_to_end(key)
+                if len(self._fragments) > self.max_entries:
+                    self._fragments.popitem(last=False)
+            fragments.append(fragment)
+        return fragments
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._renders
+        return {
+            "entries": len(self._fragments),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "renders": self._renders,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+def trusted_response(
+    rows: List[Dict[str, Any]],
+    model: Type[BaseModel],
+    response: Optional[Response] = None,
+    fragments: Optional[FragmentCache] = None,
+) -> Union[Response, List[Dict[str, Any]]]:
+    """Return a list endpoint's rows without re-validating them against model
+
+    Headers already set on the route's ``response`` (pagination links) are
+    carried over. With ``fragments`` the rows are rendered through that
+    cache (which also prepares them). With FAST_JSON_RESPONSES disabled the
+    rows are returned as they are, for FastAPI to validate.
+    """
+    if not FAST_JSON_RESPONSES:
+        if fragments is not None and fragments.prepare is not None:
+            fragments.prepare(rows)
+        return rows
+    if fragments is not None:
+        body = b"[" + b",".join(fragments.render(rows)) + b"]"
+        return Response(body, media_type="application/json", headers=carried_headers(response))
+    return FastJSONResponse(trusted_rows(rows, model), headers=carried_headers(response))
+
+def carried_headers(response: Optional[Response]) -> Optional[Dict[str, str]]:
+    """Headers a route set on its injected response (ETag, pagination links)"""
+    if response is None:
+        return None
+    return {key: value for key, value in response.headers.items()
+            if key not in ("content-length", "content-type")}
+
+def prefers_minimal(return_: str, prefer: Optional[str]) -> bool:
+    """True for ``?return=minimal`` or a ``Prefer: return=minimal`` header (RFC 7240)"""
+    if return_ == "minimal":
+        return True
+    for preference in (prefer or "").split(","):
+        name, _, value = preference.split(";", 1)[0].partition("=")
+        if name.strip().lower() == "return" and value.strip().strip('"').lower() == "minimal":
+            return True
+    return False
+
+def minimal_response(location: str, etag: Optional[str] = None) -> Response:
+    """Empty response for return=minimal; the resource is at ``Location``"""
+    headers = {"Location": location, "Preference-Applied": "return=minimal"}
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(headers=headers)
+
+def decode_labels(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parse issue rows' stored labels JSON in place"""
+    for issue in issues:
+        issue['labels'] = json.loads(issue['labels']) if issue['labels'] else []
+    return issues
+
+async def streaming_json_array(
+    chunks: AsyncIterator[List[Dict[str, Any]]],
+    model: Optional[Type[BaseModel]] = None,
+    prepare: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+    response: Optional[Response] = None,
+    fragments: Optional[FragmentCache] = None,
+) -> Response:
+    """Stream chunks of rows as a single JSON array
+
+    Each chunk is passed through ``prepare`` (e.g. decode_labels), shaped
+    like trusted_rows when a model is given, and encoded as it arrives; or
+    rendered through ``fragments`` when one is given. The
+    first chunk is fetched before responding, so a failing query still gets
+    its proper status (e.g. 503) instead of a truncated 200. Headers set on
+    the route's ``response`` are carried over.
+    """
+    def encode(rows):
+        if fragments is not None:
+            return b",".join(fragments.render(rows))
+        if prepare is not None:
+            prepare(rows)
+        return dumps(trusted_rows(rows, model) if model is not None else rows)[1:-1]
+
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        return FastJSONResponse([], headers=carried_headers(response))
+
+    async def body():
+        try:
+            yield b"[" + encode(first)
+            async for rows in chunks:
+                yield b"," + encode(rows)
+        finally:
+            await chunks.aclose()
+        yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json", headers=carried_headers(response))
\ No newline at end of file
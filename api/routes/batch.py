@@ -0,0 +1,142 @@
+# === api/routes/batch.py ===
+from fastapi import APIRouter, HTTPException, Request
+from typing import Any, Dict, List
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.async_manager import AsyncDatabaseManager
+from api.schemas.batch_schema import BatchRequest, BatchSubRequest, BatchSubResponse
+from api.responses import FastJSONResponse
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1/"
+# Never batched: the batch endpoint itself, and an event stream that does not end
+UNBATCHABLE_PATHS = {"/api/v1/batch", "/api/v1/events"}
+
+def sub_request_scope(request: Request, sub: BatchSubRequest, body: bytes) -> Dict[str, Any]:
+    """ASGI scope for a sub-request, inheriting the batch request's connection details"""
+    path, _, query = sub.path.partition("?")
+    headers = {name.lower().encode("latin-1"): value.encode("latin-1") for name, value in sub.headers.items()}
+    authorization = request.headers.get("authorization")
+    if authorization is not None:
+        headers.setdefault(b"authorization", authorization.encode("latin-1"))
+    if body:
+        headers[b"content-type"] = b"application/json"
+        headers[b"content-length"] = str(len(body)).encode()
+    return {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": list(headers.items()),
+    }
+
+async def dispatch(request: Request, sub: BatchSubRequest) -> Dict[str, Any]:
+    """Run one sub-request through the app, in-process, and collect its response"""
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # The client cannot go away mid-request; wait until the response is done
+        await asyncio.Event().wait()
+
+    captured = {"status": 500, "headers": [], "body": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            captured["status"] = message["status"]
+            captured["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            captured["body"].append(message.get("body", b""))
+
+    try:
+        await request.app(sub_request_scope(request, sub, body), receive, send)
+    except Exception:
+        pass  # the app has already sent its 500 response
+
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in captured["headers"] if name.lower() != b"content-length"
+    }
+    content = b"".join(captured["body"])
+    if not content:
+        content = None
+    elif headers.get("content-type", "").startswith("application/json"):
+        content = json.loads(content)
+    else:
+        content = content.decode("utf-8", errors="replace")
+    return {"status": captured["status"], "headers": headers, "body": content}
+
+async def run_in_order(request: Request, subs: List[BatchSubRequest]) -> List[Dict[str, Any]]:
+    """Run sub-requests in order, with each run of consecutive GETs in parallel"""
+    results = []
+    reads = []
+    for sub in subs + [None]:
+        if sub is not None and sub.method == "GET":
+            reads.append(sub)
+            continue
+        if reads:
+            results.extend(await asyncio.gather(*(dispatch(request, read) for read in reads)))
+            reads = []
+        if sub is not None:
+            results.append(await dispatch(request, sub))
+    return results
+
+async def run_atomically(request: Request, subs: List[BatchSubRequest]) -> List[Dict[str, Any]]:
+    """Run sub-requests one by one in a single transaction, rolling back on the first failure"""
+    results = []
+    failed = None
+    async with AsyncDatabaseManager.write_session() as session:
+        for index, sub in enumerate(subs):
+            result = await dispatch(request, sub)
+            results.append(result)
+            if result["status"] >= 400:
+                failed = index
+                session.rollback()
+                break
+    if failed is None:
+        return results
+
+    rolled_back = {"status": 424, "headers": {}, "body": {"detail": f"Rolled back: request {failed} failed"}}
+    not_run = {"status": 424, "headers": {}, "body": {"detail": f"Not run: request {failed} failed"}}
+    return [rolled_back] * failed + [results[-1]] + [not_run] * (len(subs) - failed - 1)
+
+@router.post("/batch", response_model=List[BatchSubResponse])
+async def run_batch(request: Request, batch: BatchRequest):
+    """Run several API requests in one round trip
+
+    Sub-requests go through the same routes (and middleware) as separate
+    requests and answer in the order given. Consecutive GETs run in
+    parallel; anything else runs after the requests before it. With
+    ``atomic`` every sub-request runs, one at a time, in a single
+    transaction: the first one answering 4xx or 5xx rolls everything back,
+    and every other entry answers 424. Other writers wait while an atomic
+    batch runs.
+    """
+    for index, sub in enumerate(batch.requests):
+        path = sub.path.partition("?")[0]
+        if not path.startswith(API_PREFIX) or path in UNBATCHABLE_PATHS:
+            raise HTTPException(status_code=422, detail=f"requests[{index}]: {sub.path} cannot be batched")
+
+    if batch.atomic:
+        results = await run_atomically(request, batch.requests)
+    else:
+        results = await run_in_order(request, batch.requests)
+    return FastJSONResponse(results)
\ No newline at end of file
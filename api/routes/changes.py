@@ -0,0 +1,71 @@
+# === api/routes/changes.py ===
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.async_manager import AsyncDatabaseManager
+from api.schemas.change_schema import ChangeFeed
+from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter()
+
+CHANGES_AFTER_QUERY = """
+    SELECT seq, entity, entity_id, op, data, changed_at
+    FROM change_log
+    WHERE seq > ?
+    ORDER BY seq
+    LIMIT ?
+"""
+
+CHANGE_LOG_POSITION_QUERY = """
+    SELECT h.pruned_seq,
+           COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'change_log'), 0) as latest_seq
+    FROM change_log_horizon h
+"""
+
+def change_entry(row: dict) -> dict:
+    """Decode a change_log row's JSON snapshot"""
+    row['data'] = json.loads(row['data']) if row['data'] else None
+    return row
+
+async def change_log_position() -> dict:
+    """The retention horizon (pruned_seq) and newest sequence number (latest_seq)"""
+    return (await AsyncDatabaseManager.execute_query(CHANGE_LOG_POSITION_QUERY))[0]
+
+@router.get("/changes", response_model=ChangeFeed)
+async def get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Creates, updates and deletes of issues, projects and users after ``since``
+
+    Entries come in sequence order; pass ``next_since`` back as ``since`` to
+    continue. Without ``since`` no entries are returned, only the current
+    position, so a client can load the full lists and then follow the feed
+    from there. A ``since`` older than the retention window returns 410: the
+    client has missed changes and must reload the full lists.
+    """
+    rows = []
+    if since is not None:
+        rows = await AsyncDatabaseManager.execute_query(CHANGES_AFTER_QUERY, (since, limit))
+
+    # Read the horizon after the entries, so a prune running in between is noticed
+    position = await change_log_position()
+    if since is None:
+        since = position['latest_seq']
+    elif since < position['pruned_seq']:
+        raise HTTPException(
+            status_code=410,
+            detail=f"Changes up to {position['pruned_seq']} are no longer retained, reload the full lists"
+        )
+
+    return {
+        "changes": [change_entry(row) for row in rows],
+        "next_since": rows[-1]['seq'] if rows else since,
+        "latest_seq": position['latest_seq'],
+    }
\ No newline at end of file
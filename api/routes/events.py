@@ -0,0 +1,95 @@
+# === api/routes/events.py ===
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.async_manager import AsyncDatabaseManager
+from api.events import Subscriber, event_from_change, PUMP_BATCH_SIZE
+from api.routes.changes import CHANGES_AFTER_QUERY, change_entry, change_log_position
+from config import EVENTS_HEARTBEAT_INTERVAL
+
+router = APIRouter()
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    types: Optional[str] = Query(None, description="Comma-separated event types (issue.update) or entities (issue)"),
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Server-Sent Events stream of issue, project and user changes
+
+    Each event has the change's sequence number as its ``id``, a type such
+    as ``issue.update`` and the change_log entry as JSON ``data``. Resume
+    after a disconnect with ``Last-Event-ID`` (browsers send it
+    automatically) or ``?since=<seq>``. A stream that falls too far behind
+    ends with a ``dropped`` event; reconnecting resumes where it stopped.
+    """
+    broker = request.app.state.event_broker
+    if broker.full:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+    
+    resume_from = since
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+        resume_from = int(last_event_id)
+    
+    subscriber = Subscriber(
+        broker.buffer_size,
+        project_id=project_id,
+        assignee_id=assignee_id,
+        types={t.strip() for t in types.split(",") if t.strip()} if types else None,
+    )
+    live_from = await broker.subscribe(subscriber)
+    try:
+        if resume_from is not None and resume_from < (await change_log_position())['pruned_seq']:
+            raise HTTPException(status_code=410, detail="Changes since that event are no longer retained, reload the full lists")
+    except BaseException:
+        broker.unsubscribe(subscriber)
+        raise
+    
+    async def stream():
+        last_sent = live_from if resume_from is None else resume_from
+        try:
+            # Backlog from the change log first; live events it overlaps are skipped by seq
+            while resume_from is not None:
+                rows = await AsyncDatabaseManager.execute_query(CHANGES_AFTER_QUERY, (last_sent, PUMP_BATCH_SIZE))
+                for row in rows:
+                    event = event_from_change(change_entry(row))
+                    last_sent = event["seq"]
+                    if subscriber.matches(event):
+                        yield event["frame"]
+                if len(rows) < PUMP_BATCH_SIZE:
+                    break
+            
+            while True:
+                if subscriber.dropped and subscriber.queue.empty():
+                    reason = {"reason": "slow consumer", "last_event_id": last_sent}
+                    yield f"event: dropped\ndata: {json.dumps(reason)}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=EVENTS_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event["seq"] > last_sent:
+                    last_sent = event["seq"]
+                    yield event["frame"]
+        finally:
+            broker.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
\ No newline at end of file
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+import asyncio
 import json
 import sys
 from pathlib import Path
@@ -7,20 +9,92 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from database.connection import DatabaseManager
-from api.schemas.issue_schema import IssueCreate, IssueUpdate, IssueResponse
+from database.async_manager import AsyncDatabaseManager
+from database.contention import DatabaseUnavailable
+from api.schemas.issue_schema import IssueCreate, IssueUpdate, IssueResponse, IssueBatchResult
+from api.pagination import keyset_condition, paginate
+from api.etags import conditional_get, format_etag, if_match_condition, matching_etag, not_modified, read_validator
+from api.responses import FragmentCache, decode_labels, minimal_response, prefers_minimal, streaming_json_array, trusted_response
+from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_ISSUE_BATCH_SIZE, MAX_BULK_REASSIGN_SIZE, ISSUE_FRAGMENT_CACHE_SIZE
 
 router = APIRouter()
 
-@router.get("/issues", response_model=List[IssueResponse])
+# Rendered issue rows for the list endpoints. Every write to an issue bumps
+# its version (or at least updated_at); the joined names cover renames.
+issue_fragments = FragmentCache(
+    IssueResponse,
+    ("version", "updated_at", "labels", "project_name", "author_name", "assignee_name"),
+    prepare=decode_labels,
+    max_entries=ISSUE_FRAGMENT_CACHE_SIZE,
+)
+
+def parse_label_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated label filter into distinct label names"""
+    if not value:
+        return []
+    return list(dict.fromkeys(label.strip() for label in value.split(",") if label.strip()))
+
+def label_condition(names: List[str], match_all: bool):
+    """SQL condition matching issues with all (or any) of the given labels
+
+    Matching all labels walks idx_issue_labels_label from the rarest of them
+    (by labels.issues_count) and checks the others per issue on the primary
+    key, so the cost follows the rarest label, not the most common one.
+    """
+    placeholders = ", ".join("?" for _ in names)
+    if not match_all:
+        condition = f"""
+            AND i.id IN (
+                SELECT il.issue_id FROM issue_labels il
+                JOIN labels l ON l.id = il.label_id
+                WHERE l.name IN ({placeholders})
+            )
+        """
+        return condition, list(names)
+    
+    condition = f"""
+        AND i.id IN (
+            SELECT il.issue_id FROM issue_labels il
+            WHERE il.label_id = (
+                SELECT id FROM labels WHERE name IN ({placeholders}) ORDER BY issues_count LIMIT 1
+            )
+    """
+    params = list(names)
+    if len(names) > 1:
+        for name in names:
+            condition += """
+                AND EXISTS (
+                    SELECT 1 FROM issue_labels other
+                    WHERE other.issue_id = il.issue_id
+                      AND other.label_id = (SELECT id FROM labels WHERE name = ?)
+                )
+            """
+            params.append(name)
+    return condition + ")", params
+
+@router.get("/issues", response_model=List[IssueResponse],
+            dependencies=[Depends(conditional_get("issues", "projects", "users", "labels", "issue_labels"))])
 async def get_issues(
+    request: Request,
+    response: Response,
     state: Optional[str] = None,
     assignee_id: Optional[int] = None,
     project_id: Optional[int] = None,
-    limit: int = 100,
-    offset: int = 0
+    labels: Optional[str] = None,
+    labels_any: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    offset: int = Query(0, ge=0, deprecated=True),
+    stream: bool = False
 ):
-    """Get all issues with filtering options"""
+    """Get all issues with filtering options
+
+    ``labels`` matches issues carrying every listed label and ``labels_any``
+    matches issues carrying at least one; both take comma-separated names.
+    Follow the ``Link`` header (or pass ``X-Next-Cursor`` as ``cursor``) for
+    the next page. ``stream=true`` sends every matching issue (after
+    ``cursor``, if given) as one array, streamed as it is read.
+    """
     base_query = """
         SELECT i.*, p.name as project_name, 
                a.name as author_name, as_u.name as assignee_name
@@ -45,23 +119,51 @@ async def get_issues(
         base_query += " AND i.project_id = ?"
         params.append(project_id)
     
-    base_query += " ORDER BY i.updated_at DESC LIMIT ? OFFSET ?"
-    params.extend([limit, offset])
+    for names, match_all in ((parse_label_list(labels), True), (parse_label_list(labels_any), False)):
+        if names:
+            condition, label_params = label_condition(names, match_all)
+            base_query += condition
+            params.extend(label_params)
+    
+    if cursor:
+        condition, cursor_params = keyset_condition(("i.updated_at", "i.id"), cursor)
+        base_query += condition
+        params.extend(cursor_params)
+        offset = 0
+    
+    base_query += " ORDER BY i.updated_at DESC, i.id DESC"
+    if stream:
+        return await streaming_json_array(
+            AsyncDatabaseManager.stream_query(base_query, params), IssueResponse, decode_labels, response,
+            fragments=issue_fragments
+        )
     
-    issues = DatabaseManager.execute_query(base_query, params)
+    # Fetch one extra row to learn whether there is a next page
+    base_query += " LIMIT ? OFFSET ?"
+    params.extend([limit + 1, offset])
     
-    # Parse labels JSON
-    for issue in issues:
-        if issue['labels']:
-            issue['labels'] = json.loads(issue['labels'])
-        else:
-            issue['labels'] = []
+    issues = paginate(
+        await AsyncDatabaseManager.execute_query(base_query, params),
+        limit, ("updated_at", "id"), request, response
+    )
     
-    return issues
+    # Labels JSON is parsed only for rows not already rendered
+    return trusted_response(issues, IssueResponse, response, fragments=issue_fragments)
 
 @router.get("/issues/{issue_id}", response_model=IssueResponse)
-async def get_issue(issue_id: int):
-    """Get issue by ID"""
+async def get_issue(issue_id: int, request: Request, response: Response):
+    """Get issue by ID; the ETag header carries the issue's version
+
+    The ETag also carries a validator for the issue, project and user tables;
+    while it matches, ``If-None-Match`` is answered with 304 without a query.
+    ``If-None-Match: *`` is answered with 304 once the issue is found.
+    Inside an atomic batch neither is sent nor checked.
+    """
+    validator = read_validator(request, ("issues", "projects", "users"))
+    matched = validator and matching_etag(request.headers.get("if-none-match"), validator)
+    if matched:
+        raise not_modified(matched)
+    
     query = """
         SELECT i.*, p.name as project_name, 
                a.name as author_name, as_u.name as assignee_name
@@ -72,7 +174,7 @@ async def get_issue(issue_id: int):
         WHERE i.id = ?
     """
     
-    issues = DatabaseManager.execute_query(query, (issue_id,))
+    issues = await AsyncDatabaseManager.execute_query(query, (issue_id,))
     
     if not issues:
         raise HTTPException(status_code=404, detail="Issue not found")
@@ -85,54 +187,146 @@ async def get_issue(issue_id: int):
     else:
         issue['labels'] = []
     
+    if validator is not None:
+        etag = format_etag(issue['version'], validator)
+        if request.headers.get("if-none-match", "").strip() == "*":
+            raise not_modified(etag)  # * matches any issue that exists
+        response.headers["ETag"] = etag
+    return issue
+
+def issue_response(row, names: dict) -> dict:
+    """Build an IssueResponse dict from a RETURNING row and the joined names"""
+    issue = dict(row)
+    issue['labels'] = json.loads(issue['labels']) if issue['labels'] else []
+    issue.update(names)
     return issue
 
 @router.post("/issues", response_model=IssueResponse)
-async def create_issue(issue: IssueCreate, author_id: Optional[int] = None):
-    """Create a new issue"""
-    # Validate project exists
-    project_check = DatabaseManager.execute_query(
-        "SELECT id FROM projects WHERE id = ?", 
-        (issue.project_id,)
-    )
-    if not project_check:
-        raise HTTPException(status_code=400, detail="Project not found")
-    
-    # Validate assignee exists if provided
-    if issue.assignee_id:
-        assignee_check = DatabaseManager.execute_query(
-            "SELECT id FROM users WHERE id = ?", 
-            (issue.assignee_id,)
-        )
-        if not assignee_check:
+async def create_issue(
+    issue: IssueCreate,
+    request: Request,
+    response: Response,
+    author_id: Optional[int] = None,
+    return_: Literal["representation", "minimal"] = Query("representation", alias="return"),
+    prefer: Optional[str] = Header(None)
+):
+    """Create a new issue
+
+    Validation, insert and response row share one connection and one
+    transaction. ``return=minimal`` (or ``Prefer: return=minimal``) responds
+    with an empty body and the new issue's ``Location``.
+    """
+    labels_json = json.dumps(issue.labels) if issue.labels else json.dumps([])
+    
+    def insert(conn):
+        # Validate project and assignee, and fetch the names for the response, in one query
+        refs = conn.execute("""
+            SELECT (SELECT name FROM projects WHERE id = ?) as project_name,
+                   (SELECT name FROM users WHERE id = ?) as assignee_name,
+                   (SELECT name FROM users WHERE id = ?) as author_name
+        """, (issue.project_id, issue.assignee_id, author_id)).fetchone()
+        if refs['project_name'] is None:
+            raise HTTPException(status_code=400, detail="Project not found")
+        if issue.assignee_id and refs['assignee_name'] is None:
             raise HTTPException(status_code=400, detail="Assignee not found")
+        
+        row = conn.execute("""
+            INSERT INTO issues (title, description, project_id, author_id, assignee_id, state, labels) 
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING *
+        """, (issue.title, issue.description, issue.project_id,
+              author_id, issue.assignee_id, issue.state, labels_json)).fetchone()
+        return issue_response(row, dict(refs))
     
-    labels_json = json.dumps(issue.labels) if issue.labels else json.dumps([])
+    try:
+        created = await AsyncDatabaseManager.run_in_transaction(insert)
+    except (HTTPException, DatabaseUnavailable):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create issue: {str(e)}")
     
-    query = """
+    etag = format_etag(created['version'])
+    if prefers_minimal(return_, prefer):
+        return minimal_response(str(request.url_for("get_issue", issue_id=created['id'])), etag)
+    response.headers["ETag"] = etag
+    return created
+
+def insert_issue_batch(conn, issues: List[IssueCreate], author_id: Optional[int], atomic: bool) -> dict:
+    """Validate and insert a batch of issues on one connection, inside its transaction"""
+    # One set-based lookup validates every referenced project and assignee
+    project_ids = sorted({issue.project_id for issue in issues})
+    assignee_ids = sorted({issue.assignee_id for issue in issues if issue.assignee_id})
+    rows = conn.execute("""
+        SELECT 'project' as kind, id FROM projects WHERE id IN (SELECT value FROM json_each(?))
+        UNION ALL
+        SELECT 'user' as kind, id FROM users WHERE id IN (SELECT value FROM json_each(?))
+    """, (json.dumps(project_ids), json.dumps(assignee_ids))).fetchall()
+    known_projects = {row['id'] for row in rows if row['kind'] == 'project'}
+    known_users = {row['id'] for row in rows if row['kind'] == 'user'}
+    
+    failed = []
+    values = []
+    for index, issue in enumerate(issues):
+        if issue.project_id not in known_projects:
+            failed.append({"index": index, "detail": "Project not found"})
+        elif issue.assignee_id and issue.assignee_id not in known_users:
+            failed.append({"index": index, "detail": "Assignee not found"})
+        else:
+            values.append((issue.title, issue.description, issue.project_id, author_id,
+                           issue.assignee_id, issue.state, json.dumps(issue.labels or [])))
+    
+    if failed and atomic:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"{len(failed)} of {len(issues)} issues are invalid, nothing was created",
+                    "failed": failed}
+        )
+    
+    # Each insert reports its own id, so created_ids never depend on what else the commit holds
+    insert = """
         INSERT INTO issues (title, description, project_id, author_id, assignee_id, state, labels) 
         VALUES (?, ?, ?, ?, ?, ?, ?)
+        RETURNING id
     """
+    created_ids = [conn.execute(insert, row).fetchone()[0] for row in values]
     
-    try:
-        issue_id = DatabaseManager.execute_insert(
-            query, 
-            (issue.title, issue.description, issue.project_id, 
-             author_id, issue.assignee_id, issue.state, labels_json)
-        )
-        # Return the created issue
-        return await get_issue(issue_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create issue: {str(e)}")
+    return {"created_count": len(created_ids), "created_ids": created_ids, "failed": failed}
 
-@router.patch("/issues/{issue_id}", response_model=IssueResponse)
-async def update_issue(issue_id: int, issue_update: IssueUpdate):
-    """Update an existing issue"""
-    # Check if issue exists
-    existing = DatabaseManager.execute_query("SELECT * FROM issues WHERE id = ?", (issue_id,))
-    if not existing:
-        raise HTTPException(status_code=404, detail="Issue not found")
+@router.post("/issues/batch", response_model=IssueBatchResult)
+async def create_issues_batch(issues: List[IssueCreate], author_id: Optional[int] = None, atomic: bool = True):
+    """Create many issues in a single transaction
+
+    With ``atomic=true`` (the default) any invalid item rejects the whole
+    batch; with ``atomic=false`` valid items are created and invalid ones are
+    reported in ``failed``.
+    """
+    if not issues:
+        raise HTTPException(status_code=400, detail="No issues to create")
+    if len(issues) > MAX_ISSUE_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_ISSUE_BATCH_SIZE} issues")
     
+    return await AsyncDatabaseManager.run_in_transaction(
+        lambda conn: insert_issue_batch(conn, issues, author_id, atomic), kind="insert"
+    )
+
+@router.patch("/issues/{issue_id}", response_model=IssueResponse)
+async def update_issue(
+    issue_id: int,
+    issue_update: IssueUpdate,
+    request: Request,
+    response: Response,
+    return_: Literal["representation", "minimal"] = Query("representation", alias="return"),
+    if_match: Optional[str] = Header(None),
+    prefer: Optional[str] = Header(None)
+):
+    """Update an existing issue
+
+    Validation, update and response row share one connection and one
+    transaction. ``return=minimal`` (or ``Prefer: return=minimal``) responds
+    with an empty body and the issue's ``Location``.
+    With ``If-Match: "<version>"`` the update only applies if the issue is
+    still at that version, otherwise it fails with 412.
+    """
     # Build update query dynamically
     update_fields = []
     params = []
@@ -146,13 +340,6 @@ async def update_issue(issue_id: int, issue_update: IssueUpdate):
         params.append(issue_update.description)
     
     if issue_update.assignee_id is not None:
-        # Validate assignee exists
-        assignee_check = DatabaseManager.execute_query(
-            "SELECT id FROM users WHERE id = ?", 
-            (issue_update.assignee_id,)
-        )
-        if not assignee_check:
-            raise HTTPException(status_code=400, detail="Assignee not found")
         update_fields.append("assignee_id = ?")
         params.append(issue_update.assignee_id)
     
@@ -164,71 +351,161 @@ async def update_issue(issue_id: int, issue_update: IssueUpdate):
         update_fields.append("labels = ?")
         params.append(json.dumps(issue_update.labels))
     
-    if not update_fields:
-        raise HTTPException(status_code=400, detail="No fields to update")
-    
+    nothing_to_update = not update_fields
     update_fields.append("updated_at = CURRENT_TIMESTAMP")
+    update_fields.append("version = version + 1")
     params.append(issue_id)
-    
-    query = f"UPDATE issues SET {', '.join(update_fields)} WHERE id = ?"
-    
-    DatabaseManager.execute_update(query, params)
-    
-    return await get_issue(issue_id)
+    version_condition, version_params = if_match_condition(if_match)
+    params.extend(version_params)
+    
+    def update(conn):
+        # Check the issue exists, validate a new assignee and fetch the names for the response
+        refs = conn.execute("""
+            SELECT p.name as project_name, a.name as author_name, as_u.name as assignee_name,
+                   (SELECT name FROM users WHERE id = ?) as new_assignee_name
+            FROM issues i
+            LEFT JOIN projects p ON i.project_id = p.id
+            LEFT JOIN users a ON i.author_id = a.id
+            LEFT JOIN users as_u ON i.assignee_id = as_u.id
+            WHERE i.id = ?
+        """, (issue_update.assignee_id, issue_id)).fetchone()
+        if refs is None:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        names = dict(refs)
+        new_assignee_name = names.pop('new_assignee_name')
+        if issue_update.assignee_id is not None:
+            if new_assignee_name is None:
+                raise HTTPException(status_code=400, detail="Assignee not found")
+            names['assignee_name'] = new_assignee_name
+        
+        if nothing_to_update:
+            raise HTTPException(status_code=400, detail="No fields to update")
+        
+        row = conn.execute(
+            f"UPDATE issues SET {', '.join(update_fields)} WHERE id = ?{version_condition} RETURNING *", params
+        ).fetchone()
+        if row is None:
+            # The issue exists (checked above), so the If-Match version was stale
+            raise HTTPException(status_code=412, detail="Issue was modified by another request")
+        return issue_response(row, names)
+    
+    updated = await AsyncDatabaseManager.run_in_transaction(update)
+    
+    etag = format_etag(updated['version'])
+    if prefers_minimal(return_, prefer):
+        return minimal_response(str(request.url_for("get_issue", issue_id=updated['id'])), etag)
+    response.headers["ETag"] = etag
+    return updated
 
 @router.delete("/issues/{issue_id}")
-async def delete_issue(issue_id: int):
-    """Delete an issue"""
-    # Check if issue exists
-    existing = DatabaseManager.execute_query("SELECT * FROM issues WHERE id = ?", (issue_id,))
-    if not existing:
-        raise HTTPException(status_code=404, detail="Issue not found")
+async def delete_issue(issue_id: int, if_match: Optional[str] = Header(None)):
+    """Delete an issue
+
+    With ``If-Match: "<version>"`` the issue is only deleted if it is still
+    at that version, otherwise the request fails with 412.
+    """
+    version_condition, version_params = if_match_condition(if_match)
     
-    DatabaseManager.execute_update("DELETE FROM issues WHERE id = ?", (issue_id,))
+    def delete(conn):
+        if conn.execute(f"DELETE FROM issues WHERE id = ?{version_condition}", (issue_id, *version_params)).rowcount:
+            return
+        # Only a failed delete pays for telling "missing" from "stale"
+        if conn.execute("SELECT 1 FROM issues WHERE id = ?", (issue_id,)).fetchone() is None:
+            raise HTTPException(status_code=404, detail="Issue not found")
+        raise HTTPException(status_code=412, detail="Issue was modified by another request")
+    
+    await AsyncDatabaseManager.run_in_transaction(delete)
     
     return {"message": f"Issue {issue_id} deleted successfully"}
 
 # Admin endpoints for bulk operations (AI training tasks)
-@router.get("/admin/stats")
-async def get_system_stats():
-    """Get comprehensive system statistics for AI analysis"""
-    # Basic counts
-    user_count = DatabaseManager.execute_query("SELECT COUNT(*) as count FROM users")[0]['count']
-    project_count = DatabaseManager.execute_query("SELECT COUNT(*) as count FROM projects")[0]['count']
-    total_issues = DatabaseManager.execute_query("SELECT COUNT(*) as count FROM issues")[0]['count']
-    open_issues = DatabaseManager.execute_query("SELECT COUNT(*) as count FROM issues WHERE state = 'opened'")[0]['count']
-    
+# Exact mode recomputes everything from the base tables
+EXACT_STATS_QUERIES = {
+    "counts": """
+        SELECT 'users' as name, COUNT(*) as value FROM users
+        UNION ALL SELECT 'projects', COUNT(*) FROM projects
+        UNION ALL SELECT 'issues', COUNT(*) FROM issues
+        UNION ALL SELECT 'open_issues', COUNT(*) FROM issues WHERE state = 'opened'
+    """,
     # Workload distribution
-    workload_query = """
+    "workload": """
         SELECT u.id, u.username, u.name,
                COUNT(i.id) as assigned_issues,
                COUNT(CASE WHEN i.state = 'opened' THEN 1 END) as open_assigned
         FROM users u
         LEFT JOIN issues i ON u.id = i.assignee_id
         GROUP BY u.id, u.username, u.name
-        ORDER BY assigned_issues DESC
-    """
-    workload = DatabaseManager.execute_query(workload_query)
-    
+        ORDER BY assigned_issues DESC, u.id
+    """,
     # Project health
-    project_health_query = """
+    "project_health": """
         SELECT p.id, p.name,
                COUNT(i.id) as total_issues,
                COUNT(CASE WHEN i.state = 'opened' THEN 1 END) as open_issues
         FROM projects p
         LEFT JOIN issues i ON p.id = i.project_id
         GROUP BY p.id, p.name
+        ORDER BY p.id
+    """,
+    # Label distribution (for AI training insights)
+    "labels": """
+        SELECT l.name, COUNT(*) as count
+        FROM issue_labels il
+        JOIN labels l ON l.id = il.label_id
+        GROUP BY l.id, l.name
+        ORDER BY count DESC, l.name
+    """,
+}
+
+# Default mode reads the trigger-maintained aggregates: O(users + projects + labels)
+AGGREGATE_STATS_QUERIES = {
+    "counts": "SELECT name, value FROM stats_counters",
+    "workload": """
+        SELECT u.id, u.username, u.name,
+               COALESCE(w.assigned_issues, 0) as assigned_issues,
+               COALESCE(w.open_assigned, 0) as open_assigned
+        FROM users u
+        LEFT JOIN user_workload w ON w.user_id = u.id
+        ORDER BY assigned_issues DESC, u.id
+    """,
+    "project_health": """
+        SELECT id, name, issues_count as total_issues, open_issues_count as open_issues
+        FROM projects
+        ORDER BY id
+    """,
+    "labels": """
+        SELECT name, issues_count as count
+        FROM labels
+        WHERE issues_count > 0
+        ORDER BY count DESC, name
+    """,
+}
+
+@router.get("/admin/stats", dependencies=[Depends(conditional_get())])
+async def get_system_stats(exact: bool = False):
+    """Get comprehensive system statistics for AI analysis
+
+    Served from incrementally maintained aggregate tables; pass
+    ``exact=true`` to recompute from the base tables and check for drift.
     """
-    project_health = DatabaseManager.execute_query(project_health_query)
+    queries = EXACT_STATS_QUERIES if exact else AGGREGATE_STATS_QUERIES
+    
+    # Independent reads run concurrently on separate pooled connections
+    counts, workload, project_health, label_counts = await asyncio.gather(
+        AsyncDatabaseManager.execute_query(queries["counts"], cache=True),
+        AsyncDatabaseManager.execute_query(queries["workload"], cache=True),
+        AsyncDatabaseManager.execute_query(queries["project_health"], cache=True),
+        AsyncDatabaseManager.execute_query(queries["labels"], cache=True),
+    )
+    counts = {row['name']: row['value'] for row in counts}
     
-    # Label distribution (for AI training insights)
-    label_stats = {}
-    all_issues = DatabaseManager.execute_query("SELECT labels FROM issues WHERE labels IS NOT NULL")
-    for issue in all_issues:
-        if issue['labels']:
-            labels = json.loads(issue['labels'])
-            for label in labels:
-                label_stats[label] = label_stats.get(label, 0) + 1
+    # Basic counts
+    user_count = counts.get('users', 0)
+    project_count = counts.get('projects', 0)
+    total_issues = counts.get('issues', 0)
+    open_issues = counts.get('open_issues', 0)
+    
+    label_stats = {row['name']: row['count'] for row in label_counts}
     
     return {
         "users": user_count,
@@ -249,36 +526,109 @@ async def get_system_stats():
     }
 
 @router.post("/admin/bulk-reassign")
-async def bulk_reassign_issues(from_user_id: int, to_user_id: int, limit: int = 5):
-    """Bulk reassign issues from one user to another (AI training task)"""
-    # Validate users exist
-    from_user = DatabaseManager.execute_query("SELECT * FROM users WHERE id = ?", (from_user_id,))
-    to_user = DatabaseManager.execute_query("SELECT * FROM users WHERE id = ?", (to_user_id,))
-    
-    if not from_user:
-        raise HTTPException(status_code=404, detail="From user not found")
-    if not to_user:
-        raise HTTPException(status_code=404, detail="To user not found")
-    
-    # Get open issues assigned to from_user
-    issues = DatabaseManager.execute_query(
-        "SELECT id FROM issues WHERE assignee_id = ? AND state = 'opened' LIMIT ?",
-        (from_user_id, limit)
-    )
+async def bulk_reassign_issues(
+    from_user_id: int,
+    to_user_id: int,
+    limit: int = Query(5, ge=1, le=MAX_BULK_REASSIGN_SIZE),
+    project_id: Optional[int] = None,
+    labels: Optional[str] = None,
+    state: Optional[str] = "opened",
+    older_than_days: Optional[int] = Query(None, ge=0),
+    dry_run: bool = False,
+    stream: bool = False
+):
+    """Bulk reassign issues from one user to another (AI training task)
+
+    Issues are selected by assignee plus optional project, labels (all must
+    match), state and age (``older_than_days`` since last update), then
+    reassigned with one set-based UPDATE in a single transaction.
+    ``dry_run=true`` only counts the matching issues, with a single read. ``stream=true``
+    returns newline-delimited JSON: one ``{"id": ...}`` line per issue
+    followed by a summary line.
+    """
+    selector = "SELECT i.id FROM issues i WHERE i.assignee_id = ?"
+    params = [from_user_id]
     
-    if not issues:
-        return {"message": "No open issues found for reassignment", "reassigned_count": 0}
-    
-    # Reassign issues
-    issue_ids = [issue['id'] for issue in issues]
-    for issue_id in issue_ids:
-        DatabaseManager.execute_update(
-            "UPDATE issues SET assignee_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (to_user_id, issue_id)
-        )
+    if project_id:
+        selector += " AND i.project_id = ?"
+        params.append(project_id)
     
-    return {
-        "message": f"Reassigned {len(issue_ids)} issues from {from_user[0]['name']} to {to_user[0]['name']}",
-        "reassigned_count": len(issue_ids),
-        "issue_ids": issue_ids
-    }
\ No newline at end of file
+    if state:
+        selector += " AND i.state = ?"
+        params.append(state)
+    
+    required_labels = parse_label_list(labels)
+    if required_labels:
+        condition, label_params = label_condition(required_labels, True)
+        selector += condition
+        params.extend(label_params)
+    
+    if older_than_days is not None:
+        selector += " AND i.updated_at < datetime('now', ?)"
+        params.append(f"-{older_than_days} days")
+    
+    selector += " ORDER BY i.id LIMIT ?"
+    params.append(limit)
+    
+    # Users and project named by the request, checked the same way for a dry run and a real one
+    refs_query = """
+        SELECT 'user' as kind, id, name FROM users WHERE id IN (?, ?)
+        UNION ALL
+        SELECT 'project' as kind, id, name FROM projects WHERE id = ?
+    """
+    refs_params = [from_user_id, to_user_id, project_id]
+    
+    def check_refs(rows) -> dict:
+        users = {row['id']: row['name'] for row in rows if row['kind'] == 'user'}
+        if from_user_id not in users:
+            raise HTTPException(status_code=404, detail="From user not found")
+        if to_user_id not in users:
+            raise HTTPException(status_code=404, detail="To user not found")
+        if project_id and not any(row['kind'] == 'project' for row in rows):
+            raise HTTPException(status_code=404, detail="Project not found")
+        return users
+    
+    def reassign(conn):
+        users = check_refs(conn.execute(refs_query, refs_params).fetchall())
+        rows = conn.execute(f"""
+            UPDATE issues SET assignee_id = ?, updated_at = CURRENT_TIMESTAMP, version = version + 1
+            WHERE id IN ({selector})
+            RETURNING id
+        """, [to_user_id, *params]).fetchall()
+        issue_ids = sorted(row['id'] for row in rows)
+        return users, len(issue_ids), issue_ids
+    
+    if dry_run:
+        # Only counts: a read on the pool, never a write transaction on the writer
+        rows = await AsyncDatabaseManager.execute_query(f"""
+            {refs_query}
+            UNION ALL
+            SELECT 'matched' as kind, COUNT(*) as id, NULL as name FROM ({selector})
+        """, tuple(refs_params + params))
+        users = check_refs(rows)
+        count = next(row['id'] for row in rows if row['kind'] == 'matched')
+        issue_ids = []
+    else:
+        users, count, issue_ids = await AsyncDatabaseManager.run_in_transaction(reassign)
+    
+    if dry_run:
+        message = f"Would reassign {count} issues from {users[from_user_id]} to {users[to_user_id]}"
+    elif count:
+        message = f"Reassigned {count} issues from {users[from_user_id]} to {users[to_user_id]}"
+    else:
+        message = "No matching issues found for reassignment"
+    summary = {
+        "message": message,
+        "reassigned_count": 0 if dry_run else count,
+        "matched_count": count,
+        "dry_run": dry_run,
+    }
+    
+    if stream:
+        def ndjson():
+            for issue_id in issue_ids:
+                yield json.dumps({"id": issue_id}) + "\n"
+            yield json.dumps(summary) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    return {**summary, "issue_ids": issue_ids}
\ No newline at end of file
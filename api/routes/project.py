@@ -1,91 +1,152 @@
 # === api/routes/project.py ===
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from typing import List, Literal, Optional
 import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from database.connection import DatabaseManager
+from database.async_manager import AsyncDatabaseManager
+from database.contention import DatabaseUnavailable
 from api.schemas.project_schema import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectWithStats
+from api.pagination import keyset_condition, paginate
+from api.etags import conditional_get, format_etag, if_match_condition, matching_etag, not_modified, read_validator
+from api.responses import decode_labels, minimal_response, prefers_minimal, streaming_json_array, trusted_response
+from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
-@router.get("/projects", response_model=List[ProjectWithStats])
-async def get_projects(limit: int = 100, offset: int = 0):
+@router.get("/projects", response_model=List[ProjectWithStats],
+            dependencies=[Depends(conditional_get("projects", "users"))])
+async def get_projects(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    offset: int = Query(0, ge=0, deprecated=True)
+):
     """Get all projects with statistics"""
-    query = """
-        SELECT p.*, u.name as owner_name,
-               COUNT(DISTINCT i.id) as issues_count,
-               COUNT(DISTINCT CASE WHEN i.state = 'opened' THEN i.id END) as open_issues_count
+    params = []
+    keyset = ""
+    if cursor:
+        keyset, cursor_params = keyset_condition(("p.created_at", "p.id"), cursor)
+        params.extend(cursor_params)
+        offset = 0
+    
+    # issues_count / open_issues_count are trigger-maintained columns
+    query = f"""
+        SELECT p.*, u.name as owner_name
         FROM projects p
         LEFT JOIN users u ON p.owner_id = u.id
-        LEFT JOIN issues i ON p.id = i.project_id
-        GROUP BY p.id, p.name, p.description, p.visibility, p.owner_id, p.created_at, p.updated_at, u.name
-        ORDER BY p.created_at DESC
+        WHERE 1=1 {keyset}
+        ORDER BY p.created_at DESC, p.id DESC
         LIMIT ? OFFSET ?
     """
+    params.extend([limit + 1, offset])
     
-    projects = DatabaseManager.execute_query(query, (limit, offset))
+    projects = paginate(
+        await AsyncDatabaseManager.execute_query(query, params, cache=True),
+        limit, ("created_at", "id"), request, response
+    )
     
     # Add members_count (simplified - in real app would be from project_members table)
     for project in projects:
         project['members_count'] = 1  # Owner only for now
     
-    return projects
+    return trusted_response(projects, ProjectWithStats, response)
 
 @router.get("/projects/{project_id}", response_model=ProjectWithStats)
-async def get_project(project_id: int):
-    """Get project by ID with statistics"""
+async def get_project(project_id: int, request: Request, response: Response):
+    """Get project by ID with statistics; the ETag header carries the project's version
+
+    The ETag also carries a validator for the project and user tables;
+    while it matches, ``If-None-Match`` is answered with 304 without a query.
+    ``If-None-Match: *`` is answered with 304 once the project is found.
+    Inside an atomic batch neither is sent nor checked.
+    """
+    validator = read_validator(request, ("projects", "users"))
+    matched = validator and matching_etag(request.headers.get("if-none-match"), validator)
+    if matched:
+        raise not_modified(matched)
+    
     query = """
-        SELECT p.*, u.name as owner_name,
-               COUNT(DISTINCT i.id) as issues_count,
-               COUNT(DISTINCT CASE WHEN i.state = 'opened' THEN i.id END) as open_issues_count
+        SELECT p.*, u.name as owner_name
         FROM projects p
         LEFT JOIN users u ON p.owner_id = u.id
-        LEFT JOIN issues i ON p.id = i.project_id
         WHERE p.id = ?
-        GROUP BY p.id, p.name, p.description, p.visibility, p.owner_id, p.created_at, p.updated_at, u.name
     """
     
-    projects = DatabaseManager.execute_query(query, (project_id,))
+    projects = await AsyncDatabaseManager.execute_query(query, (project_id,), cache=True)
     
     if not projects:
         raise HTTPException(status_code=404, detail="Project not found")
     
     project = projects[0]
     project['members_count'] = 1  # Simplified
+    if validator is not None:
+        etag = format_etag(project['version'], validator)
+        if request.headers.get("if-none-match", "").strip() == "*":
+            raise not_modified(etag)  # * matches any project that exists
+        response.headers["ETag"] = etag
     return project
 
 @router.post("/projects", response_model=ProjectResponse)
-async def create_project(project: ProjectCreate, owner_id: Optional[int] = None):
-    """Create a new project"""
+async def create_project(
+    project: ProjectCreate,
+    request: Request,
+    response: Response,
+    owner_id: Optional[int] = None,
+    return_: Literal["representation", "minimal"] = Query("representation", alias="return"),
+    prefer: Optional[str] = Header(None)
+):
+    """Create a new project
+
+    The response row comes straight from the INSERT via RETURNING.
+    ``return=minimal`` (or ``Prefer: return=minimal``) responds with an
+    empty body and the new project's ``Location``.
+    """
     query = """
         INSERT INTO projects (name, description, visibility, owner_id) 
         VALUES (?, ?, ?, ?)
+        RETURNING *
     """
     
+    def insert(conn):
+        row = conn.execute(query, (project.name, project.description, project.visibility, owner_id)).fetchone()
+        return dict(row)
+    
     try:
-        project_id = DatabaseManager.execute_insert(
-            query, 
-            (project.name, project.description, project.visibility, owner_id)
-        )
-        
-        # Return the created project
-        return await get_project(project_id)
-        
+        created = await AsyncDatabaseManager.run_in_transaction(insert)
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create project: {str(e)}")
+    
+    etag = format_etag(created['version'])
+    if prefers_minimal(return_, prefer):
+        return minimal_response(str(request.url_for("get_project", project_id=created['id'])), etag)
+    response.headers["ETag"] = etag
+    return created
 
 @router.patch("/projects/{project_id}", response_model=ProjectResponse)
-async def update_project(project_id: int, project_update: ProjectUpdate):
-    """Update an existing project"""
-    # Check if project exists
-    existing = DatabaseManager.execute_query("SELECT * FROM projects WHERE id = ?", (project_id,))
-    if not existing:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
+async def update_project(
+    project_id: int,
+    project_update: ProjectUpdate,
+    request: Request,
+    response: Response,
+    return_: Literal["representation", "minimal"] = Query("representation", alias="return"),
+    if_match: Optional[str] = Header(None),
+    prefer: Optional[str] = Header(None)
+):
+    """Update an existing project
+
+    A single UPDATE ... RETURNING both applies the change and produces the
+    response row. ``return=minimal`` (or ``Prefer: return=minimal``) responds
+    with an empty body and the project's ``Location``.
+    With ``If-Match: "<version>"`` the update only applies if the project is
+    still at that version, otherwise it fails with 412.
+    """
     # Build update query dynamically
     update_fields = []
     params = []
@@ -103,22 +164,55 @@ async def update_project(project_id: int, project_update: ProjectUpdate):
         params.append(project_update.visibility)
     
     if not update_fields:
+        # Still report a missing project before complaining about the body
+        existing = await AsyncDatabaseManager.execute_query("SELECT id FROM projects WHERE id = ?", (project_id,), cache=True)
+        if not existing:
+            raise HTTPException(status_code=404, detail="Project not found")
         raise HTTPException(status_code=400, detail="No fields to update")
     
     update_fields.append("updated_at = CURRENT_TIMESTAMP")
+    update_fields.append("version = version + 1")
     params.append(project_id)
+    version_condition, version_params = if_match_condition(if_match)
+    params.extend(version_params)
+    
+    query = f"UPDATE projects SET {', '.join(update_fields)} WHERE id = ?{version_condition} RETURNING *"
     
-    query = f"UPDATE projects SET {', '.join(update_fields)} WHERE id = ?"
+    def update(conn):
+        row = conn.execute(query, params).fetchone()
+        if row is None:
+            # Only a failed update pays for telling "missing" from "stale"
+            if conn.execute("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone() is None:
+                raise HTTPException(status_code=404, detail="Project not found")
+            raise HTTPException(status_code=412, detail="Project was modified by another request")
+        return dict(row)
     
-    DatabaseManager.execute_update(query, params)
+    updated = await AsyncDatabaseManager.run_in_transaction(update)
     
-    return await get_project(project_id)
+    etag = format_etag(updated['version'])
+    if prefers_minimal(return_, prefer):
+        return minimal_response(str(request.url_for("get_project", project_id=updated['id'])), etag)
+    response.headers["ETag"] = etag
+    return updated
 
-@router.get("/projects/{project_id}/issues")
-async def get_project_issues(project_id: int, state: Optional[str] = None):
-    """Get all issues for a project"""
+@router.get("/projects/{project_id}/issues",
+            dependencies=[Depends(conditional_get("issues", "projects", "users", resource=("projects", "project_id")))])
+async def get_project_issues(
+    project_id: int,
+    request: Request,
+    response: Response,
+    state: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False
+):
+    """Get issues for a project, one page at a time
+
+    ``stream=true`` sends every matching issue (after ``cursor``, if given)
+    as one array, streamed as it is read instead of paged.
+    """
     # Check if project exists
-    existing = DatabaseManager.execute_query("SELECT * FROM projects WHERE id = ?", (project_id,))
+    existing = await AsyncDatabaseManager.execute_query("SELECT * FROM projects WHERE id = ?", (project_id,), cache=True)
     if not existing:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -136,9 +230,24 @@ async def get_project_issues(project_id: int, state: Optional[str] = None):
         base_query += " AND i.state = ?"
         params.append(state)
     
-    base_query += " ORDER BY i.created_at DESC"
+    if cursor:
+        condition, cursor_params = keyset_condition(("i.created_at", "i.id"), cursor)
+        base_query += condition
+        params.extend(cursor_params)
+    
+    base_query += " ORDER BY i.created_at DESC, i.id DESC"
+    if stream:
+        return await streaming_json_array(
+            AsyncDatabaseManager.stream_query(base_query, params), prepare=decode_labels, response=response
+        )
+    
+    base_query += " LIMIT ?"
+    params.append(limit + 1)
     
-    issues = DatabaseManager.execute_query(base_query, params)
+    issues = paginate(
+        await AsyncDatabaseManager.execute_query(base_query, params),
+        limit, ("created_at", "id"), request, response
+    )
     
     # Parse labels JSON
     for issue in issues:
@@ -1,29 +1,53 @@
 # === api/routes/user.py ===
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from typing import List, Literal, Optional
 import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from database.connection import DatabaseManager
+from database.async_manager import AsyncDatabaseManager
+from database.contention import DatabaseUnavailable
 from api.schemas.user_schema import UserCreate, UserResponse
+from api.pagination import keyset_condition, paginate
+from api.etags import conditional_get
+from api.responses import decode_labels, minimal_response, prefers_minimal, streaming_json_array, trusted_response
+from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserResponse])
-async def get_users(limit: int = 100, offset: int = 0):
+@router.get("/users", response_model=List[UserResponse], dependencies=[Depends(conditional_get("users"))])
+async def get_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    offset: int = Query(0, ge=0, deprecated=True)
+):
     """Get all users with pagination"""
-    query = "SELECT * FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?"
-    users = DatabaseManager.execute_query(query, (limit, offset))
-    return users
+    query = "SELECT * FROM users WHERE 1=1"
+    params = []
+    
+    if cursor:
+        condition, cursor_params = keyset_condition(("created_at", "id"), cursor)
+        query += condition
+        params.extend(cursor_params)
+        offset = 0
+    
+    query += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    params.extend([limit + 1, offset])
+    
+    users = await AsyncDatabaseManager.execute_query(query, params, cache=True)
+    users = paginate(users, limit, ("created_at", "id"), request, response)
+    return trusted_response(users, UserResponse, response)
 
-@router.get("/users/{user_id}", response_model=UserResponse)
+@router.get("/users/{user_id}", response_model=UserResponse,
+            dependencies=[Depends(conditional_get("users", resource=("users", "user_id")))])
 async def get_user(user_id: int):
     """Get user by ID"""
     query = "SELECT * FROM users WHERE id = ?"
-    users = DatabaseManager.execute_query(query, (user_id,))
+    users = await AsyncDatabaseManager.execute_query(query, (user_id,), cache=True)
     
     if not users:
         raise HTTPException(status_code=404, detail="User not found")
@@ -31,32 +55,58 @@ async def get_user(user_id: int):
     return users[0]
 
 @router.post("/users", response_model=UserResponse)
-async def create_user(user: UserCreate):
-    """Create a new user"""
+async def create_user(
+    user: UserCreate,
+    request: Request,
+    return_: Literal["representation", "minimal"] = Query("representation", alias="return"),
+    prefer: Optional[str] = Header(None)
+):
+    """Create a new user
+
+    The response row comes straight from the INSERT via RETURNING.
+    ``return=minimal`` (or ``Prefer: return=minimal``) responds with an
+    empty body and the new user's ``Location``.
+    """
     query = """
         INSERT INTO users (username, name, email, avatar_url) 
         VALUES (?, ?, ?, ?)
+        RETURNING *
     """
     
     avatar_url = f"https://avatar.example.com/{user.username}.png"
     
+    def insert(conn):
+        row = conn.execute(query, (user.username, user.name, user.email, avatar_url)).fetchone()
+        return dict(row)
+    
     try:
-        user_id = DatabaseManager.execute_insert(
-            query, 
-            (user.username, user.name, user.email, avatar_url)
-        )
-        
-        # Return the created user
-        return await get_user(user_id)
-        
+        created = await AsyncDatabaseManager.run_in_transaction(insert)
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         if "UNIQUE constraint failed" in str(e):
             raise HTTPException(status_code=400, detail="Username or email already exists")
         raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
+    
+    if prefers_minimal(return_, prefer):
+        return minimal_response(str(request.url_for("get_user", user_id=created['id'])))
+    return created
+
+@router.get("/users/{user_id}/issues", dependencies=[Depends(conditional_get("issues", "projects", "users"))])
+async def get_user_issues(
+    user_id: int,
+    request: Request,
+    response: Response,
+    state: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False
+):
+    """Get issues assigned to or created by a user, one page at a time
 
-@router.get("/users/{user_id}/issues")
-async def get_user_issues(user_id: int, state: Optional[str] = None):
-    """Get all issues assigned to or created by a user"""
+    ``stream=true`` sends every matching issue (after ``cursor``, if given)
+    as one array, streamed as it is read instead of paged.
+    """
     base_query = """
         SELECT i.*, p.name as project_name, 
                a.name as author_name, as_u.name as assignee_name
@@ -73,9 +123,24 @@ async def get_user_issues(user_id: int, state: Optional[str] = None):
         base_query += " AND i.state = ?"
         params.append(state)
     
-    base_query += " ORDER BY i.updated_at DESC"
+    if cursor:
+        condition, cursor_params = keyset_condition(("i.updated_at", "i.id"), cursor)
+        base_query += condition
+        params.extend(cursor_params)
+    
+    base_query += " ORDER BY i.updated_at DESC, i.id DESC"
+    if stream:
+        return await streaming_json_array(
+            AsyncDatabaseManager.stream_query(base_query, params), prepare=decode_labels, response=response
+        )
+    
+    base_query += " LIMIT ?"
+    params.append(limit + 1)
     
-    issues = DatabaseManager.execute_query(base_query, params)
+    issues = paginate(
+        await AsyncDatabaseManager.execute_query(base_query, params),
+        limit, ("updated_at", "id"), request, response
+    )
     
     # Parse labels JSON
     for issue in issues:
@@ -1,10 +1,14 @@
 # === api/schemas/__init__.py ===
 from .user_schema import UserCreate, UserResponse
 from .project_schema import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectWithStats
-from .issue_schema import IssueCreate, IssueUpdate, IssueResponse
+from .issue_schema import IssueCreate, IssueUpdate, IssueResponse, IssueBatchError, IssueBatchResult
+from .change_schema import ChangeEntry, ChangeFeed
+from .batch_schema import BatchSubRequest, BatchRequest, BatchSubResponse
 
 __all__ = [
     "UserCreate", "UserResponse",
     "ProjectCreate", "ProjectUpdate", "ProjectResponse", "ProjectWithStats", 
-    "IssueCreate", "IssueUpdate", "IssueResponse"
+    "IssueCreate", "IssueUpdate", "IssueResponse", "IssueBatchError", "IssueBatchResult",
+    "ChangeEntry", "ChangeFeed",
+    "BatchSubRequest", "BatchRequest", "BatchSubResponse"
 ]
\ No newline at end of file
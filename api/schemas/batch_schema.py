@@ -0,0 +1,20 @@
+# === api/schemas/batch_schema.py ===
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+from config import MAX_BATCH_REQUESTS
+
+class BatchSubRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str  # e.g. /api/v1/issues?state=opened
+    body: Optional[Any] = None  # sent as JSON
+    headers: Dict[str, str] = {}
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+    atomic: bool = False  # run every sub-request in one transaction, all or nothing
+
+class BatchSubResponse(BaseModel):
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
\ No newline at end of file
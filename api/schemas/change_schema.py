@@ -0,0 +1,17 @@
+# === api/schemas/change_schema.py ===
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+class ChangeEntry(BaseModel):
+    seq: int
+    entity: str  # issue, project, user
+    entity_id: int
+    op: str  # create, update, delete
+    data: Optional[Dict[str, Any]] = None  # the row after the change (before it, for deletes)
+    changed_at: datetime
+
+class ChangeFeed(BaseModel):
+    changes: List[ChangeEntry]
+    next_since: int  # pass as ?since= to continue
+    latest_seq: int
\ No newline at end of file
@@ -29,6 +29,7 @@ class IssueResponse(BaseModel):
     labels: List[str] = []
     created_at: datetime
     updated_at: datetime
+    version: int = 1  # incremented by every update; sent as the ETag
     
     # Related data
     project_name: Optional[str] = None
@@ -36,4 +37,13 @@ class IssueResponse(BaseModel):
     assignee_name: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class IssueBatchError(BaseModel):
+    index: int  # position of the item in the submitted batch
+    detail: str
+
+class IssueBatchResult(BaseModel):
+    created_count: int
+    created_ids: List[int]
+    failed: List[IssueBatchError] = []
\ No newline at end of file
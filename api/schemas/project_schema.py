@@ -21,6 +21,7 @@ class ProjectResponse(BaseModel):
     owner_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
+    version: int = 1  # incremented by every update; sent as the ETag
 
     class Config:
         from_attributes = True
@@ -0,0 +1,120 @@
+# === api/singleflight.py ===
+"""
+Coalescing of identical concurrent GET requests.
+
+When many agents start a scenario at once they ask for the same
+``/admin/stats`` or ``/projects`` page at the same moment. The first such
+request (the leader) runs normally; identical requests that arrive while it
+is still running wait for it and get a copy of its response, marked with
+``Coalesced-Request: true``, instead of running the same queries again.
+
+Requests are identical when they have the same path, query string,
+``Authorization`` and ``If-None-Match`` headers, and when no write has been
+committed since the leader started (the overall write counter from
+database/versions.py is part of the key). So a client never gets a response
+that was read before its own write returned. Streaming responses
+(``/api/v1/events`` and anything with a ``stream`` parameter) and the
+sub-requests of an atomic batch, which read uncommitted data, are never
+coalesced. If the leader fails without a response, every waiting request
+runs on its own.
+"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from database.async_manager import AsyncDatabaseManager
+
+STREAMING_PATHS = {"/api/v1/events"}
+
+class _Flight:
+    def __init__(self):
+        self.done = asyncio.Event()
+        self.response: Optional[Tuple[int, List[Tuple[bytes, bytes]], bytes]] = None
+        self.waiters = 0
+
+class SingleFlight:
+    """In-flight GET requests by key, with the responses their followers share"""
+
+    def __init__(self):
+        self._flights: Dict[tuple, _Flight] = {}
+        self._leaders = 0
+        self._collapsed = 0
+        self._failed = 0
+
+    def begin(self, key: tuple) -> Tuple[_Flight, bool]:
+        """Join the flight for key, or start one; returns (flight, leader)"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            return flight, False
+        flight = _Flight()
+        self._flights[key] = flight
+        self._leaders += 1
+        return flight, True
+
+    def finish(self, key: tuple, flight: _Flight, response: Optional[Tuple[int, List[Tuple[bytes, bytes]], bytes]]):
+        """End the leader's flight; followers get response, or run themselves when None"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        flight.response = response
+        if response is None:
+            self._failed += flight.waiters
+        else:
+            self._collapsed += flight.waiters
+        flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self._leaders,
+            "collapsed": self._collapsed,
+            "leader_failures": self._failed,
+        }
+
+class SingleflightMiddleware:
+    """ASGI middleware sharing one execution among identical concurrent GETs"""
+
+    def __init__(self, app, flights: SingleFlight, write_version: Callable[[], Any]):
+        self.app = app
+        self.flights = flights
+        self.write_version = write_version
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "GET" or scope["path"] in STREAMING_PATHS
+                or AsyncDatabaseManager.in_write_session()):
+            return await self.app(scope, receive, send)
+        query = scope["query_string"]
+        if b"stream" in query and any(name == "stream" for name, _ in parse_qsl(query.decode("latin-1"))):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        key = (
+            scope["path"], query, headers.get(b"authorization"), headers.get(b"if-none-match"),
+            self.write_version(),
+        )
+        flight, leader = self.flights.begin(key)
+        if not leader:
+            await flight.done.wait()
+            if flight.response is None:
+                return await self.app(scope, receive, send)
+            status, response_headers, body = flight.response
+            await send({"type": "http.response.start", "status": status,
+                        "headers": response_headers + [(b"coalesced-request", b"true")]})
+            return await send({"type": "http.response.body", "body": body})
+
+        captured = {"status": 500, "headers": [], "body": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, receive, capture_send)
+            response = (captured["status"], captured["headers"], b"".join(captured["body"]))
+        finally:
+            self.flights.finish(key, flight, response)
\ No newline at end of file
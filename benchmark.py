@@ -0,0 +1,322 @@
+# === benchmark.py ===
+"""
+Micro-benchmarks for the GitLab MCP Simulator storage layer.
+
+    python benchmark.py profiles      Compare SQLite storage profiles
+    python benchmark.py contention    HTTP write load against several server processes
+    python benchmark.py encoding      List endpoint throughput with and without the fast JSON path
+    python benchmark.py writes        Sequential create/update latency, and the writer's share of it
+
+Each benchmark runs against a throwaway database in a temporary directory.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from database import connection
+from database.migrations import run_migrations
+from database.profiles import STORAGE_PROFILES
+
+ISSUE_LIST_QUERY = """
+    SELECT i.*, p.name as project_name,
+           a.name as author_name, as_u.name as assignee_name
+    FROM issues i
+    LEFT JOIN projects p ON i.project_id = p.id
+    LEFT JOIN users a ON i.author_id = a.id
+    LEFT JOIN users as_u ON i.assignee_id = as_u.id
+    WHERE i.state = ?
+    ORDER BY i.updated_at DESC LIMIT 100
+"""
+
+def _prepare_database(path: str, profile: str, issues: int = 5000):
+    connection.DATABASE_PATH = path
+    connection.STORAGE_PROFILE = profile
+    conn = connection.get_db_connection()
+    run_migrations(conn)
+    conn.executemany(
+        "INSERT INTO users (username, name, email) VALUES (?, ?, ?)",
+        [(f"user{i}", f"User {i}", f"user{i}@example.com") for i in range(20)],
+    )
+    conn.executemany(
+        "INSERT INTO projects (name, description, owner_id) VALUES (?, ?, ?)",
+        [(f"Project {i}", "Benchmark project", i % 20 + 1) for i in range(10)],
+    )
+    conn.executemany(
+        "INSERT INTO issues (title, description, project_id, author_id, assignee_id, state, labels) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(f"Issue {i}", "Benchmark issue", i % 10 + 1, i % 20 + 1, (i + 7) % 20 + 1,
+          "opened" if i % 3 else "closed", '["bug"]') for i in range(issues)],
+    )
+    conn.commit()
+    conn.close()
+
+def _single_row_writes(count: int) -> float:
+    conn = connection.get_db_connection()
+    started = time.perf_counter()
+    for i in range(count):
+        conn.execute(
+            "INSERT INTO issues (title, description, project_id, author_id, state, labels) VALUES (?, ?, ?, ?, 'opened', '[]')",
+            (f"Write {i}", "Benchmark write", i % 10 + 1, i % 20 + 1),
+        )
+        conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return count / elapsed
+
+def _mixed_workload(seconds: float, readers: int):
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0}
+    lock = threading.Lock()
+
+    def reader():
+        conn = connection.get_db_connection()
+        done = 0
+        while not stop.is_set():
+            conn.execute(ISSUE_LIST_QUERY, ("opened",)).fetchall()
+            done += 1
+        conn.close()
+        with lock:
+            counts["reads"] += done
+
+    def writer():
+        conn = connection.get_db_connection()
+        done = 0
+        while not stop.is_set():
+            conn.execute(
+                "UPDATE issues SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (done % 1000 + 1,),
+            )
+            conn.commit()
+            done += 1
+        conn.close()
+        with lock:
+            counts["writes"] += done
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return counts["reads"] / seconds, counts["writes"] / seconds
+
+def bench_profiles(args):
+    print(f"{'profile':<20} {'commits/s':>10} {'mixed reads/s':>14} {'mixed writes/s':>15}")
+    for profile in STORAGE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            _prepare_database(str(Path(tmp) / "bench.db"), profile)
+            writes = _single_row_writes(args.writes)
+            reads_per_sec, writes_per_sec = _mixed_workload(args.seconds, args.readers)
+        print(f"{profile:<20} {writes:>10.0f} {reads_per_sec:>14.0f} {writes_per_sec:>15.0f}")
+
+def _request(method: str, url: str, body: dict = None) -> int:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def _start_server(path: str, workers: int, busy_timeout_ms: int = None, settings: dict = None) -> (subprocess.Popen, str):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", DATABASE_PROFILE=connection.STORAGE_PROFILE)
+    if busy_timeout_ms is not None:
+        env["DB_BUSY_TIMEOUT_MS"] = str(busy_timeout_ms)
+    env.update(settings or {})
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.app:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=project_root, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while True:
+        try:
+            if _request("GET", f"{base_url}/health") == 200:
+                return server, base_url
+        except OSError:
+            pass
+        if time.time() > deadline:
+            server.terminate()
+            raise RuntimeError("Server did not start")
+        time.sleep(0.2)
+
+def bench_contention(args):
+    """Concurrent POST/PATCH load against several server processes plus a
+    maintenance job holding the write lock, counting responses by status"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        _prepare_database(path, args.profile)
+        server, base_url = _start_server(path, args.workers, args.busy_timeout)
+        stop = threading.Event()
+        statuses = Counter()
+        lock = threading.Lock()
+
+        def client(n):
+            done = Counter()
+            i = 0
+            while not stop.is_set():
+                if i % 2:
+                    status = _request("PATCH", f"{base_url}/api/v1/issues/{(n * 7919 + i) % 5000 + 1}?return=minimal",
+                                      {"state": "closed" if i % 4 == 1 else "opened"})
+                else:
+                    status = _request("POST", f"{base_url}/api/v1/issues?author_id=1&return=minimal",
+                                      {"title": f"Load {n}-{i}", "description": "Load test", "project_id": n % 10 + 1})
+                done[status] += 1
+                i += 1
+            with lock:
+                statuses.update(done)
+
+        def maintenance():
+            # Another process holding the write lock, like `python -m database recompute-counters`
+            conn = connection.get_db_connection()
+            while not stop.is_set():
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("UPDATE projects SET issues_count = issues_count")
+                time.sleep(args.hold_ms / 1000)
+                conn.commit()
+                time.sleep(0.2)
+            conn.close()
+
+        try:
+            threads = [threading.Thread(target=client, args=(n,)) for n in range(args.concurrency)]
+            threads.append(threading.Thread(target=maintenance))
+            for thread in threads:
+                thread.start()
+            time.sleep(args.seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            server.terminate()
+            server.wait()
+
+    total = sum(statuses.values())
+    print(f"{args.workers} server processes, {args.concurrency} clients, {args.seconds:.0f}s, "
+          f"profile {args.profile}, lock held {args.hold_ms:.0f} ms every 200 ms")
+    print(f"{total} requests, {total / args.seconds:.0f} req/s")
+    for status, count in sorted(statuses.items()):
+        print(f"  {status}: {count}")
+    if statuses[500]:
+        sys.exit(1)
+
+def _read_throughput(base_url: str, path: str, seconds: float, concurrency: int) -> (float, Counter):
+    stop = threading.Event()
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def client():
+        done = Counter()
+        while not stop.is_set():
+            done[_request("GET", base_url + path)] += 1
+        with lock:
+            statuses.update(done)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(statuses.values()) / seconds, statuses
+
+def bench_encoding(args):
+    """GET /issues?limit=100 throughput with rows re-validated by pydantic vs. the
+    trusted-row path (see api/responses.py), one server process each"""
+    path = "/api/v1/issues?limit=100"
+    print(f"GET {path}, {args.concurrency} clients, {args.seconds:.0f}s each")
+    print(f"{'response path':<28} {'req/s':>8}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        _prepare_database(db_path, args.profile)
+        for label, fast in (("validated (response_model)", "false"), ("trusted rows", "true")):
+            server, base_url = _start_server(db_path, 1, settings={"FAST_JSON_RESPONSES": fast})
+            try:
+                _read_throughput(base_url, path, 1.0, args.concurrency)  # warm up
+                rate, statuses = _read_throughput(base_url, path, args.seconds, args.concurrency)
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{label:<28} {rate:>8.0f}")
+            failed = failed or set(statuses) != {200}
+    if failed:
+        sys.exit(1)
+
+def _get_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.loads(response.read())
+
+def bench_writes(args):
+    """Latency of one client creating and then updating issues back to back, one
+    server process, with and without the writer's coalescing window"""
+    print(f"{args.writes} sequential requests each, profile {args.profile}")
+    print(f"{'WRITE_COALESCE_WINDOW_MS':<26} {'create ms':>10} {'update ms':>10} {'writer ms':>10}")
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        _prepare_database(db_path, args.profile)
+        for window in ("2", "0"):
+            server, base_url = _start_server(db_path, 1, settings={"WRITE_COALESCE_WINDOW_MS": window})
+            timings = {}
+            try:
+                for name, method, url, body in (
+                    ("create", "POST", "/api/v1/issues?author_id=1", {"title": "Latency", "description": "d", "project_id": 1, "assignee_id": 2}),
+                    ("update", "PATCH", "/api/v1/issues/1", {"title": "Latency", "assignee_id": 3}),
+                ):
+                    _request(method, base_url + url, body)  # warm up
+                    started = time.perf_counter()
+                    statuses = Counter(_request(method, base_url + url, body) for _ in range(args.writes))
+                    timings[name] = (time.perf_counter() - started) / args.writes * 1000
+                    failed = failed or set(statuses) != {200}
+                # Queued to committed, i.e. the part of a write spent on the writer thread
+                writer_ms = _get_json(f"{base_url}/health")["database"]["writer"]["latency_ms"]["avg"]
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{window:<26} {timings['create']:>10.2f} {timings['update']:>10.2f} {writer_ms:>10.2f}")
+    if failed:
+        sys.exit(1)
+
+BENCHMARKS = {
+    "profiles": bench_profiles,
+    "contention": bench_contention,
+    "encoding": bench_encoding,
+    "writes": bench_writes,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="GitLab MCP Simulator benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--writes", type=int, default=2000, help="single-row commits (profiles) or requests per endpoint (writes) to time")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of the mixed workload")
+    parser.add_argument("--readers", type=int, default=4, help="reader threads in the mixed workload")
+    parser.add_argument("--workers", type=int, default=4, help="server processes in the contention test")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent clients in the contention and encoding tests")
+    parser.add_argument("--profile", default="durable", choices=sorted(STORAGE_PROFILES), help="storage profile for the contention, encoding and writes tests")
+    parser.add_argument("--busy-timeout", type=int, help="DB_BUSY_TIMEOUT_MS for the servers in the contention test")
+    parser.add_argument("--hold-ms", type=float, default=50, help="how long the competing job holds the write lock")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
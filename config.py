@@ -2,5 +2,63 @@
 import os
 from pathlib import Path
 
-DATABASE_URL = "sqlite:///gitlab_simulator.db"
-PROJECT_ROOT = Path(__file__).parent
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///gitlab_simulator.db")
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "durable")  # see database/profiles.py
+PROJECT_ROOT = Path(__file__).parent
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5.0"))  # seconds to wait for a free connection
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30.0"))  # idle seconds before re-checking
+
+# Pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))  # rows fetched and sent at a time by ?stream=true
+MAX_CONCURRENT_STREAMS = int(os.getenv("MAX_CONCURRENT_STREAMS", "4"))  # ?stream=true responses at once; more get 503
+
+# Bulk operations
+MAX_ISSUE_BATCH_SIZE = int(os.getenv("MAX_ISSUE_BATCH_SIZE", "5000"))
+MAX_BULK_REASSIGN_SIZE = int(os.getenv("MAX_BULK_REASSIGN_SIZE", "10000"))
+
+# Single writer (group commit)
+WRITE_COALESCE_WINDOW_MS = float(os.getenv("WRITE_COALESCE_WINDOW_MS", "2"))  # how long a batch waits for more writes
+WRITE_COALESCE_MAX_BATCH = int(os.getenv("WRITE_COALESCE_MAX_BATCH", "256"))  # writes per commit, at most
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "1024"))  # pending writes before requests are rejected with 503
+WRITE_POLL_INTERVAL = float(os.getenv("WRITE_POLL_INTERVAL", "0.5"))  # seconds; how soon writes by other processes invalidate ETags
+WRITE_SESSION_IDLE_TIMEOUT = float(os.getenv("WRITE_SESSION_IDLE_TIMEOUT", "5"))  # seconds an open write session may wait for its next statement
+
+# Lock contention
+DB_BUSY_TIMEOUT_MS = os.getenv("DB_BUSY_TIMEOUT_MS")  # overrides the storage profile's busy_timeout when set
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "5"))  # retries after a busy/locked error
+DB_RETRY_BASE_DELAY_MS = float(os.getenv("DB_RETRY_BASE_DELAY_MS", "10"))
+DB_RETRY_MAX_DELAY_MS = float(os.getenv("DB_RETRY_MAX_DELAY_MS", "500"))
+
+# Idempotency keys
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+
+# Change log
+CHANGE_LOG_RETENTION_DAYS = float(os.getenv("CHANGE_LOG_RETENTION_DAYS", "7"))  # older entries are dropped; resuming before them returns 410
+CHANGE_LOG_COMPACT_AFTER_HOURS = float(os.getenv("CHANGE_LOG_COMPACT_AFTER_HOURS", "1"))  # superseded entries older than this are dropped
+CHANGE_LOG_PRUNE_INTERVAL = float(os.getenv("CHANGE_LOG_PRUNE_INTERVAL", "600"))  # seconds between background prunes, 0 disables
+
+# Change events (SSE)
+EVENTS_SUBSCRIBER_BUFFER = int(os.getenv("EVENTS_SUBSCRIBER_BUFFER", "1000"))  # pending events before a slow subscriber is dropped
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "1000"))
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "1.0"))  # seconds; catches writes from other processes
+EVENTS_HEARTBEAT_INTERVAL = float(os.getenv("EVENTS_HEARTBEAT_INTERVAL", "15.0"))
+
+# Query-result cache (opt-in per query, see database/query_cache.py)
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1000"))  # 0 disables the cache
+QUERY_CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Request coalescing (see api/singleflight.py)
+COALESCE_GET_REQUESTS = os.getenv("COALESCE_GET_REQUESTS", "true").lower() in ("1", "true", "yes")  # identical concurrent GETs share one execution
+
+# Batch requests (POST /api/v1/batch)
+MAX_BATCH_REQUESTS = int(os.getenv("MAX_BATCH_REQUESTS", "50"))  # sub-requests per batch
+
+# Response encoding
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "true").lower() in ("1", "true", "yes")  # see api/responses.py
+ISSUE_FRAGMENT_CACHE_SIZE = int(os.getenv("ISSUE_FRAGMENT_CACHE_SIZE", "10000"))  # rendered issue rows kept for list pages, 0 disables
\ No newline at end of file
@@ -0,0 +1,29 @@
+# === conftest.py ===
+"""
+Shared fixtures for the API tests.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from database import connection
+from database.query_cache import QueryCache
+from database.versions import TableVersions
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient for the app, running against a freshly seeded database in tmp_path"""
+    monkeypatch.setattr(connection, "DATABASE_PATH", str(tmp_path / "test.db"))
+    # Per-process caches keyed by table versions must not carry over between databases
+    versions = TableVersions()
+    monkeypatch.setattr(connection, "_table_versions", versions)
+    monkeypatch.setattr(connection, "_query_cache", QueryCache(versions))
+
+    from api.app import app, idempotency_store
+    from api.routes.issues import issue_fragments
+    from database.seed_data import seed_sample_data
+    monkeypatch.setattr(idempotency_store, "_entries", type(idempotency_store._entries)())
+    monkeypatch.setattr(issue_fragments, "_fragments", type(issue_fragments._fragments)())
+
+    with TestClient(app) as client:
+        seed_sample_data()
+        yield client
\ No newline at end of file
@@ -1,5 +1,5 @@
 # === Complete database/__init__.py ===
-from .connection import get_db_connection, init_database
+from .connection import get_db_connection, get_pool, close_pool, init_database
 from .seed_data import seed_sample_data
 
-__all__ = ["get_db_connection", "init_database", "seed_sample_data"]
+__all__ = ["get_db_connection", "get_pool", "close_pool", "init_database", "seed_sample_data"]
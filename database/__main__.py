@@ -0,0 +1,74 @@
+# === database/__main__.py ===
+"""
+Database maintenance commands.
+
+    python -m database migrate [DATABASE]   Upgrade a database file in place
+    python -m database status [DATABASE]    Report the schema version
+    python -m database recompute-counters [DATABASE]
+                                            Repair trigger-maintained counters
+                                            and /admin/stats aggregates
+    python -m database prune-changes [DATABASE]
+                                            Apply change log retention and
+                                            compaction
+"""
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database import connection
+from database.migrations import LATEST_VERSION, get_schema_version, run_migrations
+from database.maintenance import recompute_project_counters, recompute_stats_aggregates, prune_change_log
+from config import CHANGE_LOG_RETENTION_DAYS, CHANGE_LOG_COMPACT_AFTER_HOURS
+
+def migrate(conn: sqlite3.Connection, path: str):
+    current = get_schema_version(conn)
+    applied = run_migrations(conn)
+    if applied:
+        print(f"✅ Upgraded {path} from version {current} to {applied[-1]}")
+    else:
+        print(f"✅ {path} is already at version {current}")
+
+def status(conn: sqlite3.Connection, path: str):
+    print(f"📁 {path}: schema version {get_schema_version(conn)} (latest {LATEST_VERSION})")
+
+def recompute_counters(conn: sqlite3.Connection, path: str):
+    fixed = recompute_project_counters(conn)
+    print(f"✅ Recomputed project counters in {path} ({fixed} projects corrected)")
+    fixed = recompute_stats_aggregates(conn)
+    print(f"✅ Recomputed stats aggregates in {path} ({fixed} rows corrected)")
+
+def prune_changes(conn: sqlite3.Connection, path: str):
+    pruned, compacted = prune_change_log(conn, CHANGE_LOG_RETENTION_DAYS, CHANGE_LOG_COMPACT_AFTER_HOURS)
+    conn.commit()
+    print(f"✅ Pruned change log in {path} ({pruned} expired, {compacted} superseded entries removed)")
+
+COMMANDS = {
+    "migrate": migrate,
+    "status": status,
+    "recompute-counters": recompute_counters,
+    "prune-changes": prune_changes,
+}
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m database", description="GitLab MCP Simulator database maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("database", nargs="?", default=connection.DATABASE_PATH,
+                        help="Path to the SQLite database file")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    conn.row_factory = sqlite3.Row
+    try:
+        if args.command not in ("migrate", "status") and get_schema_version(conn) < LATEST_VERSION:
+            print(f"❌ {args.database} is not at the latest schema version, run 'python -m database migrate' first")
+            sys.exit(1)
+        COMMANDS[args.command](conn, args.database)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# === database/async_manager.py ===
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, List, AsyncIterator, Optional, Callable
+
+from config import DB_POOL_SIZE, STREAM_CHUNK_SIZE, WRITE_SESSION_IDLE_TIMEOUT
+from database.connection import DatabaseManager, get_writer
+from database.contention import statement_type
+from database.writer import SessionRolledBack, WriteSession
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# The write session the current task's queries are pinned to, if any
+_write_session: ContextVar[Optional[WriteSession]] = ContextVar("write_session", default=None)
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the dedicated database executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        # One worker per pooled connection, so workers never queue on the pool
+        _executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db-worker")
+    return _executor
+
+def shutdown_executor():
+    """Stop the database executor, waiting for queued statements to finish"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """Run a blocking database callable on the database executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+class AsyncDatabaseManager:
+    """Non-blocking database operations for async route handlers"""
+    
+    @staticmethod
+    async def execute_query(query: str, params: tuple = (), cache: bool = False) -> List[Dict]:
+        """Execute SELECT query and return results; see DatabaseManager.execute_query for cache"""
+        session = _write_session.get()
+        if session is not None:
+            # Read through the session, so its uncommitted writes are visible (and never cached)
+            return await asyncio.wrap_future(
+                session.submit(lambda conn: [dict(row) for row in conn.execute(query, params).fetchall()])
+            )
+        if cache:
+            # Cache hits are served right here, without a trip to the executor
+            rows = DatabaseManager.cached_query(query, params)
+            if rows is not None:
+                return rows
+        return await run_in_db_thread(DatabaseManager.fetch_query, query, params, cache)
+    
+    @staticmethod
+    async def stream_query(query: str, params: tuple = (), chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[List[Dict]]:
+        """Execute SELECT query and yield its results in chunks, fetching each on the database executor"""
+        if _write_session.get() is not None:
+            yield await AsyncDatabaseManager.execute_query(query, params)
+            return
+        chunks = DatabaseManager.stream_query(query, params, chunk_size)
+        fetch = None
+        try:
+            while True:
+                fetch = get_executor().submit(next, chunks, None)
+                chunk = await asyncio.wrap_future(fetch)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            # If the consumer went away mid-fetch, close only once that fetch is done
+            if fetch is None:
+                chunks.close()
+            else:
+                fetch.add_done_callback(lambda _: chunks.close())
+    
+    @staticmethod
+    async def execute_insert(query: str, params: tuple = ()) -> int:
+        """Execute INSERT query and return last row id"""
+        return await AsyncDatabaseManager.run_in_transaction(
+            lambda conn: conn.execute(query, params).lastrowid, kind=statement_type(query)
+        )
+    
+    @staticmethod
+    async def execute_update(query: str, params: tuple = ()) -> int:
+        """Execute UPDATE query and return affected rows"""
+        return await AsyncDatabaseManager.run_in_transaction(
+            lambda conn: conn.execute(query, params).rowcount, kind=statement_type(query)
+        )
+
+    
+    @staticmethod
+    async def run_in_transaction(func: Callable, kind: Optional[str] = None):
+        """Run func(conn) in one write transaction on the database writer
+
+        Inside write_session() it runs in the session's transaction instead.
+        """
+        session = _write_session.get()
+        if session is not None:
+            return await asyncio.wrap_future(session.submit(func))
+        # Await the writer directly instead of parking an executor thread on it
+        return await asyncio.wrap_future(get_writer().submit(func, kind))
+
+    @staticmethod
+    def in_write_session() -> bool:
+        """True while the current task's queries are pinned to a write session"""
+        return _write_session.get() is not None
+
+    @staticmethod
+    @asynccontextmanager
+    async def write_session():
+        """Pin this task's reads and writes to one transaction on the writer
+
+        The transaction commits when the block exits normally and rolls back
+        when it raises or when the session's rollback() was called. Writes by
+        everyone else wait for it, so keep the block short.
+        """
+        session = WriteSession(get_writer(), idle_timeout=WRITE_SESSION_IDLE_TIMEOUT)
+        token = _write_session.set(session)
+        try:
+            yield session
+        except BaseException:
+            _write_session.reset(token)
+            session.rollback()
+            try:
+                await asyncio.wrap_future(session.future)
+            except Exception:
+                pass  # rolled back (or never started); the original error matters
+            raise
+        _write_session.reset(token)
+        if session.finished:
+            try:
+                await asyncio.wrap_future(session.future)
+            except SessionRolledBack:
+                pass
+        else:
+            await asyncio.wrap_future(session.commit())
\ No newline at end of file
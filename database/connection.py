@@ -1,105 +1,292 @@
 # === database/connection.py ===
 import sqlite3
+import threading
 from pathlib import Path
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Iterator, TypeVar
 
-DATABASE_PATH = "gitlab_simulator.db"
+from config import (
+    DATABASE_URL, DATABASE_PROFILE, STREAM_CHUNK_SIZE, MAX_CONCURRENT_STREAMS,
+    DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_HEALTH_CHECK_INTERVAL,
+    WRITE_COALESCE_WINDOW_MS, WRITE_COALESCE_MAX_BATCH, WRITE_QUEUE_SIZE, WRITE_POLL_INTERVAL,
+    DB_BUSY_TIMEOUT_MS, DB_RETRY_ATTEMPTS, DB_RETRY_BASE_DELAY_MS, DB_RETRY_MAX_DELAY_MS,
+    QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES,
+)
+from database.contention import DatabaseUnavailable, RetryPolicy, statement_type
+from database.pool import ConnectionPool
+from database.writer import DatabaseWriter, TrackingConnection
+from database.versions import TableVersions
+from database.query_cache import QueryCache
+from database.migrations import run_migrations
+from database.profiles import apply_storage_profile, get_storage_profile
 
-def get_db_connection():
+def sqlite_path_from_url(url: str) -> str:
+    """Resolve a sqlite:///path URL to a database path"""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        raise ValueError(f"Unsupported DATABASE_URL '{url}', expected {prefix}<path>")
+    return url[len(prefix):]
+
+class StreamLimitReached(DatabaseUnavailable):
+    """Raised when MAX_CONCURRENT_STREAMS streamed queries are already running"""
+
+class StreamSlots:
+    """Counts streamed queries, turning away those above the limit"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._active >= self.limit:
+                self._rejected += 1
+                raise StreamLimitReached(f"{self.limit} streamed queries already running")
+            self._active += 1
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"active": self._active, "max": self.limit, "rejected": self._rejected}
+
+DATABASE_PATH = sqlite_path_from_url(DATABASE_URL)
+STORAGE_PROFILE = DATABASE_PROFILE
+
+_pool: Optional[ConnectionPool] = None
+_writer: Optional[DatabaseWriter] = None
+_table_versions = TableVersions()
+_stream_slots = StreamSlots(MAX_CONCURRENT_STREAMS)
+_query_cache = QueryCache(_table_versions, max_entries=QUERY_CACHE_MAX_ENTRIES, max_bytes=QUERY_CACHE_MAX_BYTES)
+_retry_policy = RetryPolicy(
+    attempts=DB_RETRY_ATTEMPTS,
+    base_delay_ms=DB_RETRY_BASE_DELAY_MS,
+    max_delay_ms=DB_RETRY_MAX_DELAY_MS,
+)
+
+T = TypeVar("T")
+
+def get_db_connection(factory: type = sqlite3.Connection):
     """Get database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    # Pooled connections may be used from more than one thread over their lifetime
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, factory=factory)
     conn.row_factory = sqlite3.Row  # Enable column access by name
+    apply_storage_profile(conn, STORAGE_PROFILE)
+    if DB_BUSY_TIMEOUT_MS is not None:
+        conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT_MS)}")
     return conn
 
-def init_database():
-    """Initialize database with tables"""
+def get_read_connection():
+    """Get a read-only connection; writes belong to the database writer"""
     conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            avatar_url TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Projects table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            description TEXT,
-            visibility TEXT DEFAULT 'private',
-            owner_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (owner_id) REFERENCES users (id)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def get_write_connection():
+    """Get the database writer's connection, which reports the tables it writes"""
+    return get_db_connection(factory=TrackingConnection)
+
+def get_pool() -> ConnectionPool:
+    """Get the shared connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            get_read_connection,
+            size=DB_POOL_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            health_check_interval=DB_POOL_HEALTH_CHECK_INTERVAL,
         )
-    """)
-    
-    # Issues table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS issues (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            project_id INTEGER NOT NULL,
-            author_id INTEGER,
-            assignee_id INTEGER,
-            state TEXT DEFAULT 'opened',
-            labels TEXT,  -- JSON array stored as text
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (project_id) REFERENCES projects (id),
-            FOREIGN KEY (author_id) REFERENCES users (id),
-            FOREIGN KEY (assignee_id) REFERENCES users (id)
+    return _pool
+
+def close_pool():
+    """Close the shared connection pool"""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+def get_writer() -> DatabaseWriter:
+    """Get the single database writer, creating it on first use"""
+    global _writer
+    if _writer is None:
+        _writer = DatabaseWriter(
+            get_write_connection,
+            window_ms=WRITE_COALESCE_WINDOW_MS,
+            max_batch=WRITE_COALESCE_MAX_BATCH,
+            queue_size=WRITE_QUEUE_SIZE,
+            retry_policy=_retry_policy,
+            poll_interval=WRITE_POLL_INTERVAL,
         )
-    """)
-    
-    conn.commit()
-    conn.close()
+        _writer.commit_listeners.append(_table_versions.bump)
+    return _writer
+
+def get_table_versions() -> TableVersions:
+    """Get the per-table write counters, kept current by the database writer"""
+    # The writer also watches for commits by other processes, so it must be running
+    get_writer().start()
+    return _table_versions
+
+def close_writer():
+    """Commit queued writes and stop the database writer"""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+def init_database():
+    """Initialize database with tables, upgrading existing files in place"""
+    conn = get_db_connection()
+    try:
+        applied = run_migrations(conn)
+    finally:
+        conn.close()
+    if applied:
+        print(f"✅ Database schema migrated to version {applied[-1]}")
     print("✅ Database tables created successfully")
 
 class DatabaseManager:
     """Database operations manager"""
     
     @staticmethod
-    def execute_query(query: str, params: tuple = ()) -> List[Dict]:
-        """Execute SELECT query and return results"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+    def execute_query(query: str, params: tuple = (), cache: bool = False) -> List[Dict]:
+        """Execute SELECT query and return results
+
+        cache=True opts into the query-result cache (see database/query_cache.py).
+        """
+        if cache:
+            rows = DatabaseManager.cached_query(query, params)
+            if rows is not None:
+                return rows
+        return DatabaseManager.fetch_query(query, params, store=cache)
+    
+    @staticmethod
+    def cached_query(query: str, params: tuple = ()) -> Optional[List[Dict]]:
+        """Return the cached results of query, if the cache holds current ones"""
+        if not _query_cache.enabled:
+            return None
+        return _query_cache.get(QueryCache.key(query, params))
+    
+    @staticmethod
+    def fetch_query(query: str, params: tuple = (), store: bool = False) -> List[Dict]:
+        """Execute SELECT query against the database, storing the results in the cache if asked"""
+        store = store and _query_cache.enabled
+        if store:
+            get_table_versions()
+            key = QueryCache.key(query, params)
+            # Versions as of before the query, so a write landing meanwhile makes the entry stale
+            tables, versions = _query_cache.versions(key)
+        
+        def fetch():
+            with get_pool().connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        
+        rows = _retry_policy.run(fetch, "select")
         
         # Convert rows to dictionaries
-        return [dict(row) for row in rows]
+        rows = [dict(row) for row in rows]
+        if store:
+            _query_cache.put(key, rows, tables, versions)
+        return rows
+    
+    @staticmethod
+    def stream_query(query: str, params: tuple = (), chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[List[Dict]]:
+        """Execute SELECT query and yield its results chunk_size rows at a time
+
+        Rows are read with fetchmany, so memory use depends on chunk_size, not
+        on the size of the result. The generator may be resumed from any
+        thread, one at a time.
+
+        A stream keeps its read transaction, and so its WAL snapshot, open
+        until the generator is exhausted or closed, which for a slow client
+        can be minutes. Checkpoints cannot go past a snapshot still in use,
+        so the WAL keeps growing, and reads slow down, for as long as the
+        stream runs. Streams therefore get their own connection instead of
+        tying up the pool that short queries need, and at most
+        MAX_CONCURRENT_STREAMS run at once; above that StreamLimitReached
+        (503) is raised before the query starts.
+        """
+        _stream_slots.acquire()
+        try:
+            conn = get_read_connection()
+            try:
+                cursor = _retry_policy.run(lambda: conn.execute(query, params), "select")
+                try:
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            return
+                        yield [dict(row) for row in rows]
+                finally:
+                    cursor.close()
+            finally:
+                conn.close()
+        finally:
+            _stream_slots.release()
     
     @staticmethod
     def execute_insert(query: str, params: tuple = ()) -> int:
         """Execute INSERT query and return last row id"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        last_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return last_id
+        return DatabaseManager.run_in_transaction(
+            lambda conn: conn.execute(query, params).lastrowid, kind=statement_type(query)
+        )
     
     @staticmethod
     def execute_update(query: str, params: tuple = ()) -> int:
         """Execute UPDATE query and return affected rows"""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        affected_rows = cursor.rowcount
-        conn.commit()
-        conn.close()
-        return affected_rows
\ No newline at end of file
+        return DatabaseManager.run_in_transaction(
+            lambda conn: conn.execute(query, params).rowcount, kind=statement_type(query)
+        )
+    
+    @staticmethod
+    def run_in_transaction(func: Callable[[sqlite3.Connection], T], kind: Optional[str] = None) -> T:
+        """Run func(conn) in one write transaction, committing only if it returns
+
+        Busy/locked errors are retried by the writer; kind labels the
+        transaction in the retry counters (defaults to func's name).
+        """
+        # All writes go through the single writer; func runs in its own savepoint
+        return get_writer().execute(func, kind)
+    
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """Return connection pool statistics"""
+        return get_pool().stats()
+    
+    @staticmethod
+    def stream_stats() -> Dict[str, Any]:
+        """Return streamed query statistics"""
+        return _stream_slots.stats()
+    
+    @staticmethod
+    def writer_stats() -> Dict[str, Any]:
+        """Return database writer statistics"""
+        return get_writer().stats()
+    
+    @staticmethod
+    def contention_stats() -> Dict[str, Any]:
+        """Return busy/locked retry counters per statement type"""
+        return _retry_policy.stats()
+    
+    @staticmethod
+    def query_cache_stats() -> Dict[str, Any]:
+        """Return query-result cache statistics"""
+        return _query_cache.stats()
+    
+    @staticmethod
+    def table_versions_stats() -> Dict[str, Any]:
+        """Return the per-table write counters"""
+        return _table_versions.stats()
+    
+    @staticmethod
+    def storage_profile() -> Dict[str, Any]:
+        """Return the active storage profile and its settings"""
+        settings = {"name": STORAGE_PROFILE, **get_storage_profile(STORAGE_PROFILE)}
+        if DB_BUSY_TIMEOUT_MS is not None:
+            settings["busy_timeout"] = int(DB_BUSY_TIMEOUT_MS)
+        return settings
\ No newline at end of file
@@ -0,0 +1,96 @@
+# === database/contention.py ===
+"""
+Lock-contention policy.
+
+A competing writer (another worker process, the maintenance CLI) shows up as
+SQLITE_BUSY or SQLITE_LOCKED once busy_timeout has run out, and some busy
+conditions (a checkpoint in progress, a stale WAL snapshot) skip the busy
+handler altogether. Those errors are safe to retry as long as the failed
+attempt was rolled back first: nothing it did became visible, so running it
+again cannot apply it twice. Every other error is final.
+
+RetryPolicy retries such attempts with jittered exponential backoff and
+counts retries per statement type. When the budget is spent it raises
+DatabaseBusy, which the API reports as 503 with Retry-After.
+"""
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Any, TypeVar
+
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+T = TypeVar("T")
+
+class DatabaseUnavailable(Exception):
+    """The database cannot take the request right now; clients should retry"""
+    retry_after = 1  # seconds
+
+class DatabaseBusy(DatabaseUnavailable):
+    """Lock contention outlasted every retry"""
+
+def is_retryable(error: BaseException) -> bool:
+    """True for busy/locked errors, which leave nothing behind once rolled back"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        # Extended codes (SQLITE_BUSY_SNAPSHOT, ...) keep the primary code in the low byte
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    message = str(error)
+    return "database is locked" in message or "database table is locked" in message
+
+def statement_type(query: str) -> str:
+    """Lower-cased leading keyword of a SQL statement ("insert", "update", ...)"""
+    words = query.split(None, 1)
+    return words[0].lower() if words else "unknown"
+
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff for busy/locked errors"""
+
+    def __init__(self, attempts: int = 5, base_delay_ms: float = 10, max_delay_ms: float = 500):
+        self.attempts = attempts
+        self.base_delay = base_delay_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+        self._lock = threading.Lock()
+        self._retries: Counter = Counter()
+        self._exhausted: Counter = Counter()
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number attempt + 1 ("full jitter")"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def backoff(self, attempt: int, kind: str, error: BaseException):
+        """Wait before retrying a rolled-back attempt, or raise DatabaseBusy when out of retries"""
+        if attempt >= self.attempts:
+            with self._lock:
+                self._exhausted[kind] += 1
+            raise DatabaseBusy(f"Database is busy ({kind}), retry later") from error
+        with self._lock:
+            self._retries[kind] += 1
+        time.sleep(self.delay(attempt))
+
+    def run(self, func: Callable[[], T], kind: str) -> T:
+        """Call func() until it succeeds; func must roll back a failed attempt itself"""
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except sqlite3.OperationalError as e:
+                if not is_retryable(e):
+                    raise
+                self.backoff(attempt, kind, e)
+                attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "base_delay_ms": self.base_delay * 1000,
+                "max_delay_ms": self.max_delay * 1000,
+                "retries": dict(self._retries),
+                "exhausted": dict(self._exhausted),
+            }
\ No newline at end of file
@@ -0,0 +1,109 @@
+# === database/maintenance.py ===
+import sqlite3
+from typing import Tuple
+
+def recompute_project_counters(conn: sqlite3.Connection) -> int:
+    """Recompute projects.issues_count / open_issues_count from the issues table.
+
+    The counters are maintained by triggers; this repairs any drift (for
+    example after editing the database by hand with triggers disabled) and
+    returns the number of projects that were corrected.
+    """
+    cursor = conn.execute("""
+        UPDATE projects SET
+            issues_count = actual.issues_count,
+            open_issues_count = actual.open_issues_count
+        FROM (
+            SELECT p.id,
+                   COUNT(i.id) AS issues_count,
+                   COUNT(CASE WHEN i.state = 'opened' THEN 1 END) AS open_issues_count
+            FROM projects p
+            LEFT JOIN issues i ON i.project_id = p.id
+            GROUP BY p.id
+        ) AS actual
+        WHERE actual.id = projects.id
+          AND (projects.issues_count != actual.issues_count
+               OR projects.open_issues_count != actual.open_issues_count)
+    """)
+    conn.commit()
+    return cursor.rowcount
+
+
+def recompute_stats_aggregates(conn: sqlite3.Connection) -> int:
+    """Rebuild the /admin/stats aggregate tables from the base tables.
+
+    Returns the number of aggregate rows that had drifted and were corrected.
+    """
+    changes_before = conn.total_changes
+    conn.execute("""
+        INSERT INTO stats_counters (name, value)
+        SELECT 'users', COUNT(*) FROM users
+        UNION ALL SELECT 'projects', COUNT(*) FROM projects
+        UNION ALL SELECT 'issues', COUNT(*) FROM issues
+        UNION ALL SELECT 'open_issues', COUNT(*) FROM issues WHERE state = 'opened'
+        ON CONFLICT (name) DO UPDATE SET value = excluded.value
+        WHERE value != excluded.value
+    """)
+    conn.execute("""
+        UPDATE user_workload SET assigned_issues = 0, open_assigned = 0
+        WHERE (assigned_issues != 0 OR open_assigned != 0)
+          AND user_id NOT IN (SELECT assignee_id FROM issues WHERE assignee_id IS NOT NULL)
+    """)
+    conn.execute("""
+        INSERT INTO user_workload (user_id, assigned_issues, open_assigned)
+        SELECT assignee_id, COUNT(*), COUNT(CASE WHEN state = 'opened' THEN 1 END)
+        FROM issues
+        WHERE assignee_id IS NOT NULL
+        GROUP BY assignee_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            assigned_issues = excluded.assigned_issues,
+            open_assigned = excluded.open_assigned
+        WHERE assigned_issues != excluded.assigned_issues
+           OR open_assigned != excluded.open_assigned
+    """)
+    conn.execute("""
+        UPDATE labels SET issues_count = actual.issues_count
+        FROM (
+            SELECT l.id, COUNT(il.issue_id) AS issues_count
+            FROM labels l
+            LEFT JOIN issue_labels il ON il.label_id = l.id
+            GROUP BY l.id
+        ) AS actual
+        WHERE actual.id = labels.id AND labels.issues_count != actual.issues_count
+    """)
+    conn.commit()
+    return conn.total_changes - changes_before
+
+
+
+def prune_change_log(conn: sqlite3.Connection, retention_days: float, compact_after_hours: float) -> Tuple[int, int]:
+    """Apply change_log retention and compaction; returns (pruned, compacted).
+
+    Entries older than retention_days are dropped and the horizon moves past
+    them, so clients resuming from before it get 410 and must resync.
+    Entries older than compact_after_hours that a newer entry for the same
+    row supersedes are dropped without moving the horizon: the newer entry
+    carries the whole row, so incremental sync stays complete.
+
+    Unlike the recompute functions this does not commit, so it can run as a
+    command on the database writer; the caller commits.
+    """
+    pruned = 0
+    pruned_seq = conn.execute(
+        "SELECT MAX(seq) FROM change_log WHERE changed_at < datetime('now', ?)",
+        (f"-{retention_days} days",)
+    ).fetchone()[0]
+    if pruned_seq is not None:
+        pruned = conn.execute("DELETE FROM change_log WHERE seq <= ?", (pruned_seq,)).rowcount
+        conn.execute("UPDATE change_log_horizon SET pruned_seq = MAX(pruned_seq, ?)", (pruned_seq,))
+    compacted = conn.execute("""
+        DELETE FROM change_log
+        WHERE changed_at < datetime('now', ?)
+          AND EXISTS (
+              SELECT 1 FROM change_log newer
+              WHERE newer.entity = change_log.entity
+                AND newer.entity_id = change_log.entity_id
+                AND newer.seq > change_log.seq
+          )
+    """, (f"-{compact_after_hours} hours",)).rowcount
+    return pruned, compacted
\ No newline at end of file
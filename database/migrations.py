@@ -0,0 +1,422 @@
+# === database/migrations.py ===
+"""
+Versioned schema migrations.
+
+The schema version is stored in SQLite's ``PRAGMA user_version``. Each
+migration runs in its own transaction together with the version bump, so a
+database is always at a well-defined version. Existing databases created
+before migrations existed report version 0 and are upgraded in place.
+
+Upgrade a database file from the command line:
+
+    python -m database migrate [path/to/gitlab_simulator.db]
+"""
+import sqlite3
+from typing import List, Tuple
+
+# JSON snapshots of a row for the change log; {row} is NEW or OLD
+CHANGE_SNAPSHOTS = {
+    "issues": """json_object(
+        'id', {row}.id, 'title', {row}.title, 'description', {row}.description,
+        'project_id', {row}.project_id, 'author_id', {row}.author_id, 'assignee_id', {row}.assignee_id,
+        'state', {row}.state,
+        'labels', json(CASE WHEN json_valid({row}.labels) THEN {row}.labels ELSE '[]' END),
+        'created_at', {row}.created_at, 'updated_at', {row}.updated_at, 'version', {row}.version)""",
+    "projects": """json_object(
+        'id', {row}.id, 'name', {row}.name, 'description', {row}.description,
+        'visibility', {row}.visibility, 'owner_id', {row}.owner_id,
+        'created_at', {row}.created_at, 'updated_at', {row}.updated_at, 'version', {row}.version)""",
+    "users": """json_object(
+        'id', {row}.id, 'username', {row}.username, 'name', {row}.name, 'email', {row}.email,
+        'avatar_url', {row}.avatar_url, 'created_at', {row}.created_at, 'updated_at', {row}.updated_at)""",
+}
+
+def _change_log_triggers(table: str, entity: str, update_of: str = "") -> List[str]:
+    """INSERT/UPDATE/DELETE triggers appending a table's changes to change_log"""
+    snapshot = CHANGE_SNAPSHOTS[table]
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_change_log_{op}
+        AFTER {event} ON {table}
+        BEGIN
+            INSERT INTO change_log (entity, entity_id, op, data)
+            VALUES ('{entity}', {row}.id, '{op}', {snapshot.format(row=row)});
+        END
+        """
+        for op, event, row in [
+            ("create", "INSERT", "NEW"),
+            ("update", f"UPDATE{update_of}", "NEW"),
+            ("delete", "DELETE", "OLD"),
+        ]
+    ]
+
+# (version, name, statements) - append only, never edit a released migration
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "initial_schema", [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            avatar_url TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            visibility TEXT DEFAULT 'private',
+            owner_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (owner_id) REFERENCES users (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS issues (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            project_id INTEGER NOT NULL,
+            author_id INTEGER,
+            assignee_id INTEGER,
+            state TEXT DEFAULT 'opened',
+            labels TEXT,  -- JSON array stored as text
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            FOREIGN KEY (author_id) REFERENCES users (id),
+            FOREIGN KEY (assignee_id) REFERENCES users (id)
+        )
+        """,
+    ]),
+    (2, "hot_query_indexes", [
+        # GET /issues?project_id=&state= and the project JOINs / GROUP BYs
+        "CREATE INDEX IF NOT EXISTS idx_issues_project_state_updated ON issues (project_id, state, updated_at)",
+        # GET /issues?assignee_id=&state=, workload GROUP BY, bulk reassign
+        "CREATE INDEX IF NOT EXISTS idx_issues_assignee_state_updated ON issues (assignee_id, state, updated_at)",
+        # GET /users/{id}/issues matches on author as well as assignee
+        "CREATE INDEX IF NOT EXISTS idx_issues_author ON issues (author_id)",
+        # Unfiltered GET /issues ordered by most recently updated
+        "CREATE INDEX IF NOT EXISTS idx_issues_updated ON issues (updated_at)",
+        # Open issues are the hot subset: GET /issues?state=opened and open counts
+        "CREATE INDEX IF NOT EXISTS idx_issues_opened_updated ON issues (updated_at) WHERE state = 'opened'",
+    ]),
+    (3, "normalized_labels", [
+        """
+        CREATE TABLE IF NOT EXISTS labels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS issue_labels (
+            issue_id INTEGER NOT NULL,
+            label_id INTEGER NOT NULL,
+            PRIMARY KEY (issue_id, label_id),
+            FOREIGN KEY (issue_id) REFERENCES issues (id),
+            FOREIGN KEY (label_id) REFERENCES labels (id)
+        ) WITHOUT ROWID
+        """,
+        # Label filters and the label histogram start from the label side
+        "CREATE INDEX IF NOT EXISTS idx_issue_labels_label ON issue_labels (label_id, issue_id)",
+        # Backfill from the JSON column
+        """
+        INSERT OR IGNORE INTO labels (name)
+        SELECT DISTINCT je.value
+        FROM issues i, json_each(i.labels) je
+        WHERE json_valid(i.labels)
+        """,
+        """
+        INSERT OR IGNORE INTO issue_labels (issue_id, label_id)
+        SELECT i.id, l.id
+        FROM issues i, json_each(i.labels) je
+        JOIN labels l ON l.name = je.value
+        WHERE json_valid(i.labels)
+        """,
+        # issues.labels stays the source of truth; triggers keep issue_labels in step
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_labels_insert
+        AFTER INSERT ON issues
+        WHEN json_valid(NEW.labels)
+        BEGIN
+            INSERT OR IGNORE INTO labels (name)
+            SELECT value FROM json_each(NEW.labels);
+            INSERT OR IGNORE INTO issue_labels (issue_id, label_id)
+            SELECT NEW.id, l.id FROM json_each(NEW.labels) je JOIN labels l ON l.name = je.value;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_labels_update
+        AFTER UPDATE OF labels ON issues
+        WHEN OLD.labels IS NOT NEW.labels
+        BEGIN
+            DELETE FROM issue_labels WHERE issue_id = NEW.id;
+            INSERT OR IGNORE INTO labels (name)
+            SELECT value FROM json_each(CASE WHEN json_valid(NEW.labels) THEN NEW.labels ELSE '[]' END);
+            INSERT OR IGNORE INTO issue_labels (issue_id, label_id)
+            SELECT NEW.id, l.id
+            FROM json_each(CASE WHEN json_valid(NEW.labels) THEN NEW.labels ELSE '[]' END) je
+            JOIN labels l ON l.name = je.value;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_labels_delete
+        AFTER DELETE ON issues
+        BEGIN
+            DELETE FROM issue_labels WHERE issue_id = OLD.id;
+        END
+        """,
+    ]),
+    (4, "keyset_pagination_indexes", [
+        # Lists are ordered by (timestamp, id); every index implicitly ends in
+        # the rowid, so an index on (..., timestamp) serves the whole cursor key
+        "CREATE INDEX IF NOT EXISTS idx_issues_project_updated ON issues (project_id, updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_project_created ON issues (project_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_assignee_updated ON issues (assignee_id, updated_at)",
+        "DROP INDEX IF EXISTS idx_issues_author",
+        "CREATE INDEX IF NOT EXISTS idx_issues_author_updated ON issues (author_id, updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_created ON projects (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_users_created ON users (created_at)",
+    ]),
+    (5, "project_issue_counters", [
+        "ALTER TABLE projects ADD COLUMN issues_count INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE projects ADD COLUMN open_issues_count INTEGER NOT NULL DEFAULT 0",
+        """
+        UPDATE projects SET
+            issues_count = (SELECT COUNT(*) FROM issues i WHERE i.project_id = projects.id),
+            open_issues_count = (SELECT COUNT(*) FROM issues i WHERE i.project_id = projects.id AND i.state = 'opened')
+        """,
+        # Counters move inside the same transaction as the issue write
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_counters_insert
+        AFTER INSERT ON issues
+        BEGIN
+            UPDATE projects SET
+                issues_count = issues_count + 1,
+                open_issues_count = open_issues_count + (NEW.state IS 'opened')
+            WHERE id = NEW.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_counters_update
+        AFTER UPDATE OF project_id, state ON issues
+        WHEN OLD.project_id IS NOT NEW.project_id OR OLD.state IS NOT NEW.state
+        BEGIN
+            UPDATE projects SET
+                issues_count = issues_count - 1,
+                open_issues_count = open_issues_count - (OLD.state IS 'opened')
+            WHERE id = OLD.project_id;
+            UPDATE projects SET
+                issues_count = issues_count + 1,
+                open_issues_count = open_issues_count + (NEW.state IS 'opened')
+            WHERE id = NEW.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_counters_delete
+        AFTER DELETE ON issues
+        BEGIN
+            UPDATE projects SET
+                issues_count = issues_count - 1,
+                open_issues_count = open_issues_count - (OLD.state IS 'opened')
+            WHERE id = OLD.project_id;
+        END
+        """,
+    ]),
+    (6, "stats_aggregates", [
+        # Global counts, per-user workload and the label histogram behind
+        # /admin/stats; per-project health reuses the project counters
+        """
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_workload (
+            user_id INTEGER PRIMARY KEY,
+            assigned_issues INTEGER NOT NULL DEFAULT 0,
+            open_assigned INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        "ALTER TABLE labels ADD COLUMN issues_count INTEGER NOT NULL DEFAULT 0",
+        """
+        INSERT OR REPLACE INTO stats_counters (name, value) VALUES
+            ('users', (SELECT COUNT(*) FROM users)),
+            ('projects', (SELECT COUNT(*) FROM projects)),
+            ('issues', (SELECT COUNT(*) FROM issues)),
+            ('open_issues', (SELECT COUNT(*) FROM issues WHERE state = 'opened'))
+        """,
+        """
+        INSERT OR REPLACE INTO user_workload (user_id, assigned_issues, open_assigned)
+        SELECT assignee_id, COUNT(*), COUNT(CASE WHEN state = 'opened' THEN 1 END)
+        FROM issues
+        WHERE assignee_id IS NOT NULL
+        GROUP BY assignee_id
+        """,
+        "UPDATE labels SET issues_count = (SELECT COUNT(*) FROM issue_labels il WHERE il.label_id = labels.id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_stats_insert
+        AFTER INSERT ON users
+        BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'users';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_stats_delete
+        AFTER DELETE ON users
+        BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'users';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_projects_stats_insert
+        AFTER INSERT ON projects
+        BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'projects';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_projects_stats_delete
+        AFTER DELETE ON projects
+        BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'projects';
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_stats_insert
+        AFTER INSERT ON issues
+        BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'issues';
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'open_issues' AND NEW.state IS 'opened';
+            INSERT INTO user_workload (user_id, assigned_issues, open_assigned)
+            SELECT NEW.assignee_id, 1, NEW.state IS 'opened' WHERE NEW.assignee_id IS NOT NULL
+            ON CONFLICT (user_id) DO UPDATE SET
+                assigned_issues = assigned_issues + 1,
+                open_assigned = open_assigned + excluded.open_assigned;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_stats_update
+        AFTER UPDATE OF assignee_id, state ON issues
+        WHEN OLD.assignee_id IS NOT NEW.assignee_id OR OLD.state IS NOT NEW.state
+        BEGIN
+            UPDATE stats_counters
+            SET value = value - (OLD.state IS 'opened') + (NEW.state IS 'opened')
+            WHERE name = 'open_issues';
+            UPDATE user_workload SET
+                assigned_issues = assigned_issues - 1,
+                open_assigned = open_assigned - (OLD.state IS 'opened')
+            WHERE user_id = OLD.assignee_id;
+            INSERT INTO user_workload (user_id, assigned_issues, open_assigned)
+            SELECT NEW.assignee_id, 1, NEW.state IS 'opened' WHERE NEW.assignee_id IS NOT NULL
+            ON CONFLICT (user_id) DO UPDATE SET
+                assigned_issues = assigned_issues + 1,
+                open_assigned = open_assigned + excluded.open_assigned;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issues_stats_delete
+        AFTER DELETE ON issues
+        BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'issues';
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'open_issues' AND OLD.state IS 'opened';
+            UPDATE user_workload SET
+                assigned_issues = assigned_issues - 1,
+                open_assigned = open_assigned - (OLD.state IS 'opened')
+            WHERE user_id = OLD.assignee_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issue_labels_stats_insert
+        AFTER INSERT ON issue_labels
+        BEGIN
+            UPDATE labels SET issues_count = issues_count + 1 WHERE id = NEW.label_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_issue_labels_stats_delete
+        AFTER DELETE ON issue_labels
+        BEGIN
+            UPDATE labels SET issues_count = issues_count - 1 WHERE id = OLD.label_id;
+        END
+        """,
+    ]),
+    (7, "row_versions", [
+        # Bumped by every API write; exposed as the ETag for If-Match checks
+        "ALTER TABLE issues ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+        "ALTER TABLE projects ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    ]),
+    (8, "change_log", [
+        # AUTOINCREMENT so sequence numbers are never reused, even after
+        # retention has emptied the table
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,      -- issue, project or user
+            entity_id INTEGER NOT NULL,
+            op TEXT NOT NULL,          -- create, update or delete
+            data TEXT,                 -- JSON snapshot (the old row for deletes)
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_change_log_entity ON change_log (entity, entity_id, seq)",
+        # Everything up to pruned_seq may have been dropped by retention
+        """
+        CREATE TABLE IF NOT EXISTS change_log_horizon (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pruned_seq INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO change_log_horizon (id, pruned_seq) VALUES (1, 0)",
+        *_change_log_triggers("issues", "issue"),
+        # Only the project's own columns: counter updates made by triggers are not changes
+        *_change_log_triggers("projects", "project", " OF name, description, visibility, owner_id, updated_at, version"),
+        *_change_log_triggers("users", "user"),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run_migrations(conn: sqlite3.Connection) -> List[int]:
+    """Apply all pending migrations and return the versions applied
+
+    Safe to run from several processes at once: each migration re-checks the
+    version under the write lock, so only one process applies it.
+    """
+    applied = []
+    current = get_schema_version(conn)
+    isolation_level = conn.isolation_level
+    # Manage transactions explicitly so DDL and the version bump commit together
+    conn.isolation_level = None
+    try:
+        for version, name, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have applied it since the version was read
+                current = get_schema_version(conn)
+                if version <= current:
+                    conn.execute("ROLLBACK")
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(version)
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
\ No newline at end of file
@@ -0,0 +1,207 @@
+# === database/pool.py ===
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any
+
+from database.contention import DatabaseUnavailable
+
+
+class PoolTimeout(DatabaseUnavailable):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections.
+
+    Connections are handed out per thread: a thread that already holds a
+    connection gets the same one back for nested calls, so a request never
+    needs more than one connection at a time.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], sqlite3.Connection],
+        size: int = 8,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # LIFO so the most recently used (warm) connection is reused first
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_used: Dict[int, float] = {}
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the ``with`` block"""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._checkin(conn)
+
+    def _checkout(self) -> sqlite3.Connection:
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+
+        started = time.perf_counter()
+        waited = False
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = None
+                reused = False
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        conn = self.factory()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                else:
+                    waited = True
+                    remaining = self.timeout - (time.perf_counter() - started)
+                    if remaining <= 0:
+                        # A wait that ran out still counts, so exhaustion shows in stats()
+                        with self._lock:
+                            self._timeouts += 1
+                            self._record_wait(time.perf_counter() - started)
+                        raise PoolTimeout(
+                            f"No database connection available after {self.timeout:.1f}s"
+                        )
+                    try:
+                        conn = self._idle.get(timeout=remaining)
+                        reused = True
+                    except queue.Empty:
+                        continue
+
+            if reused and not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+            break
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            if reused:
+                self._hits += 1
+            else:
+                self._misses += 1
+            if waited:
+                self._record_wait(elapsed)
+        return conn
+
+    def _record_wait(self, elapsed: float):
+        # Caller holds self._lock
+        self._waits += 1
+        self._wait_time += elapsed
+        self._max_wait = max(self._max_wait, elapsed)
+
+    def _checkin(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._in_use -= 1
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._last_used[id(conn)] = time.monotonic()
+        self._idle.put(conn)
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        last_used = self._last_used.get(id(conn), 0.0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            with self._lock:
+                self._health_check_failures += 1
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        self._last_used.pop(id(conn), None)
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close all idle connections; borrowed ones are closed on return"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage counters"""
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                "size": self.size,
+                "open_connections": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": checkouts,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / checkouts, 4) if checkouts else 0.0,
+                "waits": self._waits,
+                "avg_wait_ms": round(self._wait_time / self._waits * 1000, 3) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "timeouts": self._timeouts,
+                "health_check_failures": self._health_check_failures,
+            }
\ No newline at end of file
@@ -0,0 +1,62 @@
+# === database/profiles.py ===
+"""
+Named SQLite storage profiles.
+
+A profile is a set of PRAGMAs applied to every connection. Pick one per
+deployment with the DATABASE_PROFILE setting (see config.py):
+
+- durable:            WAL with fsync on every commit; survives power loss
+- throughput:         WAL with fsync at checkpoints only; a crash can lose
+                      the last few commits but never corrupts the file
+- ephemeral-training: no fsync at all and large in-memory caches; for
+                      throwaway databases that are re-seeded on every run
+
+Run ``python benchmark.py profiles`` to compare them on your hardware.
+"""
+import sqlite3
+from typing import Dict, Any
+
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,        # KiB (negative) -> ~16 MB page cache
+        "mmap_size": 0,
+        "busy_timeout": 5000,        # ms
+        "temp_store": "DEFAULT",
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,        # ~64 MB
+        "mmap_size": 268435456,      # 256 MB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    "ephemeral-training": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,       # ~256 MB
+        "mmap_size": 1073741824,     # 1 GB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Order matters: busy_timeout first so switching journal mode can wait for locks
+PRAGMA_ORDER = ["busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store"]
+
+def get_storage_profile(name: str) -> Dict[str, Any]:
+    """Look up a storage profile by name"""
+    try:
+        return STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage profile '{name}'. Choose one of: {', '.join(STORAGE_PROFILES)}"
+        ) from None
+
+def apply_storage_profile(conn: sqlite3.Connection, name: str):
+    """Apply a storage profile's PRAGMAs to a connection"""
+    settings = get_storage_profile(name)
+    for pragma in PRAGMA_ORDER:
+        conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
\ No newline at end of file
@@ -0,0 +1,130 @@
+# === database/query_cache.py ===
+"""
+Query-result cache.
+
+Read queries that callers mark as cacheable are stored under their
+whitespace-normalized SQL and parameters. Each entry also records the tables
+the query reads and their write counters (see database/versions.py) at the
+time it ran. A lookup returns the entry only while all those counters are
+unchanged, so any commit to one of the tables invalidates it, without the
+writer needing to know anything about the cache. The counters are read
+before the query runs: a write that lands while it runs makes the new entry
+stale straight away, never wrong.
+
+The cache is an LRU bounded by QUERY_CACHE_MAX_ENTRIES and
+QUERY_CACHE_MAX_BYTES (an estimate of the rows' size). Callers get their own
+copy of the rows, so they may modify them freely.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from database.versions import TableVersions
+
+TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.IGNORECASE)
+ROW_OVERHEAD_BYTES = 64
+
+def normalize_sql(query: str) -> str:
+    """Query with runs of whitespace collapsed, so formatting does not split cache entries"""
+    return " ".join(query.split())
+
+def statement_tables(query: str) -> Tuple[str, ...]:
+    """Tables a SELECT reads, from its FROM and JOIN clauses (subqueries included)"""
+    return tuple(sorted({name.lower() for name in TABLE_REFERENCE.findall(query)}))
+
+def estimate_size(rows: List[Dict[str, Any]]) -> int:
+    """Rough size of rows in bytes: string and blob lengths plus a fixed cost per value"""
+    size = 0
+    for row in rows:
+        size += ROW_OVERHEAD_BYTES
+        for value in row.values():
+            size += len(value) if isinstance(value, (str, bytes)) else 8
+    return size
+
+class _Entry:
+    __slots__ = ("rows", "tables", "versions", "size")
+
+    def __init__(self, rows: List[Dict[str, Any]], tables: Tuple[str, ...], versions: Tuple[int, ...]):
+        self.rows = rows
+        self.tables = tables
+        self.versions = versions
+        self.size = estimate_size(rows)
+
+class QueryCache:
+    """LRU cache of query results, invalidated through table write counters"""
+
+    def __init__(self, table_versions: TableVersions, max_entries: int = 1000, max_bytes: int = 16 * 1024 * 1024):
+        self.table_versions = table_versions
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, tuple], _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def key(query: str, params: Sequence[Any]) -> Tuple[str, tuple]:
+        return normalize_sql(query), tuple(params)
+
+    def get(self, key: Tuple[str, tuple]) -> Optional[List[Dict[str, Any]]]:
+        """A copy of the cached rows for key, or None when missing or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if self.table_versions.get(entry.tables) != entry.versions:
+                self._remove(key)
+                self._invalidations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            rows = entry.rows
+        return [dict(row) for row in rows]
+
+    def versions(self, key: Tuple[str, tuple]) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+        """The tables key's query reads and their versions; take this before running it"""
+        tables = statement_tables(key[0])
+        return tables, self.table_versions.get(tables)
+
+    def put(self, key: Tuple[str, tuple], rows: List[Dict[str, Any]], tables: Tuple[str, ...], versions: Tuple[int, ...]):
+        """Store a copy of rows, read while tables were at versions"""
+        entry = _Entry([dict(row) for row in rows], tables, versions)
+        if not tables or entry.size > self.max_bytes:
+            return  # nothing to invalidate it by, or it would push out everything else
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: Tuple[str, tuple]):
+        self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "evictions": self._evictions,
+            }
\ No newline at end of file
@@ -0,0 +1,55 @@
+# === database/versions.py ===
+"""
+Per-table write counters.
+
+The database writer reports the tables each committed batch wrote, and
+TableVersions bumps their counters before the writers' callers get their
+answers. Reading a counter is a dict lookup, so a request can tell whether
+anything it depends on has changed without touching the database.
+
+Commits by other processes (more server workers, the maintenance CLI) come
+without table names; they bump every table at once. Counters start from zero
+in each process, so anything derived from them must include ``epoch``,
+which is random per process.
+"""
+import secrets
+import threading
+from typing import Dict, Any, Iterable, Optional, Set, Tuple
+
+class TableVersions:
+    """Monotonic per-table write counters, bumped by the database writer"""
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(8)
+        self._versions: Dict[str, int] = {}
+        self._all = 0  # bumps applied to every table (writes by other connections)
+        self._total = 0  # bumped by every write; the version of "everything"
+        self._lock = threading.Lock()
+
+    def bump(self, tables: Optional[Set[str]]):
+        """Record a commit that wrote tables (None: unknown tables, bump them all)"""
+        with self._lock:
+            if tables is None:
+                self._all += 1
+            elif not tables:
+                return
+            else:
+                for table in tables:
+                    self._versions[table] = self._versions.get(table, 0) + 1
+            self._total += 1
+
+    def get(self, tables: Iterable[str] = ()) -> Tuple[int, ...]:
+        """Current versions of tables, or the overall version when none are named"""
+        tables = tuple(tables)
+        if not tables:
+            return (self._total,)
+        return tuple(self._versions.get(table, 0) + self._all for table in tables)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "epoch": self.epoch,
+                "total": self._total,
+                "external": self._all,
+                "tables": {table: version + self._all for table, version in sorted(self._versions.items())},
+            }
\ No newline at end of file
@@ -0,0 +1,406 @@
+# === database/writer.py ===
+"""
+Single-writer actor for all mutations.
+
+SQLite admits one writer at a time, so instead of letting every request
+thread race for the write lock, one thread owns the only write connection
+and consumes a bounded queue of mutation commands. A command is a function
+``func(conn)``; callers get a future for its result.
+
+The writer groups whatever arrives within a short window (or until the batch
+is full) into one transaction, runs each command inside its own SAVEPOINT
+and commits once, so one fsync covers the whole batch while every caller
+still gets its own result or exception. When the queue is full, submit()
+fails fast with WriteQueueFull instead of letting requests pile up.
+
+If another process holds the database lock, the whole batch is rolled back
+and replayed under the contention RetryPolicy; a rolled-back batch left no
+trace, so replaying it cannot apply a command twice.
+
+After every commit the writer tells its commit listeners which tables the
+batch wrote, when its connection is a TrackingConnection (otherwise, and for
+commits by other connections, listeners get None: tables unknown). Commits
+by other connections are spotted through PRAGMA data_version, checked
+before every batch and every poll_interval seconds while idle.
+
+A WriteSession keeps one transaction open across commands that are not
+known up front (the sub-requests of an atomic batch). It is a single queued
+command that runs the session's commands as they arrive. It holds the writer,
+and with it every other write, until the session commits, rolls back or
+sits idle for longer than its idle_timeout.
+"""
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Set, Tuple
+
+from database.contention import DatabaseUnavailable, RetryPolicy, is_retryable
+from database.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+QUEUE_DEPTH_BUCKETS = [0, 1, 4, 16, 64, 256, 1024, 4096]
+LATENCY_MS_BUCKETS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+WRITE_ACTIONS = {sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE}
+MAX_TRACKED_STATEMENTS = 1024
+
+_STOP = object()
+_COMMIT = object()
+_ROLLBACK = object()
+
+class WriteQueueFull(DatabaseUnavailable):
+    """Raised when the writer queue has no room for another command"""
+
+class _Contention(Exception):
+    """A batch hit a retryable lock error and was rolled back"""
+
+    def __init__(self, kind: str, error: BaseException):
+        super().__init__(kind)
+        self.kind = kind
+        self.error = error
+
+class SessionRolledBack(Exception):
+    """A write session was rolled back on request"""
+
+class TrackingConnection(sqlite3.Connection):
+    """sqlite3 connection recording the tables its statements write in ``written``
+
+    An authorizer sees every table a statement writes, including through
+    triggers, but only while the statement is prepared. Prepared statements
+    are cached and reused, so execute() and executemany() remember the
+    tables per SQL text. A cached statement whose tables were never seen
+    sets ``written`` to None (unknown). Writes must go through those two
+    methods, not through a separate cursor.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written: Optional[Set[str]] = set()
+        self._statement_tables: Dict[str, FrozenSet[str]] = {}
+        self._prepared: Optional[Set[str]] = None
+        self.set_authorizer(self._authorize)
+
+    def _authorize(self, action: int, table: Optional[str], arg2, database, trigger) -> int:
+        if self._prepared is None:
+            self._prepared = set()
+        if action in WRITE_ACTIONS and not table.startswith("sqlite_"):
+            self._prepared.add(table)
+            if self.written is not None:
+                self.written.add(table)
+        return sqlite3.SQLITE_OK
+
+    def _track(self, sql: str, run: Callable[[], sqlite3.Cursor]) -> sqlite3.Cursor:
+        self._prepared = None
+        try:
+            return run()
+        finally:
+            tables = self._prepared
+            if tables is not None:
+                if len(self._statement_tables) < MAX_TRACKED_STATEMENTS:
+                    self._statement_tables[sql] = frozenset(tables)
+            else:
+                tables = self._statement_tables.get(sql)
+                if tables is None:
+                    self.written = None
+                elif self.written is not None:
+                    self.written.update(tables)
+            self._prepared = None
+
+    def execute(self, sql, parameters=(), /):
+        return self._track(sql, lambda: sqlite3.Connection.execute(self, sql, parameters))
+
+    def executemany(self, sql, parameters, /):
+        return self._track(sql, lambda: sqlite3.Connection.executemany(self, sql, parameters))
+
+class DatabaseWriter:
+    """Owns the write connection and applies queued commands in group commits"""
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        window_ms: float = 2.0,
+        max_batch: int = 256,
+        queue_size: int = 1024,
+        retry_policy: Optional[RetryPolicy] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.connect = connect
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.poll_interval = poll_interval
+        # Called on the writer thread after every successful commit, before the
+        # callers are answered, with the tables written (None: unknown); must not block
+        self.commit_listeners: List[Callable[[Optional[Set[str]]], None]] = []
+        self._data_version = None
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._conn = None
+        self._started = False
+        self._start_lock = threading.Lock()
+
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+        self.wait_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.latency_ms = Histogram(LATENCY_MS_BUCKETS)
+        self._commits = 0
+        self._failed_commits = 0
+        self._rejected = 0
+
+    def start(self):
+        with self._start_lock:
+            if not self._started:
+                self._conn = self.connect()
+                self._data_version = self._read_data_version()
+                self._thread.start()
+                self._started = True
+
+    def submit(self, func: Callable[[sqlite3.Connection], Any], kind: Optional[str] = None) -> Future:
+        """Queue func(conn) for the writer and return a future for its result
+
+        kind labels the command in retry statistics (defaults to the function name).
+        """
+        self.start()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((func, kind or func.__name__, future, time.perf_counter()))
+        except queue.Full:
+            self._rejected += 1
+            raise WriteQueueFull(f"Write queue is full ({self.queue_size} pending writes)")
+        return future
+
+    def execute(self, func: Callable[[sqlite3.Connection], Any], kind: Optional[str] = None) -> Any:
+        """Run func(conn) on the writer and wait for its result"""
+        if threading.current_thread() is self._thread:
+            # Already inside a batch (a command issuing another write)
+            return func(self._conn)
+        return self.submit(func, kind).result()
+
+    def close(self):
+        """Commit everything queued so far and stop the writer thread"""
+        if self._started:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._conn.close()
+            self._started = False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                self._check_data_version()
+                continue
+            if item is _STOP:
+                break
+            self._check_data_version()
+            self.queue_depth.observe(self._queue.qsize())
+            batch = [item]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._apply_batch(batch)
+
+    def _apply_batch(self, batch: List[Tuple[Callable, str, Future, float]]):
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        for func, kind, future, submitted in batch:
+            self.wait_ms.observe((started - submitted) * 1000)
+
+        for attempt in itertools.count():
+            try:
+                outcomes = self._commit_batch(batch)
+                break
+            except _Contention as contention:
+                try:
+                    self.retry_policy.backoff(attempt, contention.kind, contention.error)
+                except DatabaseUnavailable as e:
+                    self._failed_commits += 1
+                    self._fail_all(batch, e)
+                    return
+            except sqlite3.Error as e:
+                self._failed_commits += 1
+                self._fail_all(batch, e)
+                return
+
+        self._commits += 1
+        self.batch_sizes.observe(len(batch))
+        # Listeners first, so a caller reading right after its write sees the new table versions
+        self._notify(getattr(self._conn, "written", None))
+        for (func, kind, future, submitted), (result, error) in zip(batch, outcomes):
+            self._finish(future, submitted, result, error)
+
+    def _commit_batch(self, batch: List[Tuple[Callable, str, Future, float]]) -> List[Tuple[Any, Optional[BaseException]]]:
+        """Run one attempt at the batch; returns (result, error) per command"""
+        conn = self._conn
+        outcomes = []
+        kind = "begin"
+        if isinstance(conn, TrackingConnection):
+            conn.written = set()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for func, kind, future, submitted in batch:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    result = func(conn)
+                except BaseException as e:
+                    if is_retryable(e):
+                        raise
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((None, e))
+                else:
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((result, None))
+            kind = "commit"
+            conn.commit()
+        except BaseException as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if is_retryable(e):
+                raise _Contention(kind, e) from e
+            raise
+        return outcomes
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_data_version(self):
+        """Tell the listeners when another connection has committed since the last check"""
+        try:
+            version = self._read_data_version()
+        except sqlite3.Error:
+            return  # checked again before the next batch
+        if version != self._data_version:
+            self._data_version = version
+            self._notify(None)
+
+    def _notify(self, tables: Optional[Set[str]]):
+        for listener in self.commit_listeners:
+            listener(tables)
+
+    def _fail_all(self, batch, error: BaseException):
+        for func, kind, future, submitted in batch:
+            self._finish(future, submitted, error=error)
+
+    def _finish(self, future: Future, submitted: float, result: Any = None, error: BaseException = None):
+        self.latency_ms.observe((time.perf_counter() - submitted) * 1000)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "queue_size": self.queue_size,
+            "queued": self._queue.qsize(),
+            "rejected": self._rejected,
+            "commits": self._commits,
+            "failed_commits": self._failed_commits,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_depth": self.queue_depth.snapshot(),
+            "wait_ms": self.wait_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+class WriteSession:
+    """One write transaction held open on the writer across several commands
+
+    Commands are functions ``func(conn)``, as for DatabaseWriter.submit, each
+    run in its own savepoint: a failing command is undone on its own and the
+    session carries on. Nothing is visible to other connections until
+    commit(); rollback() undoes every command.
+    """
+
+    def __init__(self, writer: DatabaseWriter, idle_timeout: float = 5.0):
+        self.idle_timeout = idle_timeout
+        self._commands: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False  # the session's own command has finished
+        self.finished = False  # commit() or rollback() was called
+        self.future = writer.submit(self._run, "session")
+        self.future.add_done_callback(self._close)
+
+    def submit(self, func: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue func(conn) in this session and return a future for its result"""
+        with self._lock:
+            if self.finished or self._closed:
+                raise DatabaseUnavailable("Write session has already ended")
+            future: Future = Future()
+            self._commands.put((func, future))
+        return future
+
+    def commit(self) -> Future:
+        """Commit the session; the returned future completes once it is durable"""
+        self._end(_COMMIT)
+        return self.future
+
+    def rollback(self) -> Future:
+        """Undo every command of the session; the returned future completes once done"""
+        self._end(_ROLLBACK)
+        return self.future
+
+    def _end(self, marker):
+        if not self.finished:
+            self.finished = True
+            self._commands.put(marker)
+
+    def _run(self, conn: sqlite3.Connection):
+        if self._started:
+            # The writer replays a batch after lock contention, but the
+            # session's commands have already been answered
+            raise DatabaseUnavailable("Write session was interrupted by lock contention; nothing was committed")
+        self._started = True
+        while True:
+            try:
+                item = self._commands.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                raise DatabaseUnavailable(f"Write session was idle for {self.idle_timeout}s and was rolled back")
+            if item is _COMMIT:
+                return None
+            if item is _ROLLBACK:
+                raise SessionRolledBack()
+            func, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute("SAVEPOINT session_command")
+            try:
+                result = func(conn)
+            except BaseException as e:
+                conn.execute("ROLLBACK TO session_command")
+                conn.execute("RELEASE session_command")
+                future.set_exception(e)
+            else:
+                conn.execute("RELEASE session_command")
+                future.set_result(result)
+
+    def _close(self, future: Future):
+        """Fail commands still queued when the session ends (timed out, or failed to start)"""
+        with self._lock:
+            self._closed = True
+        error = DatabaseUnavailable("Write session ended before this command ran")
+        while True:
+            try:
+                item = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, tuple) and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(error)
\ No newline at end of file
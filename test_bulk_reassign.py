@@ -0,0 +1,77 @@
+# === test_bulk_reassign.py ===
+"""
+Bulk reassign tests. Run with: python -m pytest test_bulk_reassign.py
+"""
+import json
+import sqlite3
+
+import pytest
+
+from database import connection
+from database.connection import DatabaseManager
+
+def reassign(client, **params):
+    return client.post("/api/v1/admin/bulk-reassign", params={"to_user_id": 1, "limit": 100, **params})
+
+def assignee_of(client, issue_id):
+    return client.get(f"/api/v1/issues/{issue_id}").json()["assignee_id"]
+
+def table_rows(table):
+    with sqlite3.connect(connection.DATABASE_PATH) as conn:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+
+@pytest.mark.parametrize("selector, issue_ids", [
+    ({"from_user_id": 2}, [1, 3, 8]),
+    ({"from_user_id": 2, "project_id": 2}, [8]),
+    ({"from_user_id": 2, "labels": "bug,security"}, [3]),
+    ({"from_user_id": 3, "state": "closed"}, [11]),
+])
+def test_selectors_pick_the_matching_issues(client, selector, issue_ids):
+    response = reassign(client, **selector)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["issue_ids"] == issue_ids
+    assert result["reassigned_count"] == result["matched_count"] == len(issue_ids)
+    assert all(assignee_of(client, issue_id) == 1 for issue_id in issue_ids)
+
+def test_older_than_days_selects_by_last_update(client):
+    with sqlite3.connect(connection.DATABASE_PATH) as conn:
+        conn.execute("UPDATE issues SET updated_at = datetime('now', '-30 days') WHERE id = 1")
+
+    assert reassign(client, from_user_id=2, older_than_days=7).json()["issue_ids"] == [1]
+    assert assignee_of(client, 3) == 2
+
+@pytest.mark.parametrize("params, detail", [
+    ({"from_user_id": 999999}, "From user not found"),
+    ({"from_user_id": 2, "to_user_id": 999999}, "To user not found"),
+    ({"from_user_id": 2, "project_id": 999999}, "Project not found"),
+])
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_unknown_users_and_projects_are_404(client, params, detail, dry_run):
+    response = reassign(client, dry_run=dry_run, **params)
+    assert response.status_code == 404
+    assert response.json() == {"detail": detail}
+
+def test_dry_run_counts_without_writing(client):
+    issues, changes = table_rows("issues"), table_rows("change_log")
+    commits = DatabaseManager.writer_stats()["commits"]
+
+    response = reassign(client, from_user_id=2, dry_run=True)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "Would reassign 3 issues from Sarah Chen to John Doe",
+        "reassigned_count": 0, "matched_count": 3, "dry_run": True, "issue_ids": [],
+    }
+    assert table_rows("issues") == issues and table_rows("change_log") == changes
+    assert DatabaseManager.writer_stats()["commits"] == commits
+
+def test_stream_returns_ndjson(client):
+    response = reassign(client, from_user_id=2, stream=True)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[:-1] == [{"id": 1}, {"id": 3}, {"id": 8}]
+    assert lines[-1]["reassigned_count"] == 3 and lines[-1]["dry_run"] is False
\ No newline at end of file
@@ -0,0 +1,51 @@
+# === test_changes.py ===
+"""
+Change feed tests. Run with: python -m pytest test_changes.py
+"""
+from database.connection import DatabaseManager
+from database.maintenance import prune_change_log
+
+def follow(client, since, limit):
+    """Every change after since, page by page; returns (seqs, final next_since)"""
+    seqs = []
+    while True:
+        page = client.get("/api/v1/changes", params={"since": since, "limit": limit}).json()
+        if not page["changes"]:
+            return seqs, page["next_since"]
+        seqs.extend(change["seq"] for change in page["changes"])
+        since = page["next_since"]
+
+def test_without_since_only_the_position_is_returned(client):
+    response = client.get("/api/v1/changes")
+
+    assert response.status_code == 200
+    feed = response.json()
+    assert feed["changes"] == []
+    assert feed["next_since"] == feed["latest_seq"] > 0
+
+def test_paging_visits_every_change_once(client):
+    start = client.get("/api/v1/changes").json()["latest_seq"]
+    for index in range(7):
+        client.post("/api/v1/issues?author_id=1", json={"title": f"Paged {index}", "description": "", "project_id": 1})
+    client.patch("/api/v1/issues/1", json={"state": "closed"})
+
+    seqs, next_since = follow(client, 0, limit=4)
+
+    assert seqs == sorted(set(seqs))
+    assert seqs[-8:] == list(range(start + 1, start + 9))
+    assert next_since == seqs[-1] == client.get("/api/v1/changes").json()["latest_seq"]
+    changes = client.get("/api/v1/changes", params={"since": start}).json()["changes"]
+    assert [(change["entity"], change["op"]) for change in changes] == [("issue", "create")] * 7 + [("issue", "update")]
+    assert changes[-1]["data"]["state"] == "closed"
+
+def test_since_before_the_pruned_history_is_gone(client):
+    latest = client.get("/api/v1/changes").json()["latest_seq"]
+    DatabaseManager.execute_update(
+        "UPDATE change_log SET changed_at = datetime('now', '-30 days') WHERE seq <= ?", (latest - 5,)
+    )
+    DatabaseManager.run_in_transaction(lambda conn: prune_change_log(conn, 7, 1))
+
+    response = client.get("/api/v1/changes", params={"since": latest - 6})
+    assert response.status_code == 410
+    seqs, _ = follow(client, latest - 5, limit=2)
+    assert seqs == list(range(latest - 4, latest + 1))
\ No newline at end of file
@@ -0,0 +1,109 @@
+# === test_etags.py ===
+"""
+ETag, If-Match and If-None-Match tests. Run with: python -m pytest test_etags.py
+"""
+import subprocess
+import sys
+import time
+
+import pytest
+
+from api.etags import parse_if_match
+from config import WRITE_POLL_INTERVAL
+from database import connection
+
+def version_of(etag):
+    return parse_if_match(etag)[0]
+
+@pytest.mark.parametrize("path, change", [
+    ("/api/v1/issues/1", {"title": "Renamed issue"}),
+    ("/api/v1/projects/1", {"name": "Renamed project"}),
+])
+def test_stale_if_match_fails_and_leaves_the_row_alone(client, path, change):
+    before = client.get(path)
+    stale = before.headers["ETag"]
+    assert client.patch(path, json={"description": "Changed by someone else"}).status_code == 200
+    current = client.get(path).json()
+
+    response = client.patch(path, json=change, headers={"If-Match": stale})
+    assert response.status_code == 412
+    assert client.get(path).json() == current
+
+@pytest.mark.parametrize("path, change, field", [
+    ("/api/v1/issues/1", {"title": "Renamed issue"}, "title"),
+    ("/api/v1/projects/1", {"name": "Renamed project"}, "name"),
+])
+def test_matching_if_match_applies_and_returns_the_new_etag(client, path, change, field):
+    before = client.get(path)
+    version = before.json()["version"]
+
+    response = client.patch(path, json=change, headers={"If-Match": before.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{version + 1}"'
+    assert response.json()["version"] == version + 1
+
+    after = client.get(path)
+    assert after.json()[field] == change[field]
+    assert version_of(after.headers["ETag"]) == version + 1
+    # The new tag is itself a valid precondition; the old one no longer is
+    assert client.patch(path, json=change, headers={"If-Match": response.headers["ETag"]}).status_code == 200
+    assert client.patch(path, json=change, headers={"If-Match": before.headers["ETag"]}).status_code == 412
+
+def test_if_match_guards_issue_delete(client):
+    etag = client.get("/api/v1/issues/2").headers["ETag"]
+    assert client.patch("/api/v1/issues/2", json={"state": "closed"}).status_code == 200
+
+    assert client.delete("/api/v1/issues/2", headers={"If-Match": etag}).status_code == 412
+    assert client.get("/api/v1/issues/2").status_code == 200
+    assert client.delete("/api/v1/issues/2", headers={"If-Match": 'W/"1"'}).status_code == 412  # weak never matches
+
+    current = client.get("/api/v1/issues/2").headers["ETag"]
+    assert client.delete("/api/v1/issues/2", headers={"If-Match": current}).status_code == 200
+    assert client.get("/api/v1/issues/2").status_code == 404
+    assert client.delete("/api/v1/issues/2", headers={"If-Match": "*"}).status_code == 404
+
+@pytest.mark.parametrize("path", ["/api/v1/projects", "/api/v1/issues?state=opened", "/api/v1/projects/1"])
+def test_if_none_match_answers_304_until_a_write(client, path):
+    first = client.get(path)
+    etag = first.headers["ETag"]
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert client.get(path, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    assert client.patch("/api/v1/projects/1", json={"description": "Changed"}).status_code == 200
+    fresh = client.get(path, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert client.get(path, headers={"If-None-Match": fresh.headers["ETag"]}).status_code == 304
+
+@pytest.mark.parametrize("path, missing", [
+    ("/api/v1/users/1", "/api/v1/users/999999"),
+    ("/api/v1/projects/1/issues", "/api/v1/projects/999999/issues"),
+    ("/api/v1/projects/1", "/api/v1/projects/999999"),
+    ("/api/v1/issues/1", "/api/v1/issues/999999"),
+    ("/api/v1/users", None),
+])
+def test_if_none_match_star_matches_only_existing_resources(client, path, missing):
+    assert client.get(path, headers={"If-None-Match": "*"}).status_code == 304
+    if missing is not None:
+        assert client.get(missing, headers={"If-None-Match": "*"}).status_code == 404
+
+def test_writes_by_another_process_invalidate_etags_within_the_poll_interval(client):
+    etag = client.get("/api/v1/projects").headers["ETag"]
+    assert client.get("/api/v1/projects", headers={"If-None-Match": etag}).status_code == 304
+
+    subprocess.run([
+        sys.executable, "-c",
+        "import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); "
+        "conn.execute(\"UPDATE projects SET description = 'Changed elsewhere' WHERE id = 1\"); conn.commit()",
+        connection.DATABASE_PATH,
+    ], check=True)
+    written = time.monotonic()
+
+    while client.get("/api/v1/projects", headers={"If-None-Match": etag}).status_code == 304:
+        assert time.monotonic() - written < WRITE_POLL_INTERVAL + 1.0, "external write not noticed"
+        time.sleep(0.05)
+    assert any(project["description"] == "Changed elsewhere" for project in client.get("/api/v1/projects").json())
\ No newline at end of file
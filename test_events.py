@@ -0,0 +1,131 @@
+# === test_events.py ===
+"""
+Change event tests. Run with: python -m pytest test_events.py
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from api.events import EventBroker, Subscriber, event_from_change
+from api.routes.events import stream_events
+from database.connection import DatabaseManager
+from database.maintenance import prune_change_log
+
+def change(seq, entity="issue", entity_id=1, op="update", **data):
+    return event_from_change({
+        "seq": seq, "entity": entity, "entity_id": entity_id, "op": op,
+        "data": data or None, "changed_at": "2025-09-24 08:57:00",
+    })
+
+def queued_seqs(subscriber):
+    seqs = []
+    while not subscriber.queue.empty():
+        seqs.append(subscriber.queue.get_nowait()["seq"])
+    return seqs
+
+def latest_seq(client):
+    return client.get("/api/v1/changes").json()["latest_seq"]
+
+async def open_stream(broker, since=None, last_event_id=None, project_id=None, types=None):
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(event_broker=broker)))
+    response = await stream_events(request, project_id=project_id, assignee_id=None, types=types,
+                                   since=since, last_event_id=last_event_id)
+    return response.body_iterator
+
+async def read_frames(frames, count):
+    try:
+        return [await frames.__anext__() for _ in range(count)]
+    finally:
+        await frames.aclose()
+
+def frame_ids(frames):
+    return [int(frame.split("\n", 1)[0].removeprefix("id: ")) for frame in frames]
+
+def test_subscribers_only_get_matching_events(client):
+    broker = EventBroker(buffer_size=10)
+    project = Subscriber(10, project_id=1)
+    issues = Subscriber(10, types={"issue"})
+    creates = Subscriber(10, types={"issue.create"})
+    assigned = Subscriber(10, assignee_id=2)
+
+    async def publish():
+        for subscriber in (project, issues, creates, assigned):
+            await broker.subscribe(subscriber)
+        broker.publish(change(101, project_id=1, assignee_id=2))
+        broker.publish(change(102, entity="project", entity_id=1, name="Web"))
+        broker.publish(change(103, op="create", project_id=2, assignee_id=None))
+        broker.publish(change(104, entity="user", entity_id=2, name="Ann"))
+    asyncio.run(publish())
+
+    assert queued_seqs(project) == [101, 102]
+    assert queued_seqs(issues) == [101, 103]
+    assert queued_seqs(creates) == [103]
+    assert queued_seqs(assigned) == [101]
+    assert broker.stats()["published"] == 4
+
+@pytest.mark.parametrize("resume", ["since", "last_event_id"])
+def test_resume_replays_the_change_log_then_follows_live(client, resume):
+    latest = latest_seq(client)
+    broker = EventBroker(buffer_size=10)
+
+    async def replay():
+        start = latest - 3
+        frames = await open_stream(broker, **{resume: start if resume == "since" else str(start)})
+        broker.publish(change(latest))  # already replayed, skipped
+        broker.publish(change(latest + 1))
+        return await read_frames(frames, 4)
+
+    frames = asyncio.run(replay())
+    assert frame_ids(frames) == [latest - 2, latest - 1, latest, latest + 1]
+    assert broker.stats()["subscribers"] == 0
+
+def test_resume_filters_the_replay(client):
+    latest = latest_seq(client)
+    client.patch("/api/v1/projects/2", json={"description": "Moved"})
+    client.patch("/api/v1/issues/1", json={"title": "Renamed"})
+
+    async def replay():
+        frames = await open_stream(EventBroker(buffer_size=10), since=latest, types="issue")
+        return await read_frames(frames, 1)
+
+    (frame,) = asyncio.run(replay())
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert (data["entity"], data["entity_id"], data["data"]["title"]) == ("issue", 1, "Renamed")
+
+def test_resume_before_the_retained_history_is_gone(client):
+    latest = latest_seq(client)
+    DatabaseManager.execute_update(
+        "UPDATE change_log SET changed_at = datetime('now', '-30 days') WHERE seq <= ?", (latest - 5,)
+    )
+    DatabaseManager.run_in_transaction(lambda conn: prune_change_log(conn, 7, 1))
+    broker = EventBroker(buffer_size=10)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(open_stream(broker, since=latest - 10))
+    assert error.value.status_code == 410
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(open_stream(broker, last_event_id=str(latest - 6)))
+    assert error.value.status_code == 410
+    assert broker.stats()["subscribers"] == 0
+
+    frames = asyncio.run(open_stream(broker, since=latest - 5))
+    assert frame_ids(asyncio.run(read_frames(frames, 5))) == list(range(latest - 4, latest + 1))
+
+def test_slow_consumer_is_dropped_after_its_queued_events(client):
+    latest = latest_seq(client)
+    broker = EventBroker(buffer_size=2)
+
+    async def overflow():
+        frames = await open_stream(broker)
+        for seq in range(latest + 1, latest + 4):
+            broker.publish(change(seq))
+        return await read_frames(frames, 3)
+
+    *delivered, dropped = asyncio.run(overflow())
+    assert frame_ids(delivered) == [latest + 1, latest + 2]
+    assert dropped.startswith("event: dropped\n")
+    assert json.loads(dropped.split("data: ", 1)[1]) == {"reason": "slow consumer", "last_event_id": latest + 2}
+    assert broker.stats()["dropped_subscribers"] == 1 and broker.stats()["subscribers"] == 0
\ No newline at end of file
@@ -0,0 +1,73 @@
+# === test_idempotency.py ===
+"""
+Idempotency-Key tests. Run with: python -m pytest test_idempotency.py
+"""
+import asyncio
+import time
+
+import httpx
+
+from api.app import app, idempotency_store
+from database.async_manager import AsyncDatabaseManager
+
+ISSUE = {"title": "Retried", "description": "Sent twice", "project_id": 1}
+
+def create_issue(client, key, body=ISSUE):
+    return client.post("/api/v1/issues?author_id=1", json=body, headers={"Idempotency-Key": key})
+
+def issue_count(client):
+    return client.get("/api/v1/admin/stats").json()["issues"]["total"]
+
+def without_replay_marker(headers):
+    return {name: value for name, value in headers.items() if name != "idempotent-replayed"}
+
+def test_retry_replays_the_stored_response(client):
+    before = issue_count(client)
+    first = create_issue(client, "retry-1")
+    second = create_issue(client, "retry-1")
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert without_replay_marker(second.headers) == dict(first.headers)
+    assert second.headers["Idempotent-Replayed"] == "true" and "Idempotent-Replayed" not in first.headers
+    assert issue_count(client) == before + 1
+
+def test_key_reused_for_a_different_request_is_rejected(client):
+    assert create_issue(client, "reuse-1").status_code == 200
+    response = create_issue(client, "reuse-1", dict(ISSUE, title="Something else"))
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Idempotency-Key was already used for a different request"}
+
+def test_duplicate_arriving_mid_request_waits_for_the_first(client, monkeypatch):
+    writes = []
+    run_in_transaction = AsyncDatabaseManager.run_in_transaction
+
+    async def slow_write(func, kind=None):
+        writes.append(kind)
+        await asyncio.sleep(0.2)  # still running when the duplicate arrives
+        return await run_in_transaction(func, kind)
+    monkeypatch.setattr(AsyncDatabaseManager, "run_in_transaction", staticmethod(slow_write))
+
+    async def send_twice():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            request = lambda: http.post("/api/v1/issues?author_id=1", json=ISSUE, headers={"Idempotency-Key": "slow-1"})
+            first = asyncio.create_task(request())
+            await asyncio.sleep(0.05)
+            return await asyncio.gather(first, request())
+
+    first, second = asyncio.run(send_twice())
+    assert len(writes) == 1
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == second.json()["id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+def test_keys_expire_after_the_ttl(client, monkeypatch):
+    monkeypatch.setattr(idempotency_store, "ttl", 0.1)
+    first = create_issue(client, "expiring-1")
+    assert create_issue(client, "expiring-1").headers.get("Idempotent-Replayed") == "true"
+    time.sleep(0.15)
+
+    again = create_issue(client, "expiring-1")
+    assert again.status_code == 200 and "Idempotent-Replayed" not in again.headers
+    assert again.json()["id"] != first.json()["id"]
\ No newline at end of file
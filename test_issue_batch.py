@@ -0,0 +1,76 @@
+# === test_issue_batch.py ===
+"""
+Batch issue creation tests. Run with: python -m pytest test_issue_batch.py
+"""
+import asyncio
+
+import httpx
+
+from api.app import app
+from api.routes import issues
+
+def batch(*titles, project_id=1):
+    return [{"title": title, "description": "", "project_id": project_id} for title in titles]
+
+def issue_count(client):
+    return client.get("/api/v1/admin/stats").json()["issues"]["total"]
+
+def titles_of(client, ids):
+    return [client.get(f"/api/v1/issues/{issue_id}").json()["title"] for issue_id in ids]
+
+def test_atomic_batch_with_an_invalid_item_creates_nothing(client):
+    before = issue_count(client)
+    items = batch("One", "Two") + batch("Orphan", project_id=999999)
+
+    response = client.post("/api/v1/issues/batch?author_id=1", json=items)
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["failed"] == [{"index": 2, "detail": "Project not found"}]
+    assert issue_count(client) == before
+
+def test_non_atomic_batch_creates_the_valid_items(client):
+    before = issue_count(client)
+    items = batch("One") + batch("Orphan", project_id=999999) + batch("Two")
+    items.append(dict(batch("Unassignable")[0], assignee_id=999999))
+
+    response = client.post("/api/v1/issues/batch?author_id=1&atomic=false", json=items)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created_count"] == 2
+    assert result["failed"] == [
+        {"index": 1, "detail": "Project not found"},
+        {"index": 3, "detail": "Assignee not found"},
+    ]
+    assert titles_of(client, result["created_ids"]) == ["One", "Two"]
+    assert issue_count(client) == before + 2
+
+def test_created_ids_match_the_rows_while_other_writes_commit(client):
+    titles = [f"Batched {index}" for index in range(50)]
+
+    async def batch_among_single_creates():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            single = lambda index: http.post("/api/v1/issues?author_id=1", json=batch(f"Single {index}")[0])
+            responses = await asyncio.gather(
+                *(single(index) for index in range(10)),
+                http.post("/api/v1/issues/batch?author_id=1", json=batch(*titles)),
+                *(single(index) for index in range(10, 20)),
+            )
+            return responses[10]
+
+    response = asyncio.run(batch_among_single_creates())
+
+    assert response.status_code == 200
+    created_ids = response.json()["created_ids"]
+    assert titles_of(client, created_ids) == titles
+
+def test_batch_over_the_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(issues, "MAX_ISSUE_BATCH_SIZE", 3)
+    before = issue_count(client)
+
+    response = client.post("/api/v1/issues/batch?author_id=1", json=batch("1", "2", "3", "4"))
+
+    assert response.status_code == 413
+    assert client.post("/api/v1/issues/batch?author_id=1", json=batch("1", "2", "3")).status_code == 200
+    assert issue_count(client) == before + 3
\ No newline at end of file
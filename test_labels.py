@@ -0,0 +1,32 @@
+# === test_labels.py ===
+"""
+Label filter tests. Run with: python -m pytest test_labels.py
+"""
+import pytest
+
+def issue_ids(client, **params):
+    response = client.get("/api/v1/issues", params=params)
+    assert response.status_code == 200
+    return sorted(issue["id"] for issue in response.json())
+
+@pytest.mark.parametrize("params, expected", [
+    ({"labels": "bug"}, [1, 3, 5, 6, 9, 11, 14, 16]),
+    ({"labels": "bug,security"}, [3, 6]),
+    ({"labels": "security, bug ,bug"}, [3, 6]),
+    ({"labels": "bug,security,urgent"}, []),
+    ({"labels": "bug,no-such-label"}, []),
+    ({"labels_any": "security,urgent"}, [2, 3, 5, 6, 12]),
+    ({"labels_any": "no-such-label,urgent"}, [5, 12]),
+    ({"labels": "bug", "labels_any": "mobile,api"}, [1, 6]),
+    ({"labels": "bug,security", "state": "opened", "project_id": 2}, [6]),
+])
+def test_label_filters(client, params, expected):
+    assert issue_ids(client, **params) == expected
+    assert issue_ids(client, stream="true", **params) == expected
+
+def test_label_filters_follow_label_changes(client):
+    client.patch("/api/v1/issues/1", json={"labels": ["security", "bug"]})
+    client.patch("/api/v1/issues/3", json={"labels": ["bug"]})
+
+    assert issue_ids(client, labels="bug,security") == [1, 6]
+    assert issue_ids(client, labels_any="security") == [1, 2, 6, 12]
\ No newline at end of file
@@ -0,0 +1,219 @@
+# === test_migrations.py ===
+"""
+Schema migration tests. Run with: python -m pytest test_migrations.py
+"""
+import multiprocessing
+import re
+import sqlite3
+
+import pytest
+
+from api.routes.issues import label_condition
+from database.maintenance import recompute_project_counters, recompute_stats_aggregates, prune_change_log
+from database.migrations import LATEST_VERSION, get_schema_version, run_migrations
+
+LEGACY_ISSUES_TABLE = """
+    CREATE TABLE issues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        description TEXT,
+        project_id INTEGER NOT NULL,
+        author_id INTEGER,
+        assignee_id INTEGER,
+        state TEXT DEFAULT 'opened',
+        labels TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "test.db")
+    run_migrations(conn)
+    yield conn
+    conn.close()
+
+def migrate_when_released(path, barrier, results):
+    conn = sqlite3.connect(path, timeout=30)
+    barrier.wait()
+    try:
+        results.put(run_migrations(conn))
+    except Exception as e:
+        results.put(repr(e))
+    finally:
+        conn.close()
+
+def query_plan(conn, query, params=()):
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+def plan_indexes(plan):
+    """Names of the indexes a query plan uses, so similar names cannot match by prefix"""
+    return set(re.findall(r"USING (?:COVERING )?INDEX (\w+)", plan))
+
+def test_fresh_database_reaches_latest_version(conn):
+    assert get_schema_version(conn) == LATEST_VERSION
+    assert run_migrations(conn) == []
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.execute(LEGACY_ISSUES_TABLE)
+    conn.execute("INSERT INTO issues (title, project_id, labels) VALUES ('Old issue', 1, '[\"bug\"]')")
+    conn.commit()
+    assert get_schema_version(conn) == 0
+
+    assert run_migrations(conn)[-1] == LATEST_VERSION
+    assert conn.execute("SELECT title FROM issues").fetchone()[0] == "Old issue"
+    conn.close()
+
+def test_concurrent_processes_apply_each_migration_once(tmp_path):
+    path = tmp_path / "shared.db"
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(4), context.Queue()
+    workers = [context.Process(target=migrate_when_released, args=(path, barrier, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    assert all(isinstance(applied, list) for applied in outcomes), outcomes
+    assert sorted(version for applied in outcomes for version in applied) == list(range(1, LATEST_VERSION + 1))
+    conn = sqlite3.connect(path)
+    assert get_schema_version(conn) == LATEST_VERSION
+    conn.close()
+
+def test_issue_filters_use_indexes(conn):
+    plan = query_plan(conn, "SELECT * FROM issues i WHERE i.project_id = ? AND i.state = ? ORDER BY i.updated_at DESC LIMIT 100", (1, "opened"))
+    assert "idx_issues_project_state_updated" in plan_indexes(plan)
+
+    plan = query_plan(conn, "SELECT * FROM issues i WHERE i.assignee_id = ? AND i.state = ? ORDER BY i.updated_at DESC LIMIT 100", (1, "opened"))
+    assert "idx_issues_assignee_state_updated" in plan_indexes(plan)
+
+    plan = query_plan(conn, "SELECT * FROM issues i WHERE (i.assignee_id = ? OR i.author_id = ?)", (1, 1))
+    assert "idx_issues_author_updated" in plan_indexes(plan)
+
+def test_issue_ordering_uses_indexes(conn):
+    plan = query_plan(conn, "SELECT * FROM issues i ORDER BY i.updated_at DESC LIMIT 100")
+    assert "idx_issues_updated" in plan_indexes(plan) and "TEMP B-TREE" not in plan
+
+    plan = query_plan(conn, "SELECT * FROM issues i WHERE i.state = ? ORDER BY i.updated_at DESC LIMIT 100", ("opened",))
+    assert "idx_issues_opened_updated" in plan_indexes(plan) and "TEMP B-TREE" not in plan
+
+def test_stats_aggregates_use_indexes(conn):
+    plan = query_plan(conn, "SELECT COUNT(*) FROM issues WHERE state = 'opened'")
+    assert "idx_issues_opened_updated" in plan_indexes(plan)
+
+    plan = query_plan(conn, """
+        SELECT u.id, COUNT(i.id), COUNT(CASE WHEN i.state = 'opened' THEN 1 END)
+        FROM users u LEFT JOIN issues i ON u.id = i.assignee_id
+        GROUP BY u.id
+    """)
+    assert "COVERING INDEX idx_issues_assignee_state_updated" in plan
+
+    plan = query_plan(conn, """
+        SELECT p.id, COUNT(i.id), COUNT(CASE WHEN i.state = 'opened' THEN 1 END)
+        FROM projects p LEFT JOIN issues i ON p.id = i.project_id
+        GROUP BY p.id
+    """)
+    assert "COVERING INDEX idx_issues_project_state_updated" in plan
+
+def test_label_filter_uses_label_index(conn):
+    # A common label next to a rare one once made the planner scan issue_labels
+    conn.execute("INSERT INTO projects (name) VALUES ('P')")
+    conn.executemany(
+        "INSERT INTO issues (title, project_id, labels) VALUES ('t', 1, ?)",
+        [('["bug", "security"]' if n % 100 == 0 else '["bug"]',) for n in range(2000)]
+    )
+    conn.execute("ANALYZE")
+    for names, match_all in ((["bug"], True), (["bug", "security", "ui"], True), (["bug", "security"], False)):
+        condition, params = label_condition(names, match_all)
+        plan = query_plan(conn, f"SELECT * FROM issues i WHERE 1=1 {condition} ORDER BY i.updated_at DESC LIMIT 100", params)
+        assert "idx_issue_labels_label" in plan_indexes(plan), plan
+        assert "SCAN il" not in plan and "SCAN other" not in plan, plan
+
+def test_label_triggers_track_json_column(conn):
+    conn.execute("INSERT INTO issues (title, project_id, labels) VALUES ('A', 1, '[\"bug\", \"ui\"]')")
+    conn.execute("INSERT INTO issues (title, project_id, labels) VALUES ('B', 1, '[\"bug\"]')")
+    conn.execute("UPDATE issues SET labels = '[\"ui\", \"docs\"]' WHERE title = 'B'")
+    conn.execute("DELETE FROM issues WHERE title = 'A'")
+
+    rows = conn.execute("""
+        SELECT i.title, l.name FROM issue_labels il
+        JOIN issues i ON i.id = il.issue_id
+        JOIN labels l ON l.id = il.label_id
+        ORDER BY l.name
+    """).fetchall()
+    assert rows == [("B", "docs"), ("B", "ui")]
+
+
+def test_keyset_pages_seek_through_indexes(conn):
+    cursor = ("2024-01-01 00:00:00", 100)
+    for query, params in [
+        ("SELECT * FROM issues i WHERE (i.updated_at, i.id) < (?, ?) ORDER BY i.updated_at DESC, i.id DESC LIMIT 101", cursor),
+        ("SELECT * FROM issues i WHERE i.project_id = ? AND (i.created_at, i.id) < (?, ?) ORDER BY i.created_at DESC, i.id DESC LIMIT 101", (1, *cursor)),
+        ("SELECT * FROM issues i WHERE i.assignee_id = ? AND (i.updated_at, i.id) < (?, ?) ORDER BY i.updated_at DESC, i.id DESC LIMIT 101", (1, *cursor)),
+        ("SELECT * FROM users WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 101", cursor),
+    ]:
+        plan = query_plan(conn, query, params)
+        assert "SEARCH" in plan and "TEMP B-TREE" not in plan, plan
+
+
+def test_project_counters_follow_issue_writes(conn):
+    conn.execute("INSERT INTO projects (name) VALUES ('A')")
+    conn.execute("INSERT INTO projects (name) VALUES ('B')")
+    conn.execute("INSERT INTO issues (title, project_id) VALUES ('one', 1)")
+    conn.execute("INSERT INTO issues (title, project_id) VALUES ('two', 1)")
+    conn.execute("INSERT INTO issues (title, project_id, state) VALUES ('three', 1, 'closed')")
+    conn.execute("UPDATE issues SET state = 'closed' WHERE title = 'one'")
+    conn.execute("UPDATE issues SET project_id = 2 WHERE title = 'two'")
+    conn.execute("DELETE FROM issues WHERE title = 'three'")
+
+    counters = conn.execute("SELECT name, issues_count, open_issues_count FROM projects ORDER BY id").fetchall()
+    assert counters == [("A", 1, 0), ("B", 1, 1)]
+    assert recompute_project_counters(conn) == 0
+
+    conn.execute("UPDATE projects SET issues_count = 42")
+    assert recompute_project_counters(conn) == 2
+
+
+def test_stats_aggregates_follow_writes(conn):
+    conn.execute("INSERT INTO users (username, name, email) VALUES ('a', 'A', 'a@example.com')")
+    conn.execute("INSERT INTO users (username, name, email) VALUES ('b', 'B', 'b@example.com')")
+    conn.execute("INSERT INTO projects (name) VALUES ('P')")
+    conn.execute("INSERT INTO issues (title, project_id, assignee_id, labels) VALUES ('one', 1, 1, '[\"bug\"]')")
+    conn.execute("INSERT INTO issues (title, project_id, assignee_id, labels) VALUES ('two', 1, 1, '[\"bug\", \"ui\"]')")
+    conn.execute("UPDATE issues SET assignee_id = 2, state = 'closed' WHERE title = 'two'")
+    conn.execute("DELETE FROM issues WHERE title = 'one'")
+
+    counters = dict(conn.execute("SELECT name, value FROM stats_counters").fetchall())
+    assert counters == {"users": 2, "projects": 1, "issues": 1, "open_issues": 0}
+    workload = conn.execute("SELECT user_id, assigned_issues, open_assigned FROM user_workload ORDER BY user_id").fetchall()
+    assert workload == [(1, 0, 0), (2, 1, 0)]
+    labels = conn.execute("SELECT name, issues_count FROM labels ORDER BY name").fetchall()
+    assert labels == [("bug", 1), ("ui", 1)]
+    assert recompute_stats_aggregates(conn) == 0
+
+
+def test_change_log_records_writes(conn):
+    conn.execute("INSERT INTO projects (name) VALUES ('P')")
+    conn.execute("INSERT INTO issues (title, project_id) VALUES ('one', 1)")
+    conn.execute("UPDATE issues SET state = 'closed' WHERE title = 'one'")
+    conn.execute("DELETE FROM issues WHERE title = 'one'")
+    conn.execute("UPDATE projects SET name = 'Q'")
+
+    entries = conn.execute("SELECT entity, entity_id, op, json_extract(data, '$.name') FROM change_log ORDER BY seq").fetchall()
+    # Counter updates made by the issue triggers are not logged as project changes
+    assert entries == [
+        ("project", 1, "create", "P"),
+        ("issue", 1, "create", None),
+        ("issue", 1, "update", None),
+        ("issue", 1, "delete", None),
+        ("project", 1, "update", "Q"),
+    ]
+
+    conn.execute("UPDATE change_log SET changed_at = datetime('now', '-2 hours')")
+    conn.execute("UPDATE change_log SET changed_at = datetime('now', '-30 days') WHERE seq = 1")
+    assert prune_change_log(conn, retention_days=7, compact_after_hours=1) == (1, 2)
+    assert conn.execute("SELECT seq FROM change_log ORDER BY seq").fetchall() == [(4,), (5,)]
+    assert conn.execute("SELECT pruned_seq FROM change_log_horizon").fetchone()[0] == 1
\ No newline at end of file
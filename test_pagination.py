@@ -0,0 +1,40 @@
+# === test_pagination.py ===
+"""
+Cursor pagination tests. Run with: python -m pytest test_pagination.py
+"""
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from api.pagination import decode_cursor, encode_cursor
+
+def raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(("2025-09-24 08:57:00", 42))) == ["2025-09-24 08:57:00", 42]
+    assert decode_cursor(encode_cursor((None, 7))) == [None, 7]
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!", raw_cursor({"a": 1}), raw_cursor(["2025-09-24 08:57:00"]),
+    raw_cursor([{"a": 1}, 1]), raw_cursor([[1], 2]), raw_cursor(["2025-09-24", "7"]),
+    raw_cursor(["2025-09-24", True]), raw_cursor(["2025-09-24", 1.5]), raw_cursor([1, 2]),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+def test_list_endpoints_answer_400_for_bad_cursors(client):
+    for cursor in (raw_cursor([{"a": 1}, 1]), raw_cursor([[1], 2])):
+        for path in ("/api/v1/issues", "/api/v1/projects", "/api/v1/users",
+                     "/api/v1/projects/1/issues", "/api/v1/users/1/issues"):
+            response = client.get(path, params={"cursor": cursor})
+            assert response.status_code == 400, (path, response.text)
+            assert response.json() == {"detail": "Invalid cursor"}
+
+    first = client.get("/api/v1/issues", params={"limit": 2})
+    second = client.get("/api/v1/issues", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert second.status_code == 200 and second.json()[0]["id"] not in {issue["id"] for issue in first.json()}
\ No newline at end of file
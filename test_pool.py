@@ -0,0 +1,80 @@
+# === test_pool.py ===
+"""
+Connection pool tests. Run with: python -m pytest test_pool.py
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from database.pool import ConnectionPool, PoolTimeout
+
+def memory_connection():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+def hold_connection(pool, seconds):
+    """Borrow a connection on another thread for seconds; returns once it is borrowed"""
+    borrowed = threading.Event()
+
+    def hold():
+        with pool.connection():
+            borrowed.set()
+            threading.Event().wait(seconds)
+    thread = threading.Thread(target=hold)
+    thread.start()
+    borrowed.wait()
+    return thread
+
+def test_nested_use_on_one_thread_shares_a_connection():
+    pool = ConnectionPool(memory_connection, size=1, timeout=0.1)
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+            assert pool.stats()["in_use"] == 1
+    assert pool.stats()["checkouts"] == 1 and pool.stats()["in_use"] == 0
+
+def test_idle_connections_are_reused():
+    pool = ConnectionPool(memory_connection, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    stats = pool.stats()
+    assert (stats["checkouts"], stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 1, 0.5)
+    assert (stats["open_connections"], stats["idle"], stats["waits"]) == (1, 1, 0)
+
+def test_waits_for_a_connection_to_be_returned():
+    pool = ConnectionPool(memory_connection, size=1, timeout=5.0)
+    holder = hold_connection(pool, 0.1)
+    with pool.connection():
+        pass
+    holder.join()
+
+    stats = pool.stats()
+    assert (stats["waits"], stats["timeouts"], stats["hits"]) == (1, 0, 1)
+    assert 50 < stats["max_wait_ms"] < 5000
+
+def test_timeout_when_the_pool_stays_exhausted():
+    pool = ConnectionPool(memory_connection, size=1, timeout=0.1)
+    holder = hold_connection(pool, 0.5)
+    with pytest.raises(PoolTimeout):
+        with pool.connection():
+            pass
+    holder.join()
+
+    stats = pool.stats()
+    assert (stats["waits"], stats["timeouts"], stats["checkouts"]) == (1, 1, 1)
+    assert stats["max_wait_ms"] >= 100 and stats["avg_wait_ms"] >= 100
+
+def test_connection_failing_the_health_check_is_replaced():
+    pool = ConnectionPool(memory_connection, size=1, health_check_interval=0)
+    with pool.connection() as broken:
+        pass
+    broken.close()
+
+    with pool.connection() as replacement:
+        assert replacement is not broken
+        assert replacement.execute("SELECT 1").fetchone() == (1,)
+    stats = pool.stats()
+    assert (stats["health_check_failures"], stats["open_connections"], stats["misses"]) == (1, 1, 2)
\ No newline at end of file
@@ -0,0 +1,58 @@
+# === test_query_cache.py ===
+"""
+Query-result cache tests. Run with: python -m pytest test_query_cache.py
+"""
+from database.query_cache import QueryCache, statement_tables
+from database.versions import TableVersions
+
+USER_QUERY = """
+    SELECT u.*, COUNT(i.id) as issues
+    FROM users u
+    LEFT JOIN issues i ON i.author_id = u.id
+    WHERE u.id = ?
+"""
+
+def fill(cache, query, params, rows):
+    key = QueryCache.key(query, params)
+    cache.put(key, rows, *cache.versions(key))
+    return key
+
+def test_statement_tables():
+    assert statement_tables(USER_QUERY) == ("issues", "users")
+    assert statement_tables("SELECT (SELECT name FROM projects WHERE id = ?) as name") == ("projects",)
+
+def test_writes_to_read_tables_invalidate():
+    versions = TableVersions()
+    cache = QueryCache(versions)
+    key = fill(cache, USER_QUERY, (1,), [{"id": 1, "name": "Ann", "issues": 2}])
+
+    # Same query formatted differently hits; callers get their own copy
+    rows = cache.get(QueryCache.key(" ".join(USER_QUERY.split()), [1]))
+    rows[0]["name"] = "changed"
+    assert cache.get(key) == [{"id": 1, "name": "Ann", "issues": 2}]
+
+    versions.bump({"projects"})
+    assert cache.get(key) is not None
+    versions.bump({"issues"})
+    assert cache.get(key) is None
+
+    key = fill(cache, USER_QUERY, (1,), [{"id": 1, "name": "Ann", "issues": 3}])
+    versions.bump(None)  # another process wrote something
+    assert cache.get(key) is None
+    assert cache.stats()["invalidations"] == 2
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = QueryCache(TableVersions(), max_entries=2, max_bytes=1000)
+    first = fill(cache, "SELECT * FROM users WHERE id = ?", (1,), [{"name": "a"}])
+    second = fill(cache, "SELECT * FROM users WHERE id = ?", (2,), [{"name": "b"}])
+    cache.get(first)
+    third = fill(cache, "SELECT * FROM users WHERE id = ?", (3,), [{"name": "c"}])
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+
+    fill(cache, "SELECT * FROM users", (), [{"name": "x" * 500}, {"name": "y" * 300}])
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 2
+    assert cache.get(third) is None  # least recently used
\ No newline at end of file
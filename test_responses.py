@@ -0,0 +1,145 @@
+# === test_responses.py ===
+"""
+Fast response path tests. Run with: python -m pytest test_responses.py
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from api import responses
+from api.responses import FragmentCache, decode_labels, dumps, prefers_minimal, streaming_json_array, trusted_rows
+from api.schemas import IssueResponse, ProjectWithStats, UserResponse
+from database import connection
+from database.connection import DatabaseManager, StreamLimitReached, StreamSlots
+
+ISSUE_ROW = {
+    "id": 7, "title": "Crash on “save”", "description": "Steps…", "project_id": 1,
+    "author_id": 2, "assignee_id": None, "state": "opened", "labels": ["bug", "ui"],
+    "created_at": "2025-09-24 08:57:00", "updated_at": "2025-09-24T09:01:30",
+    "version": 3, "project_name": "Web", "author_name": "Ann", "assignee_name": None,
+}
+
+def validated(rows, model):
+    return [model.model_validate(row).model_dump(mode="json") for row in rows]
+
+def test_trusted_rows_match_validated_rows():
+    project_row = {
+        "id": 1, "name": "Web", "description": "", "visibility": "public", "owner_id": 1,
+        "created_at": "2025-09-24 08:57:00", "updated_at": "2025-09-24 08:57:00.123",
+        "version": 1, "issues_count": 4, "open_issues_count": 2, "members_count": 1,
+        "owner_name": "Ann",  # joined column that is not part of the model
+    }
+    user_row = {
+        "id": 2, "username": "ann", "name": "Ann", "email": "ann@example.com",
+        "created_at": "2025-09-24 08:57:00", "updated_at": "2025-09-24 08:57:00",
+    }
+    sparse_issue = {key: value for key, value in ISSUE_ROW.items() if key not in ("labels", "version", "project_name")}
+
+    for rows, model in (([ISSUE_ROW, sparse_issue], IssueResponse),
+                        ([project_row], ProjectWithStats),
+                        ([user_row], UserResponse)):
+        shaped = trusted_rows(rows, model)
+        assert shaped == validated(rows, model)
+        assert [list(row) for row in shaped] == [list(row) for row in validated(rows, model)]
+
+def test_encoding_matches_json_response(monkeypatch):
+    content = trusted_rows([ISSUE_ROW], IssueResponse)
+    expected = JSONResponse(content).body
+    assert dumps(content) == expected
+
+    monkeypatch.setattr(responses, "orjson", None)
+    assert dumps(content) == expected
+    assert json.loads(expected)[0]["created_at"] == "2025-09-24T08:57:00"
+
+def test_streaming_json_array_joins_chunks():
+    async def chunks(*sizes):
+        start = 0
+        for size in sizes:
+            yield [dict(ISSUE_ROW, id=start + i) for i in range(size)]
+            start += size
+
+    async def render(sizes):
+        response = await streaming_json_array(chunks(*sizes), IssueResponse)
+        if not hasattr(response, "body_iterator"):
+            return response.body
+        return b"".join([part async for part in response.body_iterator])
+
+    for sizes in ((), (1,), (3, 3, 1)):
+        rows = [dict(ISSUE_ROW, id=i) for i in range(sum(sizes))]
+        assert asyncio.run(render(sizes)) == dumps(trusted_rows(rows, IssueResponse))
+
+def test_fragment_cache_rerenders_only_changed_rows():
+    stored = dict(ISSUE_ROW, labels=json.dumps(ISSUE_ROW["labels"]))
+    fragments = FragmentCache(IssueResponse, ("version", "labels", "project_name"), prepare=decode_labels)
+
+    def page(rows):
+        return b"[" + b",".join(fragments.render([dict(row) for row in rows])) + b"]"
+
+    rows = [dict(stored, id=1), dict(stored, id=2, project_name="Docs")]
+    expected = dumps(trusted_rows(decode_labels([dict(row) for row in rows]), IssueResponse))
+    assert page(rows) == expected
+    assert page(rows) == expected
+    assert fragments.stats()["renders"] == 2
+
+    rows[1]["project_name"] = "Handbook"  # project renamed
+    assert json.loads(page(rows))[1]["project_name"] == "Handbook"
+    stats = fragments.stats()
+    assert (stats["renders"], stats["hits"], stats["entries"]) == (3, 3, 2)
+
+def test_streams_stay_off_the_pool_and_are_capped(client, monkeypatch):
+    monkeypatch.setattr(connection, "_stream_slots", StreamSlots(1))
+    stream = DatabaseManager.stream_query("SELECT id FROM issues ORDER BY id", chunk_size=1)
+    assert next(stream) == [{"id": 1}]
+    assert DatabaseManager.pool_stats()["in_use"] == 0
+    assert DatabaseManager.stream_stats() == {"active": 1, "max": 1, "rejected": 0}
+
+    with pytest.raises(StreamLimitReached):
+        next(DatabaseManager.stream_query("SELECT id FROM issues"))
+    response = client.get("/api/v1/issues", params={"stream": "true"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    # Paged reads still go through the pool
+    assert client.get("/api/v1/issues").status_code == 200
+
+    stream.close()
+    assert DatabaseManager.stream_stats() == {"active": 0, "max": 1, "rejected": 2}
+    assert client.get("/api/v1/issues", params={"stream": "true"}).status_code == 200
+
+@pytest.mark.parametrize("return_, prefer, minimal", [
+    ("representation", None, False),
+    ("minimal", None, True),
+    ("representation", "return=minimal", True),
+    ("representation", 'respond-async, Return="minimal"; foo=bar', True),
+    ("representation", "return=representation", False),
+    ("representation", "handling=lenient", False),
+])
+def test_prefers_minimal(return_, prefer, minimal):
+    assert prefers_minimal(return_, prefer) is minimal
+
+@pytest.mark.parametrize("method, path, body, location", [
+    ("POST", "/api/v1/issues?author_id=1", {"title": "Quiet", "description": "", "project_id": 1}, "/api/v1/issues/"),
+    ("PATCH", "/api/v1/issues/2", {"title": "Quiet"}, "/api/v1/issues/2"),
+    ("POST", "/api/v1/projects", {"name": "Quiet", "description": ""}, "/api/v1/projects/"),
+    ("PATCH", "/api/v1/projects/2", {"name": "Quiet"}, "/api/v1/projects/2"),
+])
+def test_prefer_return_minimal_sends_only_headers(client, method, path, body, location):
+    response = client.request(method, path, json=body, headers={"Prefer": "return=minimal"})
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["Preference-Applied"] == "return=minimal"
+    assert response.headers["Location"].startswith(f"http://testserver{location}")
+    resource = client.get(response.headers["Location"])
+    assert resource.json().items() >= body.items()
+    assert response.headers["ETag"] == f'"{resource.json()["version"]}"'
+
+def test_return_minimal_query_parameter(client):
+    response = client.post("/api/v1/users?return=minimal",
+                           json={"username": "quiet", "name": "Quiet", "email": "quiet@example.com"})
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["Preference-Applied"] == "return=minimal"
+    assert client.get(response.headers["Location"]).json()["username"] == "quiet"
\ No newline at end of file
@@ -0,0 +1,56 @@
+# === test_singleflight.py ===
+"""
+Request coalescing tests. Run with: python -m pytest test_singleflight.py
+"""
+import asyncio
+
+from api.singleflight import SingleFlight, SingleflightMiddleware
+
+def make_app(release: asyncio.Event, calls: list):
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        call = len(calls)
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"etag", b'"1"')]})
+        await send({"type": "http.response.body", "body": f"call {call}".encode()})
+    return app
+
+def request(middleware, path, query=b"", headers=()):
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query, "headers": list(headers)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await middleware(scope, receive, send)
+        return messages[0]["headers"], messages[1]["body"]
+    return run()
+
+def test_identical_concurrent_gets_share_one_execution():
+    async def scenario():
+        release, calls, version = asyncio.Event(), [], [0]
+        flights = SingleFlight()
+        middleware = SingleflightMiddleware(make_app(release, calls), flights, lambda: version[0])
+        auth = (b"authorization", b"Bearer a")
+        tasks = [asyncio.create_task(request(middleware, "/api/v1/projects", b"limit=5", [auth]))
+                 for _ in range(5)]
+        tasks.append(asyncio.create_task(request(middleware, "/api/v1/projects", b"limit=5", [(b"authorization", b"Bearer b")])))
+        tasks.append(asyncio.create_task(request(middleware, "/api/v1/issues", b"stream=true")))
+        tasks.append(asyncio.create_task(request(middleware, "/api/v1/issues", b"stream=true")))
+        await asyncio.sleep(0)
+        version[0] += 1  # a write committed: later requests must not join the earlier flight
+        tasks.append(asyncio.create_task(request(middleware, "/api/v1/projects", b"limit=5", [auth])))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 5  # one per auth scope, both streams, the post-write request
+        assert {body for _, body in results[:5]} == {results[0][1]}
+        assert sum((b"coalesced-request", b"true") in headers for headers, _ in results[:5]) == 4
+        assert results[5][1] != results[0][1] and results[8][1] != results[0][1]
+        assert flights.stats() == {"in_flight": 0, "leaders": 3, "collapsed": 4, "leader_failures": 0}
+    asyncio.run(scenario())
\ No newline at end of file
@@ -0,0 +1,132 @@
+# === test_writer.py ===
+"""
+Database writer tests. Run with: python -m pytest test_writer.py
+"""
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from database.contention import DatabaseBusy, DatabaseUnavailable, RetryPolicy
+from database.writer import DatabaseWriter, SessionRolledBack, TrackingConnection, WriteQueueFull, WriteSession
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    conn.close()
+    return path
+
+def make_writer(path, **options):
+    # timeout=0 disables the busy handler so lock errors reach the retry policy
+    return DatabaseWriter(lambda: sqlite3.connect(path, timeout=0, check_same_thread=False), **options)
+
+def insert(name):
+    return lambda conn: conn.execute("INSERT INTO items (name) VALUES (?)", (name,)).lastrowid
+
+def test_concurrent_writes_share_commits(db_path):
+    writer = make_writer(db_path, window_ms=20)
+    with ThreadPoolExecutor(16) as executor:
+        ids = list(executor.map(lambda i: writer.execute(insert(f"item{i}")), range(64)))
+    writer.close()
+
+    assert sorted(ids) == list(range(1, 65))
+    stats = writer.stats()
+    assert stats["batch_size"]["count"] == stats["commits"] < 64
+    assert stats["batch_size"]["max"] > 1
+    assert stats["wait_ms"]["count"] == 64
+
+def test_failed_write_only_rolls_back_itself(db_path):
+    writer = make_writer(db_path, window_ms=20)
+    futures = [writer.submit(insert(name)) for name in ("a", "b", "a", "c")]
+
+    assert isinstance(futures[2].exception(), sqlite3.IntegrityError)
+    assert [future.result() for future in (futures[0], futures[1], futures[3])] == [1, 2, 3]
+    writer.close()
+    names = [row[0] for row in sqlite3.connect(db_path).execute("SELECT name FROM items ORDER BY id")]
+    assert names == ["a", "b", "c"]
+
+def test_full_queue_rejects_writes(db_path):
+    writer = make_writer(db_path, window_ms=0, queue_size=2)
+    release = threading.Event()
+    blocked = writer.submit(lambda conn: release.wait())
+    while writer.stats()["queued"]:
+        pass  # wait until the writer is busy with the blocking command
+    queued = [writer.submit(insert("a")), writer.submit(insert("b"))]
+
+    with pytest.raises(WriteQueueFull):
+        writer.submit(insert("c"))
+    release.set()
+    assert blocked.result() is True
+    assert [future.result() for future in queued] == [1, 2]
+    writer.close()
+    assert writer.stats()["rejected"] == 1
+
+def test_lock_contention_is_retried(db_path):
+    writer = make_writer(db_path, retry_policy=RetryPolicy(attempts=50, base_delay_ms=5, max_delay_ms=20))
+    other = sqlite3.connect(db_path, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.05, other.commit).start()
+
+    assert writer.execute(insert("a")) == 1
+    assert writer.stats()["commits"] == 1
+    assert writer.retry_policy.stats()["retries"]["begin"] >= 1
+    writer.close()
+
+def test_exhausted_retries_raise_database_busy(db_path):
+    writer = make_writer(db_path, retry_policy=RetryPolicy(attempts=2, base_delay_ms=1, max_delay_ms=1))
+    other = sqlite3.connect(db_path)
+    other.execute("BEGIN IMMEDIATE")
+
+    with pytest.raises(DatabaseBusy):
+        writer.execute(insert("a"))
+    assert writer.retry_policy.stats()["exhausted"] == {"begin": 1}
+    other.rollback()
+    writer.close()
+
+def test_commit_listeners_get_written_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE audit (name TEXT);
+        CREATE TRIGGER trg_items_audit AFTER INSERT ON items BEGIN
+            INSERT INTO audit (name) VALUES (NEW.name);
+        END;
+    """)
+    conn.close()
+    writer = DatabaseWriter(lambda: sqlite3.connect(db_path, check_same_thread=False, factory=TrackingConnection))
+    written = []
+    writer.commit_listeners.append(written.append)
+
+    # The second insert reuses the cached statement, which the authorizer no longer sees
+    writer.execute(insert("a"))
+    writer.execute(insert("b"))
+    writer.execute(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone())
+    writer.close()
+
+    assert written == [{"items", "audit"}, {"items", "audit"}, set()]
+
+def test_write_session_commits_or_rolls_back_as_one(db_path):
+    writer = make_writer(db_path, window_ms=0)
+    names = lambda: [row[0] for row in sqlite3.connect(db_path).execute("SELECT name FROM items ORDER BY id")]
+
+    session = WriteSession(writer)
+    assert session.submit(insert("a")).result() == 1
+    assert isinstance(session.submit(insert("a")).exception(), sqlite3.IntegrityError)  # undone on its own
+    count = session.submit(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+    assert count.result() == 1 and names() == []  # visible in the session only
+    other = writer.submit(insert("b"))  # waits for the session
+    assert session.commit().result() is None
+    assert other.result() == 2 and names() == ["a", "b"]
+
+    session = WriteSession(writer)
+    session.submit(insert("c")).result()
+    assert isinstance(session.rollback().exception(), SessionRolledBack)
+    with pytest.raises(DatabaseUnavailable):
+        session.submit(insert("d"))
+
+    session = WriteSession(writer, idle_timeout=0.05)
+    assert isinstance(session.future.exception(), DatabaseUnavailable)
+    writer.close()
+    assert names() == ["a", "b"]
\ No newline at end of file